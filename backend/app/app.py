@@ -1,11 +1,25 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from .cache import solution_cache
+from .executor import solver_pool
+from .history import history
+from .metrics import metrics
 from .routes.simplex_routes import router as simplex_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    solver_pool.shutdown()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Programación lineal - Método Simplex", version="1.0.0")
+    app = FastAPI(title="Programación lineal - Método Simplex", version="1.0.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -22,13 +36,26 @@ def create_app() -> FastAPI:
 
     app.include_router(simplex_router, prefix="/simplex", tags=["simplex"])
 
+    @app.middleware("http")
+    async def record_latency(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        # Se etiqueta con el nombre del endpoint (no con la URL) para no abrir una serie por índice o ruta inexistente
+        route = getattr(request.scope.get("route"), "name", "unmatched")
+        metrics.observe_request(request.method, route, response.status_code, time.perf_counter() - start)
+        return response
+
     @app.get("/")
     async def root():
         return {"status": "ok", "service": "simplex"}
     
     @app.get("/health")
     async def health():
-        return {"status": "healthy", "service": "simplex-backend"}
+        return {"status": "healthy", "service": "simplex-backend", "solver_pool": solver_pool.stats(), "solution_cache": solution_cache.stats(), "history": history.stats()}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
     return app
 
@@ -1,33 +1,116 @@
-from collections import deque
-from typing import Any, Dict, List
-
-
-class InMemoryCache:
-    def __init__(self, maxlen: int = 10) -> None:
-        self._data: deque = deque(maxlen=maxlen)
-
-    def add(self, item: Dict[str, Any]) -> None:
-        self._data.appendleft(item)
-
-    def list(self) -> List[Dict[str, Any]]:
-        return list(self._data)
-    
-    def delete(self, index: int) -> bool:
-        """Delete item at specific index"""
-        print(f"Cache delete called with index: {index}")
-        print(f"Current cache contents: {list(self._data)}")
-        if 0 <= index < len(self._data):
-            item_to_delete = self._data[index]
-            print(f"Deleting item: {item_to_delete}")
-            del self._data[index]
-            print(f"Cache after deletion: {list(self._data)}")
-            return True
-        print(f"Index {index} out of range (0-{len(self._data)-1})")
-        return False
-    
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .models.simplex_models import SimplexRequest, SimplexResponse
+from .services.model_input import load_model
+
+
+class SolutionCache:
+    """Caché de resultados direccionada por contenido: LRU acotada en bytes, con TTL y contadores."""
+
+    # Estados que dependen de límites de tiempo/iteraciones o de errores: no se guardan
+    UNCACHEABLE = {"iteration_limit", "time_limit", "error"}
+    DECIMALS = 10
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 3600.0) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[SimplexResponse, int, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "SolutionCache":
+        ttl = os.getenv("SOLUTION_CACHE_TTL", "3600")
+        return cls(
+            max_bytes=int(os.getenv("SOLUTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ttl=float(ttl) if ttl else None,
+        )
+
+    def key_for(self, req: SimplexRequest) -> str:
+        # Modelo canónico: signos normalizados, lado derecho no negativo y flotantes redondeados
+        digest = hashlib.sha256()
+        # Misma clave para el mismo modelo en cualquier formato de entrada (listas, tripletas o buffers)
+        raw = load_model(req)
+        model = raw.normalized()
+        # Las filas invertidas al normalizar entran en la clave: sus duales, rangos y tablas cambian de signo
+        digest.update(np.packbits(raw.b < 0).tobytes() + b"|")
+        A = model.as_sparse().tocsr(copy=True)
+        A.data = np.round(A.data, self.DECIMALS)
+        A.eliminate_zeros()
+        A.sort_indices()
+        digest.update(model.sense.encode())
+        digest.update(self._canonical_floats(model.c))
+        digest.update("".join(model.signs).encode())
+        digest.update(self._canonical_floats(model.b))
+        digest.update(A.indptr.astype(np.int64).tobytes() + A.indices.astype(np.int64).tobytes() + b"|")
+        digest.update(self._canonical_floats(A.data))
+        # Opciones que cambian la respuesta (los límites solo afectan a estados que no se guardan)
+        options = req.model_dump(include={"variable_names", "method", "phases", "pricing", "anti_cycling", "warm_start", "presolve", "trace_level", "integer", "mip_gap", "node_limit"})
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _canonical_floats(self, values: Any) -> bytes:
+        # Sumar 0.0 convierte -0.0 en 0.0 para que ambos den la misma clave
+        return (np.round(np.asarray(values, dtype=float), self.DECIMALS) + 0.0).tobytes() + b"|"
+
+    def get(self, key: str) -> Optional[SimplexResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, response: SimplexResponse) -> None:
+        if response.solution.status in self.UNCACHEABLE:
+            return
+        size = len(response.model_dump_json())
+        if size > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (response, size, expires)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
     def clear(self) -> None:
-        """Clear all cached items"""
-        self._data.clear()
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
-cache = InMemoryCache(maxlen=10)
+solution_cache = SolutionCache.from_env()
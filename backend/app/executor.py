@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+from .models.simplex_models import SimplexRequest, SimplexResponse, SimplexScenarioRequest, SimplexScenarioResponse
+from .services.simplex_service import SimplexService
+
+
+class PoolSaturatedError(RuntimeError):
+    """La cola de admisión del pool de resolución está llena."""
+
+
+def _solve_in_worker(req: SimplexRequest) -> SimplexResponse:
+    return SimplexService().solve(req)
+
+
+def _solve_scenarios_in_worker(req: SimplexScenarioRequest) -> SimplexScenarioResponse:
+    return SimplexService().solve_scenarios(req)
+
+
+class SolverPool:
+    # Margen extra sobre el límite de tiempo del solver antes de abandonar la espera
+    GRACE_SECONDS = 1.0
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None, queue_size: Optional[int] = None, timeout: Optional[float] = 30.0) -> None:
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Tipo de pool no soportado: {kind}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size if queue_size is not None else 2 * self.workers
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._inflight: Set[Future] = set()
+        # Los callbacks de los futures corren en hilos del executor: el conjunto se protege con un lock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SolverPool":
+        workers = os.getenv("SOLVER_WORKERS")
+        queue_size = os.getenv("SOLVER_QUEUE_SIZE")
+        timeout = os.getenv("SOLVER_TIMEOUT", "30")
+        return cls(
+            # Procesos solo a pedido: con 'spawn' el hijo reimporta __main__ y rompe los scripts sin guarda
+            kind=os.getenv("SOLVER_POOL_KIND", "thread"),
+            workers=int(workers) if workers else None,
+            queue_size=int(queue_size) if queue_size else None,
+            timeout=float(timeout) if timeout else None,
+        )
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # 'spawn' evita heredar los hilos del servidor al hacer fork
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="simplex")
+        return self._executor
+
+    def capped(self, req: SimplexRequest) -> SimplexRequest:
+        # El solver se detiene solo al llegar al plazo, así el worker queda libre aunque el cliente ya no espere
+        if self.timeout is None:
+            return req
+        return req.model_copy(update={"time_limit": min(req.time_limit or self.timeout, self.timeout)})
+
+    async def solve(self, req: SimplexRequest) -> SimplexResponse:
+        return await self._run(_solve_in_worker, self.capped(req))
+
+    async def solve_scenarios(self, req: SimplexScenarioRequest) -> SimplexScenarioResponse:
+        # El plazo cubre el barrido completo: caso base y re-optimizaciones comparten el mismo límite
+        return await self._run(_solve_scenarios_in_worker, req.model_copy(update={"problem": self.capped(req.problem)}))
+
+    async def _run(self, fn: Callable[[Any], Any], req: Any) -> Any:
+        wait_timeout = self.timeout + self.GRACE_SECONDS if self.timeout is not None else None
+        future = self.submit(fn, req)
+        # Al vencer la espera se cancela el future: si todavía estaba en cola, nunca llega a ejecutarse
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=wait_timeout)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Encola fn(*args) si hay lugar en la cola de admisión; si no, PoolSaturatedError."""
+        with self._lock:
+            if self._saturated():
+                raise PoolSaturatedError("La cola de resolución está llena.")
+            future = self.executor().submit(fn, *args, **kwargs)
+            self._inflight.add(future)
+        future.add_done_callback(self._release)
+        return future
+
+    def reserve(self) -> Future:
+        """Ocupa un lugar de la cola de admisión para trabajo que avanza fuera del executor.
+
+        El lugar cuenta como en ejecución en /health hasta que se completa el future devuelto.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._saturated():
+                raise PoolSaturatedError("La cola de resolución está llena.")
+            self._inflight.add(future)
+        future.set_running_or_notify_cancel()
+        future.add_done_callback(self._release)
+        return future
+
+    def saturated(self) -> bool:
+        with self._lock:
+            return self._saturated()
+
+    def _saturated(self) -> bool:
+        return len(self._inflight) >= self.workers + self.queue_size
+
+    def admitted(self) -> Executor:
+        """Vista del pool como Executor cuyos envíos pasan por la cola de admisión (y cuentan en /health)."""
+        return _AdmittedExecutor(self)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._inflight.discard(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = list(self._inflight)
+        running = sum(1 for f in inflight if f.running())
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "running": running,
+            "queued": len(inflight) - running,
+            "queue_capacity": self.queue_size,
+            "utilisation": round(running / self.workers, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class _AdmittedExecutor(Executor):
+    def __init__(self, pool: SolverPool) -> None:
+        self._pool = pool
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return self._pool.submit(fn, *args, **kwargs)
+
+
+solver_pool = SolverPool.from_env()
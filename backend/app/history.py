@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models.simplex_models import SimplexRequest, SimplexResponse
+
+
+def encode_entry(req: SimplexRequest, response: SimplexResponse) -> bytes:
+    """Entrada del historial como JSON comprimido con zlib (las tablas completas comprimen muy bien)."""
+    raw = b'{"request":' + req.model_dump_json().encode() + b',"response":' + response.model_dump_json().encode() + b"}"
+    return zlib.compress(raw, 6)
+
+
+def decode_entry(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+class HistoryStore(ABC):
+    """Historial de resoluciones (/simplex/last), de la más reciente a la más antigua.
+
+    Las entradas se guardan comprimidas y solo se descomprimen las de la página pedida.
+    """
+
+    def add(self, req: SimplexRequest, response: SimplexResponse) -> None:
+        self.append(encode_entry(req, response))
+
+    def list(self) -> List[Dict[str, Any]]:
+        items, _ = self.page(0, None)
+        return items
+
+    @abstractmethod
+    def append(self, blob: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def page(self, offset: int, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int]:
+        """(entradas desde `offset`, a lo sumo `limit`; total de entradas)."""
+
+    @abstractmethod
+    def delete(self, index: int) -> bool:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class InMemoryHistory(HistoryStore):
+    """Historial del proceso actual, acotado en cantidad de entradas y en bytes comprimidos."""
+
+    def __init__(self, max_entries: Optional[int] = 10, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: deque = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def append(self, blob: bytes) -> None:
+        if len(blob) > self.max_bytes:
+            return  # nunca entraría: no se vacía el historial por una sola entrada
+        with self._lock:
+            self._entries.appendleft(blob)
+            self._bytes += len(blob)
+            while self._bytes > self.max_bytes or (self.max_entries is not None and len(self._entries) > self.max_entries):
+                self._bytes -= len(self._entries.pop())
+
+    def page(self, offset: int, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock:
+            total = len(self._entries)
+            end = total if limit is None else min(total, offset + limit)
+            blobs = [self._entries[i] for i in range(offset, end)]
+        return [decode_entry(blob) for blob in blobs], total
+
+    def delete(self, index: int) -> bool:
+        with self._lock:
+            if not 0 <= index < len(self._entries):
+                return False
+            self._bytes -= len(self._entries[index])
+            del self._entries[index]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes, "max_entries": self.max_entries}
+
+
+class SQLiteHistory(HistoryStore):
+    """Historial compartido por todos los workers de uvicorn en un archivo SQLite en modo WAL.
+
+    WAL permite leer mientras otro proceso escribe; cada hilo abre su propia conexión.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = 1000, max_bytes: Optional[int] = 256 * 1024 * 1024, timeout: float = 5.0) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL, size INTEGER NOT NULL, payload BLOB NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, blob: bytes) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT INTO history (created, size, payload) VALUES (?, ?, ?)", (time.time(), len(blob), blob))
+            if self.max_entries is not None:
+                conn.execute("DELETE FROM history WHERE id <= (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)", (self.max_entries,))
+            if self.max_bytes is not None:
+                # Se conservan las más recientes mientras el acumulado (de la más nueva hacia atrás) quepa en max_bytes
+                conn.execute(
+                    "DELETE FROM history WHERE id IN (SELECT id FROM "
+                    "(SELECT id, SUM(size) OVER (ORDER BY id DESC) AS running FROM history) WHERE running > ?)",
+                    (self.max_bytes,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def page(self, offset: int, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int]:
+        conn = self._connect()
+        total = conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        rows = conn.execute("SELECT payload FROM history ORDER BY id DESC LIMIT ? OFFSET ?", (-1 if limit is None else limit, offset)).fetchall()
+        return [decode_entry(payload) for (payload,) in rows], total
+
+    def delete(self, index: int) -> bool:
+        if index < 0:
+            return False
+        cursor = self._connect().execute("DELETE FROM history WHERE id = (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)", (index,))
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM history")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM history").fetchone()
+        return {"backend": "sqlite", "path": self.path, "entries": entries, "bytes": size, "max_bytes": self.max_bytes, "max_entries": self.max_entries}
+
+
+def history_from_env() -> HistoryStore:
+    backend = os.getenv("SOLVE_HISTORY_BACKEND", "memory")
+    max_entries = os.getenv("SOLVE_HISTORY_MAX_ENTRIES")
+    max_bytes = os.getenv("SOLVE_HISTORY_MAX_BYTES")
+    if backend == "memory":
+        return InMemoryHistory(
+            max_entries=int(max_entries) if max_entries else 10,
+            max_bytes=int(max_bytes) if max_bytes else 16 * 1024 * 1024,
+        )
+    if backend == "sqlite":
+        return SQLiteHistory(
+            os.getenv("SOLVE_HISTORY_PATH", "simplex_history.db"),
+            max_entries=int(max_entries) if max_entries else 1000,
+            max_bytes=int(max_bytes) if max_bytes else 256 * 1024 * 1024,
+        )
+    raise ValueError(f"Backend de historial no soportado: {backend}")
+
+
+history = history_from_env()
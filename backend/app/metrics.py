@@ -0,0 +1,122 @@
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models.simplex_models import SimplexResponse
+
+
+# Cubetas en segundos: de 1 ms a 1 min (las resoluciones en el pool tienen un plazo de 30 s por defecto)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PIVOT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DENSITY_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Histograma acumulado con el formato de texto de Prometheus (cubetas `le`, `_sum` y `_count`)."""
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float]) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, List[float]] = {}  # por etiquetas: cuentas por cubeta (+Inf al final), suma
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[len(self.buckets)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _number(bound)))} {_number(count)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_number(series[len(self.buckets)])}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(labels)} {_number(value)}" for labels, value in sorted(self._values.items())]
+        return lines
+
+
+class SolverMetrics:
+    """Métricas agregadas del servicio, expuestas en /metrics.
+
+    Las resoluciones corren en el pool de procesos: se agregan aquí, en el proceso del servidor, a partir de
+    metadata["stats"] de cada respuesta.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.solves = Counter("simplex_solves_total", "Resoluciones terminadas por estado y origen (solver o caché).")
+        self.solve_seconds = Histogram("simplex_solve_seconds", "Duración total de cada resolución en el solver.", SECONDS_BUCKETS)
+        self.stage_seconds = Histogram("simplex_solve_stage_seconds", "Tiempo de cada etapa de una resolución.", SECONDS_BUCKETS)
+        self.pivots = Histogram("simplex_solve_pivots", "Pivotes por resolución.", PIVOT_BUCKETS)
+        self.degenerate_pivots = Histogram("simplex_solve_degenerate_pivots", "Pivotes degenerados (paso nulo) por resolución.", PIVOT_BUCKETS)
+        self.density = Histogram("simplex_solve_matrix_density", "Densidad de la matriz pivotada.", DENSITY_BUCKETS)
+        self.requests = Histogram("simplex_http_request_seconds", "Latencia HTTP por endpoint (incluye serializar la respuesta; en streaming, hasta enviar los encabezados).", SECONDS_BUCKETS)
+
+    def observe_response(self, response: SimplexResponse, source: str = "solver") -> None:
+        with self._lock:
+            self.solves.inc(status=response.solution.status, source=source)
+            stats = (response.metadata or {}).get("stats")
+            if source != "solver" or not stats:
+                return
+            method = str((response.metadata or {}).get("method", "tableau"))
+            seconds = dict(stats["seconds"])
+            self.solve_seconds.observe(seconds.pop("total"), method=method)
+            for stage, value in seconds.items():
+                self.stage_seconds.observe(value, stage=stage)
+            self.pivots.observe(stats["pivots"], method=method)
+            self.degenerate_pivots.observe(stats["degenerate_pivots"], method=method)
+            if stats.get("density") is not None:
+                self.density.observe(stats["density"])
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.requests.observe(seconds, method=method, route=route, status=str(status))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = (self.solves, self.solve_seconds, self.stage_seconds, self.pivots, self.degenerate_pivots, self.density, self.requests)
+            lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+metrics = SolverMetrics()
@@ -1,9 +1,14 @@
-from typing import List, Literal, Optional, Dict, Any, Tuple
-from pydantic import BaseModel, Field, validator
+from typing import List, Literal, Optional, Dict, Any, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer, validator
 
 
 Sense = Literal["max", "min"]
 Sign = Literal["=", "<", "<=", ">", ">="]
+Method = Literal["tableau", "revised", "dual", "interior_point"]
+Phases = Literal["big_m", "two_phase"]
+Pricing = Literal["dantzig", "devex", "steepest_edge", "partial", "bland"]
+TraceLevel = Literal["none", "pivots", "full"]
+AntiCycling = Literal["none", "bland", "lexicographic"]
 
 
 class Objective(BaseModel):
@@ -25,10 +30,55 @@ class Constraint(BaseModel):
         return v
 
 
+class BinaryArray(BaseModel):
+    data: str = Field(..., description="Base64 of the raw little-endian buffer (C order)")
+    dtype: Literal["float64", "int32", "int64"] = Field("float64", description="Element type of the buffer")
+    shape: Optional[List[int]] = Field(None, description="Array shape; one-dimensional if omitted")
+
+
+FloatArray = Union[List[float], BinaryArray]
+IndexArray = Union[List[int], BinaryArray]
+FloatMatrix = Union[List[List[float]], BinaryArray]
+
+
+class SparseMatrix(BaseModel):
+    format: Literal["coo", "csr"] = Field("coo", description="coo: row/col/data triplets; csr: indptr/indices/data")
+    shape: Tuple[int, int] = Field(..., description="(rows, columns) of the constraint matrix")
+    data: FloatArray
+    row: Optional[IndexArray] = None
+    col: Optional[IndexArray] = None
+    indptr: Optional[IndexArray] = None
+    indices: Optional[IndexArray] = None
+
+
+class ConstraintMatrix(BaseModel):
+    A: Union[SparseMatrix, BinaryArray] = Field(..., description="Sparse triplets or a dense float64 buffer of shape (rows, columns)")
+    rhs: FloatArray = Field(..., description="Right-hand side of every row")
+    signs: Union[Sign, List[Sign]] = Field("<=", description="One sign for all rows or one per row")
+
+
+class WarmStart(BaseModel):
+    basis: Optional[List[str]] = Field(None, description="Final basis of a previous solve (metadata.basis)")
+    basis_token: Optional[str] = Field(None, description="Server-issued basis token (metadata.basis_token)")
+
+
 class SimplexRequest(BaseModel):
     objective: Objective
-    constraints: List[Constraint]
+    constraints: List[Constraint] = Field(default_factory=list)
+    matrix: Optional[ConstraintMatrix] = Field(None, description="Constraints as arrays instead of one object per row")
     variable_names: Optional[List[str]] = None
+    method: Method = Field("tableau", description="Solver engine: dense tableau, sparse revised simplex, dual simplex or interior point with crossover")
+    phases: Phases = Field("big_m", description="Artificial variable handling for the tableau engine: Big-M or two-phase")
+    pricing: Pricing = Field("dantzig", description="Entering variable rule for the tableau engine")
+    anti_cycling: AntiCycling = Field("bland", description="Rule used after a run of degenerate pivots until progress resumes")
+    max_iterations: Optional[int] = Field(50000, ge=1, description="Maximum number of pivots before returning iteration_limit")
+    time_limit: Optional[float] = Field(None, gt=0, description="Wall-clock limit in seconds before returning time_limit")
+    warm_start: Optional[WarmStart] = Field(None, description="Start the tableau engine from a previous optimal basis")
+    presolve: bool = Field(False, description="Remove redundant rows, fixed variables, singleton rows and empty columns before solving")
+    trace_level: TraceLevel = Field("full", description="Iteration log detail: none, pivots only (basis and pivot) or full tableaus")
+    integer: Optional[List[bool]] = Field(None, description="Integrality flag per variable; solved by branch-and-bound when any is set")
+    mip_gap: float = Field(1e-6, ge=0, description="Relative gap between incumbent and best bound at which branch-and-bound stops")
+    node_limit: Optional[int] = Field(10000, ge=1, description="Maximum number of branch-and-bound nodes before returning node_limit")
 
 
 class Iteration(BaseModel):
@@ -39,13 +89,41 @@ class Iteration(BaseModel):
     leaving_var: Optional[str] = None
     pivot_position: Optional[Tuple[int, int]] = None
     comment: str
+    # Copia NumPy de la tabla (traza completa); se expande a listas solo al serializar
+    _tableau: Any = PrivateAttr(default=None)
+
+    def set_tableau_array(self, tableau: Any) -> None:
+        self._tableau = tableau
+
+    def tableau_rows(self) -> List[List[float]]:
+        if not self.tableau and self._tableau is not None:
+            return self._tableau.round(6).tolist()
+        return self.tableau
+
+    @field_serializer("tableau")
+    def _serialize_tableau(self, tableau: List[List[float]]) -> List[List[float]]:
+        return self.tableau_rows()
+
+
+class Range(BaseModel):
+    value: float
+    # None: el cambio en esa dirección no tiene límite
+    allowable_increase: Optional[float] = None
+    allowable_decrease: Optional[float] = None
+
+
+class Sensitivity(BaseModel):
+    objective: Dict[str, Range]  # por variable (x1, x2, ...): rango del coeficiente con la misma base óptima
+    rhs: Dict[str, Range]  # por restricción (y1, y2, ...): rango del lado derecho con los mismos precios duales
 
 
 class Solution(BaseModel):
-    status: Literal["optimal", "unbounded", "infeasible", "multiple_optima", "error"]
+    status: Literal["optimal", "unbounded", "infeasible", "multiple_optima", "iteration_limit", "time_limit", "node_limit", "error"]
     objective_value: Optional[float] = None
     variable_values: Optional[Dict[str, float]] = None
     shadow_prices: Optional[Dict[str, float]] = None
+    reduced_costs: Optional[Dict[str, float]] = None
+    sensitivity: Optional[Sensitivity] = None
     message: Optional[str] = None
 
 
@@ -54,3 +132,40 @@ class SimplexResponse(BaseModel):
     solution: Solution
     notes: Optional[List[str]] = None
     metadata: Optional[Dict[str, Any]] = None
+
+
+class SimplexBatchRequest(BaseModel):
+    problems: List[SimplexRequest] = Field(..., description="Problems to solve; same-shaped ones are pivoted together")
+
+
+class SimplexBatchItem(BaseModel):
+    index: int
+    response: SimplexResponse
+
+
+class SimplexScenarioRequest(BaseModel):
+    problem: SimplexRequest
+    rhs: Optional[FloatMatrix] = Field(None, description="One right-hand side vector per scenario (scenarios x constraints)")
+    objectives: Optional[FloatMatrix] = Field(None, description="One objective vector per scenario (scenarios x variables)")
+
+
+class ScenarioTable(BaseModel):
+    # Una posición por escenario en cada lista; values sigue el orden de `variables`
+    variables: List[str]
+    status: List[str]
+    objective_value: List[Optional[float]]
+    values: List[Optional[List[float]]]
+    pivots: List[Optional[int]]  # pivotes desde la base compartida (0: la base del caso base sigue siendo óptima)
+
+
+class SimplexScenarioResponse(BaseModel):
+    base: SimplexResponse
+    scenarios: ScenarioTable
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class SimplexStreamEvent(BaseModel):
+    event: Literal["iteration", "solution"]
+    iteration: Optional[Iteration] = None
+    # Solo en el evento final: solución, metadatos y notas (las iteraciones ya se enviaron)
+    response: Optional[SimplexResponse] = None
@@ -1,9 +1,19 @@
-from fastapi import APIRouter
-from typing import Any
+import asyncio
+import json
 
-from ..models.simplex_models import SimplexRequest, SimplexResponse
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import Any, Literal, Optional
+
+from ..models.simplex_models import Iteration, SimplexBatchItem, SimplexBatchRequest, SimplexRequest, SimplexResponse, SimplexScenarioRequest, SimplexScenarioResponse, SimplexStreamEvent, Solution
+from ..services.branch_and_bound import BranchAndBound
+from ..services.model_files import ModelFileError, parse_model_file
 from ..services.simplex_service import SimplexService
-from ..cache import cache
+from ..cache import solution_cache
+from ..executor import PoolSaturatedError, solver_pool
+from ..history import history
+from ..metrics import metrics
 
 router = APIRouter()
 service = SimplexService()
@@ -11,33 +21,147 @@ service = SimplexService()
 
 @router.post("/solve", response_model=SimplexResponse)
 async def solve(req: SimplexRequest) -> Any:
-    result = service.solve(req)
-    cache.add({
-       
-        "request": req.model_dump(),
-        "response": result.model_dump()
-    })
-    return result
+    return await _solve_cached(req)
 
 
-@router.get("/last")
-async def last() -> Any:
-    return {"items": cache.list()}
+@router.post("/solve/upload", response_model=SimplexResponse)
+async def solve_upload(
+    file: UploadFile = File(..., description="Model in MPS or CPLEX LP format"),
+    format: Optional[Literal["mps", "lp"]] = Form(None, description="File format; inferred from the extension if omitted"),
+    options: Optional[str] = Form(None, description="JSON object with solver options (method, phases, pricing, ...)"),
+) -> Any:
+    # El archivo se lee a tripletas COO: la matriz nunca pasa por listas densas
+    try:
+        payload = parse_model_file(file.filename, await file.read(), format)
+        settings = json.loads(options or "{}")
+        if not isinstance(settings, dict):
+            raise ValueError("'options' debe ser un objeto JSON.")
+        req = SimplexRequest.model_validate({**settings, **payload})
+    except (ModelFileError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return await _solve_cached(req)
 
 
-@router.delete("/last/{index}")
-async def delete_last(index: int) -> Any:
-    print(f"Attempting to delete item at index: {index}")
-    print(f"Current cache size: {len(cache.list())}")
-    success = cache.delete(index)
-    print(f"Delete operation successful: {success}")
-    if success:
-        return {"message": "Item deleted successfully"}
+async def _solve_cached(req: SimplexRequest) -> SimplexResponse:
+    # Un modelo idéntico (tras canonizarlo) se responde desde la caché sin pivotar
+    # Canonizar el modelo y medir la respuesta al guardarla recorren todo el modelo: fuera del event loop
+    try:
+        key = await run_in_threadpool(solution_cache.key_for, req)
+    except ValueError:
+        key = None  # modelo mal formado: el solver devuelve el error
+    result = solution_cache.get(key) if key else None
+    if result is not None:
+        metrics.observe_response(result, source="cache")
+    elif req.integer is not None and any(req.integer):
+        # Branch-and-bound: el árbol se coordina en un hilo y los nodos abiertos pasan por la cola de admisión del pool
+        if solver_pool.saturated():
+            raise HTTPException(status_code=503, detail="La cola de resolución está llena.", headers={"Retry-After": "1"})
+        result = await run_in_threadpool(_solve_mip, solver_pool.capped(req))
+        metrics.observe_response(result)
+        if key:
+            await run_in_threadpool(solution_cache.put, key, result)
     else:
-        return {"error": "Index out of range"}
+        # La resolución es intensiva en CPU: se ejecuta en el pool para no bloquear el event loop
+        try:
+            result = await solver_pool.solve(req)
+        except PoolSaturatedError as exc:
+            raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="La resolución superó el tiempo máximo permitido.")
+        metrics.observe_response(result)
+        if key:
+            await run_in_threadpool(solution_cache.put, key, result)
+    # Serializar y comprimir la entrada (y escribirla si el historial es SQLite) no bloquea el event loop
+    await run_in_threadpool(history.add, req, result)
+    return result
+
+
+def _solve_mip(req: SimplexRequest) -> SimplexResponse:
+    try:
+        return BranchAndBound(service, solver_pool.admitted(), solver_pool.workers).solve(req)
+    except Exception as exc:
+        return SimplexResponse(iterations=[], solution=Solution(status="error", message=f"Error al resolver: {exc}"))
+
+
+@router.post("/solve/batch")
+async def solve_batch(batch: SimplexBatchRequest) -> StreamingResponse:
+    # NDJSON en el orden de entrada; cada lote apilado y cada sobrante es un trabajo del pool.
+    # Cada problema lleva el plazo del pool, y todos los trabajos pasan por la cola de admisión antes de empezar a responder
+    problems = [solver_pool.capped(p) for p in batch.problems]
+    try:
+        responses = await run_in_threadpool(service.solve_batch, problems, solver_pool.admitted())
+    except PoolSaturatedError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+
+    async def lines():
+        index = 0
+        async for response in iterate_in_threadpool(responses):
+            metrics.observe_response(response)
+            yield SimplexBatchItem(index=index, response=response).model_dump_json() + "\n"
+            index += 1
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 
+@router.post("/solve/scenarios", response_model=SimplexScenarioResponse)
+async def solve_scenarios(req: SimplexScenarioRequest) -> Any:
+    # Un solo caso base y una sola B^{-1} para todos los escenarios; no pasa por la caché ni el historial
+    try:
+        return await solver_pool.solve_scenarios(req)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except PoolSaturatedError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="La resolución superó el tiempo máximo permitido.")
 
+
+@router.post("/solve/stream")
+async def solve_stream(req: SimplexRequest, format: Literal["ndjson", "sse"] = "ndjson") -> StreamingResponse:
+    # Cada pivote se envía apenas ocurre y se descarta: la memoria no crece con el número de iteraciones.
+    # El generador no puede cruzar a otro proceso, así que avanza en el threadpool con el mismo plazo que el pool
+    # y ocupa un lugar de su cola de admisión hasta que termina o el cliente se desconecta
+    try:
+        slot = solver_pool.reserve()
+    except PoolSaturatedError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    events = service.solve_iter(solver_pool.capped(req))
+
+    async def lines():
+        try:
+            async for item in iterate_in_threadpool(events):
+                if isinstance(item, Iteration):
+                    event = SimplexStreamEvent(event="iteration", iteration=item)
+                else:
+                    metrics.observe_response(item)
+                    event = SimplexStreamEvent(event="solution", response=item)
+                data = event.model_dump_json()
+                yield f"event: {event.event}\ndata: {data}\n\n" if format == "sse" else data + "\n"
+        finally:
+            slot.set_result(None)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(lines(), media_type=media_type)
+
+
+@router.get("/last")
+async def last(
+    offset: int = Query(0, ge=0, description="Entries to skip, newest first"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of entries to return"),
+) -> Any:
+    items, total = await run_in_threadpool(history.page, offset, limit)
+    return {"items": items, "total": total, "offset": offset, "limit": limit}
+
+
+# Antes que /last/{index}: si no, "clear" se toma como índice y la validación del entero falla
 @router.delete("/last/clear")
 async def clear_last() -> Any:
-    cache.clear()
-    return {"message": "All cached items cleared"}
\ No newline at end of file
+    await run_in_threadpool(history.clear)
+    return {"message": "All cached items cleared"}
+
+
+@router.delete("/last/{index}")
+async def delete_last(index: int) -> Any:
+    if await run_in_threadpool(history.delete, index):
+        return {"message": "Item deleted successfully"}
+    return {"error": "Index out of range"}
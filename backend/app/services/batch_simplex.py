@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class StackedResult:
+    tableaus: np.ndarray  # (k, m+1, n+1) tablas finales
+    basis: np.ndarray  # (k, m) índices de columnas básicas
+    status: np.ndarray  # (k,) "optimal" | "unbounded" | "iteration_limit" | "time_limit"
+    pivots: np.ndarray  # (k,) pivotes realizados por problema
+
+
+class StackedTableauSimplex:
+    """Simplex de tabla para k problemas de la misma forma, pivotando todos a la vez sobre un arreglo 3-D.
+
+    Cada problema parte de una base de holguras factible (b >= 0), así que no hay artificiales.
+    """
+
+    def __init__(self, tableaus: np.ndarray, basis: np.ndarray, max_iterations: np.ndarray, stall_pivots: int = 5, tol: float = 1e-9, time_limits: Optional[np.ndarray] = None) -> None:
+        self.tableaus = np.ascontiguousarray(tableaus, dtype=float)
+        self.basis = np.array(basis, dtype=int)
+        self.max_iterations = np.asarray(max_iterations)
+        # Segundos por problema (np.inf sin límite); todos arrancan juntos, así que el plazo se mide desde solve()
+        self.time_limits = np.full(self.tableaus.shape[0], np.inf) if time_limits is None else np.asarray(time_limits, dtype=float)
+        self.stall_pivots = stall_pivots
+        self.tol = tol
+
+    def solve(self) -> StackedResult:
+        k = self.tableaus.shape[0]
+        final = self.tableaus.copy()
+        basis = self.basis.copy()
+        status = np.full(k, "", dtype=object)
+        pivots = np.zeros(k, dtype=int)
+
+        # Pila de trabajo: solo los problemas activos; se compacta cuando alguno termina
+        ids = np.arange(k)
+        work = self.tableaus.copy()
+        work_basis = basis.copy()
+        degenerate_run = np.zeros(k, dtype=int)
+        deadlines = time.monotonic() + self.time_limits
+
+        def retire(labels: np.ndarray) -> np.ndarray:
+            # Saca de la pila de trabajo los problemas con etiqueta y devuelve la máscara de los que siguen
+            nonlocal ids, work, work_basis, degenerate_run
+            done = labels != ""
+            final[ids[done]] = work[done]
+            basis[ids[done]] = work_basis[done]
+            status[ids[done]] = labels[done]
+            keep = ~done
+            ids, work, work_basis, degenerate_run = ids[keep], work[keep], work_basis[keep], degenerate_run[keep]
+            return keep
+
+        while ids.size:
+            reduced = work[:, -1, :-1]
+            improving = reduced < -self.tol
+            # Dantzig por defecto; Bland (menor índice) en los problemas estancados en pivotes degenerados
+            stalled = degenerate_run >= self.stall_pivots
+            enter = np.where(stalled, improving.argmax(axis=1), reduced.argmin(axis=1))
+            columns = work[np.arange(ids.size), :-1, enter]  # (p, m)
+            positive = columns > 1e-12
+
+            labels = np.full(ids.size, "", dtype=object)
+            labels[~positive.any(axis=1)] = "unbounded"
+            labels[pivots[ids] >= self.max_iterations[ids]] = "iteration_limit"
+            labels[deadlines[ids] <= time.monotonic()] = "time_limit"
+            labels[~improving.any(axis=1)] = "optimal"
+            if (labels != "").any():
+                keep = retire(labels)
+                enter, columns, positive, stalled = enter[keep], columns[keep], positive[keep], stalled[keep]
+                if not ids.size:
+                    break
+
+            ar = np.arange(ids.size)
+            ratios = np.full(columns.shape, np.inf)
+            np.divide(work[:, :-1, -1], columns, out=ratios, where=positive)
+            theta = ratios.min(axis=1)
+            ties = np.abs(ratios - theta[:, None]) < 1e-9
+            # Desempate: la fila de menor índice, o con Bland la variable básica de menor índice
+            bland_key = np.where(ties, work_basis, np.iinfo(work_basis.dtype).max)
+            row = np.where(stalled, bland_key.argmin(axis=1), ties.argmax(axis=1))
+            degenerate_run = np.where(theta <= 1e-12, degenerate_run + 1, 0)
+
+            # Pivote apilado: actualización de rango 1 por problema, T_k <- T_k - col_k ⊗ fila_k
+            pivot_rows = work[ar, row, :] / work[ar, row, enter][:, None]
+            factors = work[ar, :, enter].copy()
+            factors[ar, row] = 0.0
+            work -= factors[:, :, None] * pivot_rows[:, None, :]
+            work[ar, row, :] = pivot_rows
+            work_basis[ar, row] = enter
+            pivots[ids] += 1
+
+        return StackedResult(final, basis, status, pivots)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.simplex_models import SimplexRequest, SimplexResponse, Solution
+from .instrumentation import SolveStats
+from .limits import SolveLimits
+from .model_input import load_model
+from .pricing import make_pricing
+from .simplex_service import LIMIT_MESSAGES, SimplexService, _run_to_end
+from .trace import IterationTrace
+
+
+# Distancia al entero más cercano por debajo de la cual un valor se considera entero
+INT_TOL = 1e-6
+
+
+@dataclass
+class Node:
+    # Tabla óptima del padre: el hijo agrega su cota como una fila nueva y re-optimiza con el simplex dual
+    tableau: np.ndarray
+    basis_names: List[str]
+    var_names: List[str]
+    excluded: np.ndarray
+    bound: float  # objetivo (interno) del padre: ningún descendiente puede superarlo
+    branch: Tuple[int, str, float]  # (variable, '<=' o '>=', valor)
+    depth: int = 1
+
+
+@dataclass
+class NodeResult:
+    status: str
+    tableau: Optional[np.ndarray] = None
+    basis_names: Optional[List[str]] = None
+    var_names: Optional[List[str]] = None
+    excluded: Optional[np.ndarray] = None
+    objective: float = -math.inf
+    values: Optional[np.ndarray] = None  # solo las variables estructurales
+    pivots: int = 0
+
+
+def _node_result(status: str, tableau: np.ndarray, basis_names: List[str], var_names: List[str], excluded: np.ndarray, num_vars: int, pivots: int) -> NodeResult:
+    if status != "optimal":
+        return NodeResult(status, pivots=pivots)
+    values = np.zeros(num_vars)
+    for row, name in enumerate(basis_names):
+        j = var_names.index(name)
+        if j < num_vars:
+            values[j] = tableau[row, -1]
+    return NodeResult(status, tableau, basis_names, var_names, excluded, float(tableau[-1, -1]), values, pivots)
+
+
+def _with_bound_row(node: Node) -> Tuple[np.ndarray, List[str], List[str], np.ndarray]:
+    """Tabla del padre con la cota de la rama como fila nueva (y su holgura básica), expresada en la base actual."""
+    parent = node.tableau
+    m, n = parent.shape[0] - 1, parent.shape[1] - 1
+    tableau = np.zeros((m + 2, n + 2))
+    tableau[:m, :n] = parent[:m, :n]
+    tableau[:m, -1] = parent[:m, -1]
+    tableau[-1, :n] = parent[-1, :n]
+    tableau[-1, -1] = parent[-1, -1]
+
+    # x_j <= u  =>  x_j + r = u;  x_j >= l  =>  -x_j + r = -l; luego se restan las filas de las básicas
+    j, sign, value = node.branch
+    a = 1.0 if sign == "<=" else -1.0
+    row = np.zeros(n + 1)
+    row[j] = a
+    row[-1] = a * value
+    name = f"x{j+1}"
+    if name in node.basis_names:
+        row -= a * parent[node.basis_names.index(name), :]
+    tableau[m, :n] = row[:n]
+    tableau[m, n] = 1.0
+    tableau[m, -1] = row[-1]
+
+    slack = f"r{node.depth}"
+    return tableau, node.basis_names + [slack], node.var_names + [slack], np.append(node.excluded, False)
+
+
+def solve_node(node: Node, num_vars: int, max_iterations: Optional[int] = None, deadline: Optional[float] = None) -> NodeResult:
+    """Resuelve un nodo hijo desde la tabla de su padre (se ejecuta en el pool de procesos)."""
+    tableau, basis_names, var_names, excluded = _with_bound_row(node)
+    limits = SolveLimits(max_iterations)
+    limits.deadline = deadline
+    status, _ = _run_to_end(SimplexService()._run_dual_simplex(tableau, basis_names, var_names, IterationTrace("none"), 0, "", limits, excluded))
+    return _node_result(status, tableau, basis_names, var_names, excluded, num_vars, limits.iterations)
+
+
+class BranchAndBound:
+    """Branch-and-bound sobre la tabla simplex: selección por mejor cota e hijos con warm start desde el padre.
+
+    Con `executor`, hasta `width` nodos abiertos se resuelven a la vez; sin él, uno por vez en este proceso.
+    Si `executor` rechaza un nodo (RuntimeError, p. ej. la cola de admisión del pool está llena), el nodo vuelve a la
+    cola y se espera a los que están en curso; si no hay ninguno, se resuelve aquí.
+    """
+
+    def __init__(self, service: Optional[SimplexService] = None, executor: Optional[Executor] = None, width: int = 1) -> None:
+        self.service = service or SimplexService()
+        self.executor = executor
+        self.width = max(1, width) if executor is not None else 1
+
+    def solve(self, req: SimplexRequest, stats: Optional[SolveStats] = None) -> SimplexResponse:
+        start = time.perf_counter()
+        # Los nodos se resuelven en otros procesos: de ellos solo se suman los pivotes
+        stats = stats or SolveStats()
+        model = load_model(req)
+        num_vars = model.c.size
+        if req.integer is None or len(req.integer) != num_vars:
+            raise ValueError(f"'integer' debe tener un valor por variable ({num_vars}).")
+        integer = np.array(req.integer, dtype=bool)
+        # La heurística de redondeo evalúa A x en cada nodo: se convierte a CSR una sola vez
+        model.A = model.as_sparse()
+
+        # Relajación lineal en la raíz: dos fases sobre la tabla, para tener una tabla óptima sin penalización M
+        lp = req.model_copy(update={"integer": None, "method": "tableau", "presolve": False, "warm_start": None, "trace_level": "none"})
+        limits = SolveLimits(lp.max_iterations, lp.time_limit)
+        service = self.service
+        with stats.stage("standard_form"):
+            c, A, b, var_names, basics_info = service._build_standard_form(lp)
+            stats.record_matrix(A)
+        status, tableau, basis_names, var_names, ranging = _run_to_end(
+            service._two_phase_tableau(c, A, b, var_names, basics_info, IterationTrace("none", stats), make_pricing(lp.pricing), limits, lp.anti_cycling)
+        )
+        if tableau is None or status != "optimal":
+            if tableau is None:
+                sol = Solution(status="infeasible", message="Problema infeasible (la relajación lineal no es factible).")
+                response = SimplexResponse(iterations=[], solution=sol)
+            else:
+                response = service._finish(status, tableau, basis_names, var_names)
+            if status == "unbounded":
+                # Sin cota en la raíz no se ramifica: el problema entero puede ser no acotado o infactible (por ejemplo,
+                # si ningún punto entero cumple una igualdad), y aquí no se distingue. Se informa "unbounded" por la
+                # relajación, con el mensaje aclarándolo
+                response.solution.message = "La relajación lineal es no acotada: el problema entero es no acotado o infactible (no se exploró el árbol)."
+            response.metadata = {"method": "branch_and_bound", "mip": {"nodes": 1, "incumbents": [], "relaxation": status}, "stats": stats.as_dict()}
+            return response
+
+        internal = -model.c if model.sense == "min" else model.c
+        incumbent: Optional[NodeResult] = None
+        history: List[Dict[str, Any]] = []
+        # Mejor cota primero; a igual cota, el nodo más profundo (suele llevar antes a una solución entera)
+        heap: List[Tuple[float, int, int, Node]] = []
+        order = itertools.count()
+        pending: Dict[Future, Node] = {}
+        nodes = 1
+        stopped: Optional[str] = None
+
+        def tolerance() -> float:
+            # Un nodo cuya cota no supera al incumbente por más que el gap pedido no puede mejorarlo lo suficiente
+            value = incumbent.objective if incumbent is not None else 0.0
+            return max(1e-9, req.mip_gap * max(1.0, abs(value)))
+
+        def best_bound() -> float:
+            bounds = [-heap[0][0]] if heap else []
+            bounds += [node.bound for node in pending.values()]
+            if incumbent is not None:
+                bounds.append(incumbent.objective)
+            return max(bounds) if bounds else -math.inf
+
+        def gap() -> Optional[float]:
+            if incumbent is None:
+                return None
+            return max(0.0, best_bound() - incumbent.objective) / max(1.0, abs(incumbent.objective))
+
+        def handle(result: NodeResult, depth: int) -> None:
+            nonlocal incumbent, stopped
+            if depth > 0:
+                stats.pivots += result.pivots
+            if result.status in LIMIT_MESSAGES:
+                stopped = stopped or result.status
+                return
+            if result.status != "optimal":
+                return  # rama infactible
+            if incumbent is not None and result.objective <= incumbent.objective + tolerance():
+                return  # podada por cota
+            distance = np.abs(result.values - np.round(result.values))
+            fractional = np.flatnonzero(integer & (distance > INT_TOL))
+            if fractional.size == 0:
+                incumbent = result
+                history.append({"node": nodes, "objective": result.objective, "seconds": round(time.perf_counter() - start, 6), "gap": gap()})
+                return
+            # Heurística de redondeo: si la solución redondeada cumple el modelo original, es un incumbente
+            rounded = self._rounded(result.values, integer, model)
+            if rounded is not None and (incumbent is None or internal @ rounded > incumbent.objective + tolerance()):
+                incumbent = NodeResult("optimal", objective=float(internal @ rounded), values=rounded)
+                history.append({"node": nodes, "objective": incumbent.objective, "seconds": round(time.perf_counter() - start, 6), "gap": gap(), "heuristic": "rounding"})
+            # Se ramifica sobre la variable más fraccionaria; ambos hijos comparten la tabla del padre
+            j = int(fractional[np.argmax(distance[fractional])])
+            value = result.values[j]
+            for sign, bound_value in (("<=", math.floor(value)), (">=", math.ceil(value))):
+                child = Node(result.tableau, result.basis_names, result.var_names, result.excluded, result.objective, (j, sign, float(bound_value)), depth + 1)
+                heapq.heappush(heap, (-result.objective, -child.depth, next(order), child))
+
+        handle(_node_result(status, tableau, basis_names, var_names, ranging.excluded, num_vars, limits.iterations), 0)
+
+        def at_node_limit() -> bool:
+            return req.node_limit is not None and nodes >= req.node_limit
+
+        while heap or pending:
+            current_gap = gap()
+            if current_gap is not None and current_gap <= req.mip_gap:
+                break
+            if limits.exceeded() == "time_limit":
+                stopped = "time_limit"
+                break
+            # Mejor cota primero: se abren tantos nodos como workers libres haya
+            while heap and len(pending) < self.width and not at_node_limit():
+                bound, _, _, node = heapq.heappop(heap)
+                if incumbent is not None and -bound <= incumbent.objective + tolerance():
+                    continue
+                nodes += 1
+                if self.executor is not None:
+                    try:
+                        pending[self.executor.submit(solve_node, node, num_vars, lp.max_iterations, limits.deadline)] = node
+                        continue
+                    except RuntimeError:
+                        if pending:
+                            nodes -= 1
+                            heapq.heappush(heap, (bound, -node.depth, next(order), node))
+                            break
+                handle(solve_node(node, num_vars, lp.max_iterations, limits.deadline), node.depth)
+                break
+            if pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    handle(future.result(), node.depth)
+            elif heap and at_node_limit():
+                stopped = "node_limit"
+            if stopped is not None:
+                break
+        for future in pending:
+            future.cancel()
+
+        seconds = time.perf_counter() - start
+        final_gap = gap()
+        closed = stopped is None or (final_gap is not None and final_gap <= req.mip_gap)
+        mip = {
+            "nodes": nodes,
+            "nodes_per_second": round(nodes / seconds, 3) if seconds > 0 else None,
+            "best_bound": None if incumbent is None and closed else best_bound(),
+            "gap": final_gap,
+            "incumbents": history,
+            "workers": self.width,
+            "seconds": round(seconds, 6),
+        }
+        metadata = {"method": "branch_and_bound", "mip": mip, "stats": stats.as_dict()}
+
+        if incumbent is None:
+            if closed:
+                sol = Solution(status="infeasible", message="Problema infeasible (ninguna solución entera en el árbol de búsqueda).")
+            else:
+                sol = Solution(status=stopped, message=f"Se detuvo la búsqueda ({stopped}) sin encontrar una solución entera.")
+            return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+
+        x = incumbent.values.copy()
+        x[integer] = np.round(x[integer])
+        values = {f"x{j+1}": float(v) for j, v in enumerate(x)}
+        sol = Solution(status="optimal" if closed else stopped, objective_value=float(internal @ x), variable_values=values)
+        if not closed:
+            sol.message = f"Se detuvo la búsqueda ({stopped}) con gap {final_gap:.3g}; se devuelve la mejor solución entera encontrada."
+        return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+
+    def _rounded(self, values: np.ndarray, integer: np.ndarray, model) -> Optional[np.ndarray]:
+        # Prueba redondear hacia abajo y al más cercano; las variables continuas conservan su valor
+        for rounding in (np.floor, np.round):
+            x = values.copy()
+            x[integer] = rounding(x[integer] + INT_TOL)
+            activity = model.A @ x
+            scale = 1e-7 * (1.0 + np.abs(model.b))
+            ok = np.where(
+                model.signs == "<=",
+                activity <= model.b + scale,
+                np.where(model.signs == ">=", activity >= model.b - scale, np.abs(activity - model.b) <= scale),
+            )
+            if ok.all():
+                return x
+        return None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+logger = logging.getLogger(__name__)
+
+
+class SolveStats:
+    """Tiempos por etapa y contadores de una resolución; se devuelven en metadata["stats"].
+
+    Las etapas no se anidan: el tiempo que no cae en ninguna (por ejemplo, el que el consumidor de
+    solve_iter retiene cada iteración) se informa como "other".
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.pivots = 0
+        self.degenerate_pivots = 0
+        self.rows: Optional[int] = None
+        self.columns: Optional[int] = None
+        self.nonzeros: Optional[int] = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def count_pivot(self, step: float) -> None:
+        # Un pivote es degenerado si no mueve el vértice (paso primal o dual nulo)
+        self.pivots += 1
+        if abs(step) <= 1e-12:
+            self.degenerate_pivots += 1
+
+    def record_matrix(self, A: Any) -> None:
+        """Dimensiones y no nulos de la matriz sobre la que se pivota (densa o dispersa)."""
+        self.rows, self.columns = A.shape
+        self.nonzeros = int(A.nnz) if sparse.issparse(A) else int(np.count_nonzero(A))
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = time.perf_counter() - self._start
+        seconds = {name: round(value, 6) for name, value in self.seconds.items()}
+        seconds["other"] = round(max(0.0, total - sum(self.seconds.values())), 6)
+        seconds["total"] = round(total, 6)
+        cells = (self.rows or 0) * (self.columns or 0)
+        return {
+            "seconds": seconds,
+            "pivots": self.pivots,
+            "degenerate_pivots": self.degenerate_pivots,
+            "rows": self.rows,
+            "columns": self.columns,
+            "nonzeros": self.nonzeros,
+            "density": round(self.nonzeros / cells, 6) if cells and self.nonzeros is not None else None,
+        }
+
+
+class ProfileHook:
+    """Ejecuta cada resolución bajo cProfile y guarda el volcado (.prof) de las que superan el umbral.
+
+    Desactivado si no hay umbral; se configura con SOLVER_PROFILE_THRESHOLD (segundos) y SOLVER_PROFILE_DIR.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, directory: Optional[str] = None) -> None:
+        self.threshold = threshold
+        self.directory = directory or tempfile.gettempdir()
+        self.dumps = 0
+
+    @classmethod
+    def from_env(cls) -> "ProfileHook":
+        threshold = os.getenv("SOLVER_PROFILE_THRESHOLD")
+        return cls(threshold=float(threshold) if threshold else None, directory=os.getenv("SOLVER_PROFILE_DIR"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold is not None
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Tuple[Any, Optional[str]]:
+        """Devuelve (resultado, ruta del volcado o None si no se perfiló o fue más rápido que el umbral)."""
+        if not self.enabled:
+            return fn(*args), None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Ya hay otro perfilador activo en este hilo: se resuelve sin perfilar
+            return fn(*args), None
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        if elapsed < self.threshold:
+            return result, None
+
+        self.dumps += 1
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"simplex-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.dumps}.prof")
+        profiler.dump_stats(path)
+        logger.info("Resolución de %.3f s (umbral %.3f s): perfil guardado en %s", elapsed, self.threshold, path)
+        return result, path
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Generator, Optional, Tuple
+
+import numpy as np
+from scipy import linalg
+
+from .limits import SolveLimits
+
+
+@dataclass
+class BarrierStep:
+    iteration: int
+    mu: float  # brecha de complementariedad media x·s / n
+    primal_infeasibility: float  # ||A x - b|| / (1 + ||b||)
+    dual_infeasibility: float  # ||A^T y + s - c|| / (1 + ||c||)
+    step_primal: float
+    step_dual: float
+    sigma: float  # parámetro de centrado elegido por el predictor
+
+
+@dataclass
+class BarrierResult:
+    status: str  # "optimal" | "diverged" | "stalled" | "iteration_limit" | "time_limit"
+    x: np.ndarray
+    y: np.ndarray
+    s: np.ndarray
+    iterations: int = 0
+    mu: float = 0.0
+
+
+class InteriorPoint:
+    """Punto interior primal-dual (predictor-corrector de Mehrotra) sobre min c·x, A x = b, x >= 0, con A densa.
+
+    Cada iteración factoriza por Cholesky las ecuaciones normales A D A^T (D = X S^{-1}) y la reutiliza para el
+    predictor y el corrector. No certifica infactibilidad ni no acotación: si los iterados divergen devuelve
+    "diverged" y quien llama decide cómo clasificar el problema.
+    """
+
+    def __init__(self, A: np.ndarray, b: np.ndarray, c: np.ndarray, tol: float = 1e-8, max_iterations: int = 200, limits: Optional[SolveLimits] = None) -> None:
+        self.A = np.asarray(A, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.limits = limits or SolveLimits()
+        self.factorizations = 0
+
+    def _factor(self, d: np.ndarray) -> Tuple[np.ndarray, bool]:
+        # A D A^T es simétrica definida positiva si A tiene rango completo; si no (filas redundantes o D muy mal
+        # condicionada), se regulariza la diagonal hasta que Cholesky la acepte
+        # syrk calcula solo un triángulo de (A D^{1/2})(A D^{1/2})^T: la mitad de operaciones que el producto completo
+        M = linalg.blas.dsyrk(1.0, (self.A * np.sqrt(d)).T, trans=1)
+        scale = max(1.0, float(np.max(np.diag(M)))) if M.size else 1.0
+        regularization = 0.0
+        while True:
+            try:
+                factor = linalg.cho_factor(M + regularization * scale * np.eye(M.shape[0]), lower=False, check_finite=False)
+                self.factorizations += 1
+                return factor
+            except linalg.LinAlgError:
+                regularization = 1e-14 if regularization == 0.0 else regularization * 100.0
+                if regularization > 1e-4:
+                    raise
+
+    def _starting_point(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Punto inicial de Mehrotra: mínimos cuadrados para x e (y, s), desplazados al interior del ortante
+        A, b, c = self.A, self.b, self.c
+        factor = self._factor(np.ones(c.size))
+        x = A.T @ linalg.cho_solve(factor, b)
+        y = linalg.cho_solve(factor, A @ c)
+        s = c - A.T @ y
+        x += max(-1.5 * x.min(), 0.0)
+        s += max(-1.5 * s.min(), 0.0)
+        xs = float(x @ s)
+        x += 0.5 * xs / max(s.sum(), 1e-12)
+        s += 0.5 * xs / max(x.sum(), 1e-12)
+        # Si el problema es trivial (b = 0 y c = 0) el desplazamiento es nulo: se parte de x = s = 1
+        if not (x > 0).all() or not (s > 0).all():
+            x, s = np.ones_like(x), np.ones_like(s)
+        return x, y, s
+
+    @staticmethod
+    def _max_step(v: np.ndarray, dv: np.ndarray) -> float:
+        # Mayor α en [0, 1] con v + α dv >= 0
+        negative = dv < 0
+        return min(1.0, float(np.min(-v[negative] / dv[negative]))) if negative.any() else 1.0
+
+    def iterate(self) -> Generator[BarrierStep, None, BarrierResult]:
+        """Entrega un BarrierStep por iteración y termina con el BarrierResult."""
+        A, b, c = self.A, self.b, self.c
+        n = c.size
+        x, y, s = self._starting_point()
+        b_norm, c_norm = 1.0 + np.linalg.norm(b), 1.0 + np.linalg.norm(c)
+        best_residual = np.inf
+        stalled = 0
+
+        for k in range(1, self.max_iterations + 1):
+            rb = A @ x - b
+            rc = A.T @ y + s - c
+            mu = float(x @ s) / n
+            primal_inf, dual_inf = np.linalg.norm(rb) / b_norm, np.linalg.norm(rc) / c_norm
+            gap = abs(float(c @ x - b @ y)) / (1.0 + abs(float(c @ x)))
+            if primal_inf < self.tol and dual_inf < self.tol and gap < self.tol:
+                return BarrierResult("optimal", x, y, s, k - 1, mu)
+            if max(np.abs(x).max(), np.abs(y).max() if y.size else 0.0) > 1e12:
+                # Sin solución acotada: x crece si no es acotado, y crece si no es factible
+                return BarrierResult("diverged", x, y, s, k - 1, mu)
+            exceeded = self.limits.exceeded()
+            if exceeded:
+                return BarrierResult(exceeded, x, y, s, k - 1, mu)
+            residual = max(primal_inf, dual_inf, gap)
+            stalled = stalled + 1 if residual > 0.5 * best_residual else 0
+            best_residual = min(best_residual, residual)
+            if stalled >= 20:
+                return BarrierResult("stalled", x, y, s, k - 1, mu)
+
+            d = x / s
+            factor = self._factor(d)
+
+            def direction(r_xs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                # A Δx = -rb, A^T Δy + Δs = -rc, S Δx + X Δs = r_xs, reducido a (A D A^T) Δy = ...
+                dy = linalg.cho_solve(factor, -rb - A @ (r_xs / s + d * rc))
+                ds = -rc - A.T @ dy
+                dx = (r_xs - x * ds) / s
+                return dx, dy, ds
+
+            # Predictor (afín): apunta directo a la complementariedad x·s = 0
+            dx_aff, _, ds_aff = direction(-x * s)
+            alpha_p, alpha_d = self._max_step(x, dx_aff), self._max_step(s, ds_aff)
+            mu_aff = float((x + alpha_p * dx_aff) @ (s + alpha_d * ds_aff)) / n
+            sigma = (mu_aff / mu) ** 3 if mu > 0 else 0.0
+
+            # Corrector: centrado σμ y término de segundo orden Δx_aff·Δs_aff, con la misma factorización
+            dx, dy, ds = direction(-x * s - dx_aff * ds_aff + sigma * mu)
+            # Fracción del paso hasta la frontera: más agresiva a medida que μ se acerca a 0
+            eta = max(0.9, min(0.995, 1.0 - mu))
+            alpha_p = min(1.0, eta * self._max_step(x, dx))
+            alpha_d = min(1.0, eta * self._max_step(s, ds))
+            x = x + alpha_p * dx
+            y = y + alpha_d * dy
+            s = s + alpha_d * ds
+            self.limits.iterations += 1
+            yield BarrierStep(k, mu, float(primal_inf), float(dual_inf), alpha_p, alpha_d, sigma)
+
+        return BarrierResult("stalled", x, y, s, self.max_iterations, float(x @ s) / n)
+
+
+def identify_basis(A: np.ndarray, x: np.ndarray, s: np.ndarray) -> Optional[np.ndarray]:
+    """Columnas candidatas a base óptima a partir de la solución de barrera (primer paso del crossover).
+
+    QR con pivoteo de columnas sobre A escalada por x_j / (x_j + s_j): las columnas con x_j >> s_j (básicas en
+    el óptimo) se eligen primero y el pivoteo descarta las que no aportan rango. La base puede no ser exactamente
+    óptima si la solución es degenerada; el simplex que sigue la corrige.
+    """
+    m, n = A.shape
+    if m > n:
+        return None
+    weight = x / (x + s)
+    # Primero solo entre las 2m columnas de mayor peso (el QR cuesta O(m² · columnas)); si no alcanzan el rango, todas
+    candidates = np.argsort(-weight, kind="stable")[: min(n, 2 * m)]
+    for cols in (candidates, np.arange(n)):
+        _, R, perm = linalg.qr(A[:, cols] * weight[cols], mode="economic", pivoting=True)
+        diag = np.abs(np.diag(R))
+        if diag.size >= m and diag[m - 1] > 1e-13 * diag[0]:
+            return np.sort(cols[perm[:m]])
+    return np.sort(perm[:m])
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class SolveLimits:
+    """Límites compartidos por todas las fases de una resolución."""
+
+    max_iterations: Optional[int] = None
+    time_limit: Optional[float] = None
+    # Pivotes degenerados consecutivos (paso 0) antes de pasar a la regla anti-ciclado
+    stall_pivots: int = 5
+    iterations: int = 0
+    deadline: Optional[float] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        if self.time_limit is not None:
+            self.deadline = time.monotonic() + self.time_limit
+
+    def exceeded(self) -> Optional[str]:
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            return "iteration_limit"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "time_limit"
+        return None
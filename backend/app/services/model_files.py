@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models.simplex_models import ConstraintMatrix, SparseMatrix
+from .model_input import encode_array
+
+
+class ModelFileError(ValueError):
+    """El archivo del modelo no se puede leer o usa algo que el solver no soporta."""
+
+
+@dataclass
+class _ModelBuilder:
+    # Modelo en tripletas mientras se lee el archivo; las columnas se numeran en orden de aparición
+    sense: str = "min"
+    columns: Dict[str, int] = field(default_factory=dict)
+    objective: Dict[int, float] = field(default_factory=dict)
+    rows: List[str] = field(default_factory=list)
+    signs: List[str] = field(default_factory=list)
+    rhs: List[float] = field(default_factory=list)
+    entries: List[Tuple[int, int, float]] = field(default_factory=list)
+    integers: Set[str] = field(default_factory=set)
+
+    def column(self, name: str) -> int:
+        return self.columns.setdefault(name, len(self.columns))
+
+    def add_row(self, name: str, sign: str, rhs: float = 0.0) -> int:
+        self.rows.append(name)
+        self.signs.append(sign)
+        self.rhs.append(rhs)
+        return len(self.rows) - 1
+
+    def add_bound(self, name: str, kind: str, value: float) -> None:
+        # x >= 0 es implícita; el resto de cotas se agrega como una fila de una sola variable
+        if value < 0:
+            raise ModelFileError(f"Cota negativa para {name}: solo se admiten variables no negativas.")
+        if kind == ">=" and value == 0:
+            return
+        row = self.add_row(f"{kind}_{name}", kind, value)
+        self.entries.append((row, self.column(name), 1.0))
+
+    def payload(self) -> Dict[str, Any]:
+        n, m = len(self.columns), len(self.rows)
+        c = np.zeros(n)
+        for j, value in self.objective.items():
+            c[j] = value
+        if self.entries:
+            rows, cols, data = (np.array(v) for v in zip(*self.entries))
+        else:
+            rows, cols, data = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return {
+            "objective": {"coefficients": c.tolist(), "sense": self.sense},
+            "matrix": ConstraintMatrix(
+                A=SparseMatrix(
+                    format="coo",
+                    shape=(m, n),
+                    data=encode_array(data),
+                    row=encode_array(rows, "int64"),
+                    col=encode_array(cols, "int64"),
+                ),
+                rhs=encode_array(self.rhs),
+                signs=self.signs or "<=",
+            ),
+            "variable_names": list(self.columns),
+            "integer": [name in self.integers for name in self.columns] if self.integers else None,
+        }
+
+
+def _number(token: str) -> float:
+    try:
+        return float(token)
+    except ValueError:
+        raise ModelFileError(f"Valor numérico inválido: {token}")
+
+
+# ---------- MPS (formato libre, separado por espacios) ----------
+MPS_SIGNS = {"L": "<=", "G": ">=", "E": "="}
+
+
+def parse_mps(text: str) -> Dict[str, Any]:
+    """Lee un modelo MPS y devuelve los campos de un SimplexRequest con la matriz en tripletas."""
+    model = _ModelBuilder()
+    objective_row: Optional[str] = None
+    row_index: Dict[str, int] = {}
+    section: Optional[str] = None
+    integer_block = False
+
+    for line_no, raw in enumerate(text.splitlines(), start=1):
+        if not raw.strip() or raw.startswith("*"):
+            continue
+        tokens = raw.split()
+        if not raw[0].isspace():
+            section = tokens[0].upper()
+            if section == "OBJSENSE" and len(tokens) > 1:
+                model.sense = "max" if tokens[1].upper().startswith("MAX") else "min"
+            elif section == "RANGES":
+                raise ModelFileError("La sección RANGES no está soportada.")
+            elif section == "ENDATA":
+                break
+            continue
+
+        if section == "OBJSENSE":
+            model.sense = "max" if tokens[0].upper().startswith("MAX") else "min"
+        elif section == "ROWS":
+            kind, name = tokens[0].upper(), tokens[1]
+            if kind == "N":
+                # Solo cuenta la primera fila N; las demás son objetivos libres que se ignoran
+                objective_row = objective_row or name
+            elif kind in MPS_SIGNS:
+                row_index[name] = model.add_row(name, MPS_SIGNS[kind])
+            else:
+                raise ModelFileError(f"Línea {line_no}: tipo de fila desconocido '{tokens[0]}'.")
+        elif section == "COLUMNS":
+            if len(tokens) >= 3 and tokens[1].strip("'").upper() == "MARKER":
+                # Las columnas entre INTORG e INTEND son enteras
+                integer_block = tokens[2].strip("'").upper() == "INTORG"
+                continue
+            col = model.column(tokens[0])
+            if integer_block:
+                model.integers.add(tokens[0])
+            for name, value in zip(tokens[1::2], tokens[2::2]):
+                if name == objective_row:
+                    model.objective[col] = _number(value)
+                elif name in row_index:
+                    model.entries.append((row_index[name], col, _number(value)))
+                else:
+                    raise ModelFileError(f"Línea {line_no}: fila desconocida '{name}'.")
+        elif section == "RHS":
+            pairs = tokens[1:] if len(tokens) % 2 == 1 else tokens
+            for name, value in zip(pairs[0::2], pairs[1::2]):
+                if name == objective_row:
+                    raise ModelFileError("Una constante en el objetivo (RHS de la fila N) no está soportada.")
+                if name not in row_index:
+                    raise ModelFileError(f"Línea {line_no}: fila desconocida '{name}'.")
+                model.rhs[row_index[name]] = _number(value)
+        elif section == "BOUNDS":
+            # TIPO [conjunto] COLUMNA [valor]: el nombre del conjunto de cotas es opcional
+            kind = tokens[0].upper()
+            with_value = kind in ("UP", "LO", "FX")
+            name = tokens[-2] if with_value else tokens[-1]
+            value = _number(tokens[-1]) if with_value else 0.0
+            if kind == "UP":
+                model.add_bound(name, "<=", value)
+            elif kind == "LO":
+                model.add_bound(name, ">=", value)
+            elif kind == "FX":
+                model.add_bound(name, ">=", value)
+                model.add_bound(name, "<=", value)
+            elif kind == "BV":
+                model.add_bound(name, "<=", 1.0)
+                model.integers.add(name)
+            elif kind != "PL":
+                raise ModelFileError(f"Línea {line_no}: cota '{kind}' no soportada (solo variables no negativas).")
+        elif section not in ("NAME", None):
+            raise ModelFileError(f"Sección MPS desconocida: {section}.")
+
+    if objective_row is None:
+        raise ModelFileError("El archivo MPS no define una fila objetivo (N).")
+    return model.payload()
+
+
+# ---------- LP (formato CPLEX) ----------
+LP_SECTIONS = [
+    (re.compile(r"^(maximize|maximise|maximum|max)$"), "max"),
+    (re.compile(r"^(minimize|minimise|minimum|min)$"), "min"),
+    (re.compile(r"^(subject\s+to|such\s+that|s\.?t\.?)$"), "constraints"),
+    (re.compile(r"^bounds?$"), "bounds"),
+    (re.compile(r"^(generals?|integers?)$"), "integers"),
+    (re.compile(r"^(binar(y|ies)|bin)$"), "binaries"),
+    (re.compile(r"^end$"), "end"),
+]
+LP_TOKEN = re.compile(r"\s*(<=|>=|=<|=>|<|>|=|[+-]|:|\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|[A-Za-z_!\"#$%&()/,.;?@'`{}|~][\w!\"#$%&()/,.;?@'`{}|~\[\]]*)")
+LP_SIGNS = {"<=": "<=", "=<": "<=", "<": "<=", ">=": ">=", "=>": ">=", ">": ">=", "=": "="}
+
+
+def _lp_tokens(text: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = LP_TOKEN.match(text, pos)
+        if match is None:
+            raise ModelFileError(f"No se pudo interpretar '{text[pos:pos + 20]}'.")
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+def _is_number(token: str) -> bool:
+    return bool(re.fullmatch(r"\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?", token))
+
+
+def _lp_expression(tokens: List[str], pos: int, model: _ModelBuilder) -> Tuple[Dict[int, float], int]:
+    # Suma de términos [signo] [coeficiente] variable hasta un comparador o el final
+    terms: Dict[int, float] = {}
+    sign, coef = 1.0, None
+    while pos < len(tokens) and tokens[pos] not in LP_SIGNS:
+        token = tokens[pos]
+        if token in "+-":
+            sign = sign * (-1.0 if token == "-" else 1.0)
+        elif _is_number(token):
+            coef = float(token)
+        else:
+            col = model.column(token)
+            terms[col] = terms.get(col, 0.0) + sign * (1.0 if coef is None else coef)
+            sign, coef = 1.0, None
+        pos += 1
+    if coef is not None:
+        raise ModelFileError("Las constantes sueltas en una expresión no están soportadas.")
+    return terms, pos
+
+
+REVERSED_SIGNS = {"<=": ">=", ">=": "<=", "=": "="}
+
+
+def _is_bound_value(token: str) -> bool:
+    return _is_number(token.lstrip("+-")) or token.lstrip("+-").lower() in ("inf", "infinity")
+
+
+def _bound_value(token: str) -> float:
+    if not _is_bound_value(token):
+        raise ModelFileError(f"Valor de cota inválido: {token}")
+    return float(token)
+
+
+def _signed(tokens: List[str]) -> List[str]:
+    # Une "-" / "+" con el número (o inf) que le sigue: ["-", "5"] -> ["-5"]
+    merged: List[str] = []
+    for token in tokens:
+        if merged and merged[-1] in "+-" and (len(merged) == 1 or merged[-2] in LP_SIGNS) and _is_bound_value(token):
+            merged[-1] = merged[-1] + token
+        else:
+            merged.append(token)
+    return merged
+
+
+def _strip_label(tokens: List[str]) -> List[str]:
+    return tokens[2:] if len(tokens) > 1 and tokens[1] == ":" else tokens
+
+
+def parse_lp(text: str) -> Dict[str, Any]:
+    """Lee un modelo en formato LP (CPLEX) y devuelve los campos de un SimplexRequest."""
+    model = _ModelBuilder()
+    blocks: Dict[str, List[str]] = {"objective": [], "constraints": [], "bounds": [], "integers": [], "binaries": []}
+    section: Optional[str] = None
+    for raw in text.splitlines():
+        line = raw.split("\\", 1)[0].strip()
+        if not line:
+            continue
+        header = next((name for pattern, name in LP_SECTIONS if pattern.match(line.lower())), None)
+        if header in ("max", "min"):
+            model.sense, section = header, "objective"
+        elif header == "end":
+            break
+        elif header is not None:
+            section = header
+        elif section is None:
+            raise ModelFileError("El archivo LP debe empezar con Maximize o Minimize.")
+        else:
+            blocks[section].append(line)
+
+    objective, _ = _lp_expression(_strip_label(_lp_tokens(" ".join(blocks["objective"]))), 0, model)
+    model.objective = objective
+
+    # Las restricciones pueden ocupar varias líneas: cada una termina en comparador + número
+    tokens = _lp_tokens(" ".join(blocks["constraints"]))
+    pos = 0
+    while pos < len(tokens):
+        if pos + 1 < len(tokens) and tokens[pos + 1] == ":":
+            label, pos = tokens[pos], pos + 2
+        else:
+            label = f"R{len(model.rows) + 1}"
+        terms, pos = _lp_expression(tokens, pos, model)
+        if pos + 1 >= len(tokens):
+            raise ModelFileError(f"Restricción '{label}' incompleta.")
+        sign, pos = LP_SIGNS[tokens[pos]], pos + 1
+        negative = tokens[pos] == "-"
+        if tokens[pos] in "+-":
+            pos += 1
+        rhs = _number(tokens[pos]) * (-1.0 if negative else 1.0)
+        pos += 1
+        row = model.add_row(label, sign, rhs)
+        model.entries.extend((row, col, value) for col, value in terms.items())
+
+    for line in blocks["bounds"]:
+        parts = _signed(_lp_tokens(line))
+        if len(parts) == 2 and parts[1].lower() == "free":
+            raise ModelFileError(f"Variables libres no soportadas: {line}")
+        if len(parts) == 5 and parts[1] in LP_SIGNS and parts[3] in LP_SIGNS:
+            # l <= x <= u (o u >= x >= l)
+            name = parts[2]
+            bounds = [(REVERSED_SIGNS[LP_SIGNS[parts[1]]], parts[0]), (LP_SIGNS[parts[3]], parts[4])]
+        elif len(parts) == 3 and parts[1] in LP_SIGNS:
+            if _is_bound_value(parts[0]):
+                name, bounds = parts[2], [(REVERSED_SIGNS[LP_SIGNS[parts[1]]], parts[0])]
+            else:
+                name, bounds = parts[0], [(LP_SIGNS[parts[1]], parts[2])]
+        else:
+            raise ModelFileError(f"Cota no soportada: {line}")
+        for kind, token in bounds:
+            value = _bound_value(token)
+            if np.isinf(value):
+                if value < 0 and kind != "<=":
+                    # x >= -inf declara x libre (como 'free' o MI en MPS): no se puede representar con x >= 0
+                    raise ModelFileError(f"Variables libres no soportadas: {line}")
+                if value > 0 and kind != ">=":
+                    continue  # x <= inf
+                raise ModelFileError(f"Cota infinita inválida: {line}")
+            if kind == "=":
+                model.add_bound(name, ">=", value)
+                model.add_bound(name, "<=", value)
+            else:
+                model.add_bound(name, kind, value)
+
+    # Variables enteras; las binarias además quedan acotadas por 1
+    for name in " ".join(blocks["integers"]).split():
+        model.integers.add(name)
+    for name in " ".join(blocks["binaries"]).split():
+        model.integers.add(name)
+        model.add_bound(name, "<=", 1.0)
+    return model.payload()
+
+
+def parse_model_file(filename: Optional[str], content: bytes, fmt: Optional[str] = None) -> Dict[str, Any]:
+    """Elige el lector por `fmt` o por la extensión del archivo (.mps / .lp)."""
+    if fmt is None and filename:
+        fmt = filename.rsplit(".", 1)[-1].lower() if "." in filename else None
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ModelFileError("El archivo debe estar en texto UTF-8.")
+    if fmt == "mps":
+        return parse_mps(text)
+    if fmt == "lp":
+        return parse_lp(text)
+    raise ModelFileError("Formato de modelo no soportado: use un archivo .mps o .lp.")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from typing import Any, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from ..models.simplex_models import BinaryArray, SimplexRequest
+
+
+# '<' y '>' se tratan como '<=' y '>=', igual que en Constraint
+SIGN_ALIASES = {"<": "<=", ">": ">="}
+FLIPPED_SIGNS = {"<=": ">=", ">=": "<=", "=": "="}
+
+
+@dataclass
+class ModelArrays:
+    c: np.ndarray  # objetivo tal como llega (sin negar para 'min')
+    sense: str
+    A: Union[np.ndarray, sparse.csr_matrix]
+    b: np.ndarray
+    signs: np.ndarray  # "<=", ">=" o "=" por fila
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.A.shape
+
+    def as_dense(self) -> np.ndarray:
+        return self.A.toarray() if sparse.issparse(self.A) else self.A
+
+    def as_sparse(self) -> sparse.csr_matrix:
+        return self.A if sparse.issparse(self.A) else sparse.csr_matrix(self.A)
+
+    def normalized(self) -> "ModelArrays":
+        """Misma región con lado derecho no negativo: las filas con b < 0 se multiplican por -1."""
+        negative = self.b < 0
+        if not negative.any():
+            return self
+        scale = np.where(negative, -1.0, 1.0)
+        if sparse.issparse(self.A):
+            A = sparse.diags(scale) @ self.A
+        else:
+            A = self.A * scale[:, None]
+        signs = self.signs.copy()
+        signs[negative] = [FLIPPED_SIGNS[s] for s in signs[negative]]
+        return ModelArrays(self.c, self.sense, A, np.abs(self.b), signs)
+
+
+def encode_array(values: Any, dtype: str = "float64") -> BinaryArray:
+    """Empaqueta un arreglo como buffer base64 (útil para clientes y para armar requests internos)."""
+    arr = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return BinaryArray(data=base64.b64encode(arr.tobytes()).decode("ascii"), dtype=dtype, shape=list(arr.shape))
+
+
+def decode_array(value: Union[list, BinaryArray], dtype: str = "float64") -> np.ndarray:
+    if isinstance(value, BinaryArray):
+        # np.frombuffer no copia: el arreglo es una vista (de solo lectura) sobre los bytes decodificados
+        arr = np.frombuffer(base64.b64decode(value.data), dtype=np.dtype(value.dtype).newbyteorder("<"))
+        if value.shape is not None:
+            arr = arr.reshape(value.shape)
+        return arr if value.dtype == dtype else arr.astype(dtype)
+    return np.asarray(value, dtype=dtype)
+
+
+def _load_matrix(A: Any, m: int, n: int) -> Union[np.ndarray, sparse.csr_matrix]:
+    if isinstance(A, BinaryArray):
+        dense = decode_array(A)
+        return dense.reshape(m, n) if dense.ndim == 1 else dense
+    data = decode_array(A.data)
+    if A.format == "coo":
+        if A.row is None or A.col is None:
+            raise ValueError("El formato coo requiere 'row' y 'col'.")
+        matrix = sparse.coo_matrix((data, (decode_array(A.row, "int64"), decode_array(A.col, "int64"))), shape=A.shape)
+        return matrix.tocsr()
+    if A.indptr is None or A.indices is None:
+        raise ValueError("El formato csr requiere 'indptr' e 'indices'.")
+    return sparse.csr_matrix((data, decode_array(A.indices, "int64"), decode_array(A.indptr, "int64")), shape=A.shape)
+
+
+def load_model(req: SimplexRequest) -> ModelArrays:
+    """Arreglos NumPy/SciPy del modelo, sin pasar por listas densas cuando llega como `matrix`."""
+    c = np.asarray(req.objective.coefficients, dtype=float)
+    n = c.size
+    if req.matrix is None:
+        m = len(req.constraints)
+        A = np.array([cons.coefficients for cons in req.constraints], dtype=float).reshape(m, n) if m else np.zeros((0, n))
+        b = np.array([cons.rhs for cons in req.constraints], dtype=float)
+        signs = np.array([SIGN_ALIASES.get(cons.sign, cons.sign) for cons in req.constraints], dtype=object)
+        return ModelArrays(c, req.objective.sense, A, b, signs)
+
+    if req.constraints:
+        raise ValueError("Indique las restricciones en 'constraints' o en 'matrix', no en ambos.")
+    b = decode_array(req.matrix.rhs).ravel()
+    A = _load_matrix(req.matrix.A, b.size, n)
+    if A.shape != (b.size, n):
+        raise ValueError(f"La matriz tiene forma {A.shape}; se esperaba ({b.size}, {n}).")
+    signs_in = req.matrix.signs
+    if isinstance(signs_in, str):
+        signs = np.full(b.size, SIGN_ALIASES.get(signs_in, signs_in), dtype=object)
+    else:
+        if len(signs_in) != b.size:
+            raise ValueError(f"Se recibieron {len(signs_in)} signos para {b.size} filas.")
+        signs = np.array([SIGN_ALIASES.get(s, s) for s in signs_in], dtype=object)
+    return ModelArrays(c, req.objective.sense, A, b, signs)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ..models.simplex_models import ConstraintMatrix, SimplexRequest, SimplexResponse, Solution, SparseMatrix
+from .model_input import encode_array, load_model
+
+
+TOL = 1e-9
+
+
+@dataclass
+class PresolveResult:
+    request: Optional[SimplexRequest]  # modelo reducido; None si el presolve ya decidió el estado
+    num_rows: int
+    num_cols: int
+    kept_rows: np.ndarray
+    kept_cols: np.ndarray
+    fixed: Dict[int, float] = field(default_factory=dict)
+    # Aporte de las variables fijadas al objetivo interno (maximización)
+    offset: float = 0.0
+    status: Optional[str] = None  # "infeasible" | "optimal" (sin variables libres)
+    # Columnas vacías que mejoran el objetivo: el problema es no acotado si el resto es factible
+    unbounded_cols: List[int] = field(default_factory=list)
+    # Filas singleton que fijaron una variable, en orden de eliminación: (fila, columna original, costo interno, es '=')
+    fixing_rows: List[Tuple[int, np.ndarray, float, bool]] = field(default_factory=list)
+    # Matriz y costos internos originales: el postsolve calcula con ellos los costos reducidos de lo eliminado
+    matrix: Optional[np.ndarray] = None
+    costs: Optional[np.ndarray] = None
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rows": self.num_rows,
+            "cols": self.num_cols,
+            "rows_removed": self.num_rows - len(self.kept_rows),
+            "cols_removed": self.num_cols - len(self.kept_cols),
+            "fixed_variables": len(self.fixed),
+            "seconds": round(self.seconds, 6),
+        }
+
+
+def _to_leq(a: np.ndarray, sign: str, rhs: float):
+    # Fila '>=' expresada como '<=' multiplicando por -1
+    return (-a, -rhs) if sign == ">=" else (a, rhs)
+
+
+def presolve(req: SimplexRequest) -> PresolveResult:
+    """Reduce el modelo: filas vacías, duplicadas o implicadas, filas singleton, variables fijas y columnas vacías."""
+    start = time.perf_counter()
+    model = load_model(req)
+    c = np.array(model.c, dtype=float)
+    internal = -c if model.sense == "min" else c
+    m, n = model.shape
+    # Copias de trabajo: el presolve modifica A y b en el lugar
+    original = np.array(model.as_dense(), dtype=float)
+    A = original.copy()
+    b = np.array(model.b, dtype=float)
+    signs = list(model.signs)
+
+    row_alive = np.ones(m, dtype=bool)
+    col_alive = np.ones(n, dtype=bool)
+    fixed: Dict[int, float] = {}
+    upper = np.full(n, np.inf)  # cotas superiores implicadas por filas singleton
+    upper_row = np.full(n, -1)
+    unbounded_cols: List[int] = []
+    fixing_rows: List[Tuple[int, np.ndarray, float, bool]] = []
+
+    def result(status: Optional[str]) -> PresolveResult:
+        offset = float(sum(internal[j] * v for j, v in fixed.items()))
+        res = PresolveResult(None, m, n, np.flatnonzero(row_alive), np.flatnonzero(col_alive), fixed, offset, status, unbounded_cols, fixing_rows, original, internal)
+        res.seconds = time.perf_counter() - start
+        return res
+
+    def fix(j: int, value: float, row: Optional[int] = None) -> None:
+        if row is not None:
+            # La columna todavía está intacta: con ella el postsolve recupera el dual de la fila
+            fixing_rows.append((row, A[:, j].copy(), float(internal[j]), signs[row] == "="))
+        b[:] -= A[:, j] * value
+        A[:, j] = 0.0
+        col_alive[j] = False
+        fixed[j] = float(value)
+
+    changed = True
+    while changed:
+        changed = False
+
+        # Columnas vacías: valen 0; si mejoran el objetivo, el problema es no acotado salvo que el resto sea infactible
+        for j in np.flatnonzero(col_alive & ~np.any(A[row_alive] != 0.0, axis=0)):
+            if internal[j] > TOL:
+                unbounded_cols.append(int(j))
+            fix(int(j), 0.0)
+            changed = True
+
+        for i in np.flatnonzero(row_alive):
+            nz = np.flatnonzero(A[i])
+            if nz.size == 0:
+                # Fila vacía: 0 (signo) b
+                if (signs[i] == "<=" and b[i] < -TOL) or (signs[i] == ">=" and b[i] > TOL) or (signs[i] == "=" and abs(b[i]) > TOL):
+                    return result("infeasible")
+                row_alive[i] = False
+                changed = True
+            elif nz.size == 1:
+                j = int(nz[0])
+                value = b[i] / A[i, j]
+                if signs[i] == "=":
+                    # Singleton de igualdad: fija la variable
+                    if value < -TOL:
+                        return result("infeasible")
+                    row_alive[i] = False
+                    fix(j, max(value, 0.0), i)
+                    changed = True
+                    continue
+                a_leq, _ = _to_leq(A[i], signs[i], b[i])
+                if a_leq[j] < 0:
+                    # Cota inferior x_j >= value: redundante si no supera la no negatividad
+                    if value <= TOL:
+                        row_alive[i] = False
+                        changed = True
+                    continue
+                # Cota superior x_j <= value
+                if value < -TOL:
+                    return result("infeasible")
+                if value <= TOL:
+                    row_alive[i] = False
+                    fix(j, 0.0, i)
+                    changed = True
+                elif value < upper[j]:
+                    if upper_row[j] >= 0:
+                        row_alive[upper_row[j]] = False
+                    upper[j], upper_row[j] = value, i
+                    changed = True
+                elif upper_row[j] != i:
+                    row_alive[i] = False  # cota más floja que una ya registrada
+                    changed = True
+
+        # Filas duplicadas (múltiplos positivos): se conserva la más ajustada
+        seen: Dict[bytes, int] = {}
+        for i in np.flatnonzero(row_alive):
+            if np.count_nonzero(A[i]) < 2:
+                continue
+            a, rhs = _to_leq(A[i], signs[i], b[i])
+            scale = np.abs(a).max()
+            a, rhs = a / scale, rhs / scale
+            if signs[i] == "=" and a[np.flatnonzero(a)[0]] < 0:
+                a, rhs = -a, -rhs
+            key = (signs[i] == "=").to_bytes(1, "little") + np.round(a, 9).tobytes()
+            if key not in seen:
+                seen[key] = i
+                continue
+            k = seen[key]
+            a_k, rhs_k = _to_leq(A[k], signs[k], b[k])
+            scale_k = np.abs(a_k).max()
+            a_k, rhs_k = a_k / scale_k, rhs_k / scale_k
+            if signs[i] == "=":
+                if a_k[np.flatnonzero(a_k)[0]] < 0:
+                    rhs_k = -rhs_k
+                if abs(rhs - rhs_k) > 1e-7:
+                    return result("infeasible")
+                row_alive[i] = False
+            elif rhs < rhs_k:
+                row_alive[k] = False
+                seen[key] = i
+            else:
+                row_alive[i] = False
+            changed = True
+
+        # Filas '<=' implicadas por x >= 0 y las cotas singleton: su actividad máxima no alcanza el lado derecho
+        for i in np.flatnonzero(row_alive):
+            if signs[i] == "=" or np.count_nonzero(A[i]) < 2:
+                continue
+            a, rhs = _to_leq(A[i], signs[i], b[i])
+            positive = a > 0
+            if np.any(np.isinf(upper[positive])):
+                continue
+            if float(a[positive] @ upper[positive]) <= rhs + TOL:
+                row_alive[i] = False
+                changed = True
+
+    res = result("optimal" if not col_alive.any() else None)
+    if res.status is None:
+        rows, cols = res.kept_rows, res.kept_cols
+        # El modelo reducido viaja como tripletas COO, sin volver a listas densas por fila
+        reduced = sparse.coo_matrix(A[np.ix_(rows, cols)])
+        res.request = req.model_copy(update={
+            "objective": req.objective.model_copy(update={"coefficients": c[cols].tolist()}),
+            "constraints": [],
+            "matrix": ConstraintMatrix(
+                A=SparseMatrix(
+                    format="coo",
+                    shape=reduced.shape,
+                    data=encode_array(reduced.data),
+                    row=encode_array(reduced.row, "int64"),
+                    col=encode_array(reduced.col, "int64"),
+                ),
+                rhs=encode_array(b[rows]),
+                signs=[signs[i] for i in rows],
+            ),
+            "variable_names": [req.variable_names[j] for j in cols] if req.variable_names else None,
+            "warm_start": None,
+        })
+    res.seconds = time.perf_counter() - start
+    return res
+
+
+def postsolve(result: PresolveResult, response: Optional[SimplexResponse] = None) -> SimplexResponse:
+    """Lleva la solución del modelo reducido de vuelta a las variables y filas originales."""
+    if response is None:
+        if result.status == "infeasible":
+            sol = Solution(status="infeasible", message="Problema infeasible (detectado en el presolve).")
+        else:
+            sol = Solution(status="optimal", objective_value=result.offset, variable_values={}, shadow_prices={}, reduced_costs={})
+        response = SimplexResponse(iterations=[], solution=sol)
+
+    if result.unbounded_cols and response.solution.status in ("optimal", "multiple_optima", "unbounded"):
+        names = ", ".join(f"x{j+1}" for j in result.unbounded_cols)
+        response.solution = Solution(status="unbounded", message=f"La solución es no acotada ({names} no aparece en ninguna restricción).")
+
+    sol = response.solution
+    if sol.variable_values is not None:
+        # Solo las variables estructurales: las auxiliares del modelo reducido no tienen fila original equivalente
+        values = {f"x{j+1}": 0.0 for j in range(result.num_cols)}
+        for k, j in enumerate(result.kept_cols):
+            values[f"x{j+1}"] = sol.variable_values.get(f"x{k+1}", 0.0)
+        for j, value in result.fixed.items():
+            values[f"x{j+1}"] = float(value)
+        sol.variable_values = values
+    if sol.objective_value is not None and result.request is not None:
+        sol.objective_value += result.offset
+    y: Optional[np.ndarray] = None
+    if sol.shadow_prices is not None:
+        # Las filas vacías, duplicadas o implicadas no limitan el óptimo: dual 0
+        y = np.zeros(result.num_rows)
+        for k, i in enumerate(result.kept_rows):
+            y[i] = sol.shadow_prices.get(f"y{k+1}", 0.0)
+        # Una fila que fijó x_j toma el dual que anula su costo reducido: y_i = (c_j - Σ_k a_kj y_k) / a_ij.
+        # En orden inverso: las filas eliminadas después solo dependen de columnas fijadas antes
+        for i, column, cost, equality in reversed(result.fixing_rows):
+            residual = cost - float(column @ y)
+            # En una cota x_j <= 0 el dual debe tener el signo de la fila; si x_j no quiere crecer, no limita
+            y[i] = residual / column[i] if equality or residual > TOL else 0.0
+        sol.shadow_prices = {f"y{i+1}": float(v) for i, v in enumerate(y)}
+    if sol.reduced_costs is not None:
+        kept = {int(j): sol.reduced_costs[f"x{k+1}"] for k, j in enumerate(result.kept_cols) if f"x{k+1}" in sol.reduced_costs}
+        if y is not None:
+            # Las columnas eliminadas se completan con los duales recuperados: d_j = Σ_i a_ij y_i - c_j
+            removed = y @ result.matrix - result.costs
+            kept = {j: kept.get(j, float(removed[j])) for j in range(result.num_cols)}
+        sol.reduced_costs = {f"x{j+1}": value for j, value in sorted(kept.items())}
+    reduced_model = len(result.kept_rows) < result.num_rows or len(result.kept_cols) < result.num_cols
+    if sol.sensitivity is not None and reduced_model:
+        # Los rangos del modelo reducido no valen para el original: una fila descartada puede volver a limitar
+        sol.sensitivity = None
+        response.notes = (response.notes or []) + ["Análisis de sensibilidad no disponible: el presolve eliminó filas o columnas del modelo."]
+
+    response.metadata = {**(response.metadata or {}), "presolve": result.summary()}
+    return response
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+
+# Tolerancia para considerar un costo reducido como negativo (mejora)
+TOL = 1e-9
+
+
+class PricingRule(ABC):
+    """Regla de selección de la variable entrante sobre la fila de costos reducidos de la tabla.
+
+    Una instancia guarda estado de una sola resolución (pesos, cursor), por lo que se crea una por solve.
+    """
+
+    name = "base"
+    # Columnas que no pueden entrar a la base (p. ej. artificiales que se conservan en la Fase II)
+    excluded: Optional[np.ndarray] = None
+
+    def reduced_costs(self, tableau: np.ndarray) -> np.ndarray:
+        reduced_costs = tableau[-1, :-1]
+        if self.excluded is None:
+            return reduced_costs
+        return np.where(self.excluded, 0.0, reduced_costs)
+
+    def reset(self, tableau: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        """Índice de la columna entrante, o None si ningún costo reducido mejora el objetivo."""
+
+    def before_pivot(self, tableau: np.ndarray, row_idx: int, col_idx: int) -> None:
+        pass
+
+
+class DantzigPricing(PricingRule):
+    name = "dantzig"
+
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        reduced_costs = self.reduced_costs(tableau)
+        if reduced_costs.size == 0:
+            return None
+        # Para maximización, con la convención de la tabla (−c en la última fila), elegimos el costo reducido más negativo
+        enter_idx = int(np.argmin(reduced_costs))
+        if reduced_costs[enter_idx] >= -TOL:
+            return None
+        return enter_idx
+
+
+class BlandPricing(PricingRule):
+    name = "bland"
+
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        # Regla de Bland: la columna de menor índice con costo reducido negativo
+        cols = np.flatnonzero(self.reduced_costs(tableau) < -TOL)
+        return int(cols[0]) if cols.size else None
+
+
+class SteepestEdgePricing(PricingRule):
+    name = "steepest_edge"
+
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        reduced_costs = self.reduced_costs(tableau)
+        cols = np.flatnonzero(reduced_costs < -TOL)
+        if cols.size == 0:
+            return None
+        # La tabla completa contiene B^{-1} a_j, así que la norma de cada arista es exacta
+        block = tableau[:-1, cols]
+        norms = 1.0 + np.einsum("ij,ij->j", block, block)
+        return int(cols[np.argmax(reduced_costs[cols] ** 2 / norms)])
+
+
+class DevexPricing(PricingRule):
+    name = "devex"
+
+    def reset(self, tableau: np.ndarray) -> None:
+        # Marco de referencia inicial: todas las variables con peso 1
+        self.weights = np.ones(tableau.shape[1] - 1)
+
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        reduced_costs = self.reduced_costs(tableau)
+        cols = np.flatnonzero(reduced_costs < -TOL)
+        if cols.size == 0:
+            return None
+        return int(cols[np.argmax(reduced_costs[cols] ** 2 / self.weights[cols])])
+
+    def before_pivot(self, tableau: np.ndarray, row_idx: int, col_idx: int) -> None:
+        # w_j = max(w_j, (α_rj / α_rq)^2 · w_q); la variable saliente queda con max(w_q / α_rq^2, 1)
+        pivot_row = tableau[row_idx, :-1]
+        np.maximum(self.weights, (pivot_row / pivot_row[col_idx]) ** 2 * self.weights[col_idx], out=self.weights)
+
+
+class PartialPricing(PricingRule):
+    name = "partial"
+
+    def __init__(self, segments: int = 8) -> None:
+        self.segments = segments
+
+    def reset(self, tableau: np.ndarray) -> None:
+        self.segment = 0
+
+    def choose(self, tableau: np.ndarray) -> Optional[int]:
+        reduced_costs = self.reduced_costs(tableau)
+        n = reduced_costs.size
+        if n == 0:
+            return None
+        size = -(-n // self.segments)
+        num_segments = -(-n // size)
+        # Recorrer los segmentos en forma circular y quedarse con el mejor del primero que tenga candidatos
+        for k in range(num_segments):
+            seg = (self.segment + k) % num_segments
+            block = reduced_costs[seg * size:(seg + 1) * size]
+            j = int(np.argmin(block))
+            if block[j] < -TOL:
+                self.segment = (seg + 1) % num_segments
+                return seg * size + j
+        return None
+
+
+PRICING_RULES: Dict[str, Type[PricingRule]] = {
+    rule.name: rule for rule in (DantzigPricing, DevexPricing, SteepestEdgePricing, PartialPricing, BlandPricing)
+}
+
+
+def make_pricing(name: str) -> PricingRule:
+    if name not in PRICING_RULES:
+        raise ValueError(f"Regla de pricing no soportada: {name}")
+    return PRICING_RULES[name]()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Generator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from .limits import SolveLimits
+
+
+class BasisFactorization:
+    """Factorización LU de la base con actualizaciones eta (forma producto) entre refactorizaciones."""
+
+    def __init__(self, A: sparse.csc_matrix, basis: np.ndarray, refactor_every: int = 50) -> None:
+        self.A = A
+        self.refactor_every = refactor_every
+        self.refactorizations = 0
+        self.refactor(basis)
+
+    def refactor(self, basis: np.ndarray) -> None:
+        self._lu = splu(self.A[:, basis].tocsc())
+        # Archivo eta: (fila pivote, valor pivote, índices no nulos, valores no nulos) de cada columna d = B^{-1} a_q
+        self._etas: List[Tuple[int, float, np.ndarray, np.ndarray]] = []
+        self.refactorizations += 1
+
+    def ftran(self, v: np.ndarray) -> np.ndarray:
+        """Resuelve B x = v."""
+        x = self._lu.solve(np.asarray(v, dtype=float))
+        for r, pivot, idx, vals in self._etas:
+            xr = x[r] / pivot
+            x[idx] -= xr * vals
+            x[r] = xr
+        return x
+
+    def btran(self, v: np.ndarray) -> np.ndarray:
+        """Resuelve y^T B = v^T."""
+        w = np.array(v, dtype=float)
+        for r, pivot, idx, vals in reversed(self._etas):
+            w[r] = (w[r] - (w[idx] @ vals - w[r] * pivot)) / pivot
+        return self._lu.solve(w, trans="T")
+
+    def update(self, basis: np.ndarray, r: int, d: np.ndarray) -> bool:
+        """Registra el cambio de base en la fila r; devuelve True si se refactorizó."""
+        idx = np.flatnonzero(d)
+        self._etas.append((r, float(d[r]), idx, d[idx].copy()))
+        if len(self._etas) >= self.refactor_every:
+            self.refactor(basis)
+            return True
+        return False
+
+
+@dataclass
+class RevisedResult:
+    status: str  # "optimal" | "unbounded" | "iteration_limit" | "time_limit"
+    basis: np.ndarray
+    x_basic: np.ndarray
+    duals: np.ndarray
+    reduced_costs: np.ndarray
+    pivots: int = 0
+    refactorizations: int = 0
+
+
+class RevisedSimplex:
+    """Simplex revisado (maximización) sobre A x = b, x >= 0 con A dispersa en formato CSC."""
+
+    def __init__(self, A: sparse.csc_matrix, b: np.ndarray, basis: List[int], refactor_every: int = 50, tol: float = 1e-9, limits: Optional[SolveLimits] = None, anti_cycling: bool = True) -> None:
+        self.A = sparse.csc_matrix(A, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.basis = np.array(basis, dtype=int)
+        self.refactor_every = refactor_every
+        self.tol = tol
+        self.limits = limits or SolveLimits()
+        self.anti_cycling = anti_cycling
+        self.degenerate_pivots = 0
+        self.pivots = 0
+        self.refactorizations = 0
+
+    def _column(self, j: int) -> np.ndarray:
+        col = np.zeros(self.A.shape[0])
+        start, end = self.A.indptr[j], self.A.indptr[j + 1]
+        col[self.A.indices[start:end]] = self.A.data[start:end]
+        return col
+
+    def solve(self, c: np.ndarray, excluded: Optional[np.ndarray] = None) -> RevisedResult:
+        """Optimiza c^T x desde la base actual. Las columnas en `excluded` no pueden entrar y,
+        si están en la base, salen en cuanto el pivote las movería (ratio 0)."""
+        steps = self.iterate(c, excluded)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def iterate(self, c: np.ndarray, excluded: Optional[np.ndarray] = None) -> Generator[Tuple[int, int, int], None, RevisedResult]:
+        """Igual que `solve`, pero entrega (fila, columna entrante, columna saliente) tras cada pivote."""
+        A, b, basis = self.A, self.b, self.basis
+        c = np.asarray(c, dtype=float)
+        factor = BasisFactorization(A, basis, self.refactor_every)
+        x_basic = factor.ftran(b)
+
+        def result(status: str, duals: np.ndarray, reduced: np.ndarray) -> RevisedResult:
+            self.refactorizations += factor.refactorizations
+            return RevisedResult(status, basis, x_basic, duals, reduced, self.pivots, self.refactorizations)
+
+        degenerate_run = 0
+        while True:
+            # Precios a partir de los factores: y^T = c_B^T B^{-1}, d = c - A^T y
+            duals = factor.btran(c[basis])
+            reduced = c - A.T @ duals
+            reduced[basis] = 0.0
+            candidates = reduced.copy()
+            if excluded is not None:
+                candidates[excluded] = 0.0
+            improving = np.flatnonzero(candidates > self.tol)
+            if improving.size == 0:
+                return result("optimal", duals, reduced)
+            exceeded = self.limits.exceeded()
+            if exceeded:
+                return result(exceeded, duals, reduced)
+
+            # Tras una racha de pivotes degenerados, regla de Bland hasta que el objetivo vuelva a mejorar
+            stalled = self.anti_cycling and degenerate_run >= self.limits.stall_pivots
+            enter = int(improving[0]) if stalled else int(improving[np.argmax(candidates[improving])])
+
+            direction = factor.ftran(self._column(enter))
+            blocking = direction > 1e-12
+            forced = np.zeros_like(blocking)
+            if excluded is not None:
+                forced = excluded[basis] & (np.abs(direction) > 1e-12)
+            if not (blocking | forced).any():
+                return result("unbounded", duals, reduced)
+            ratios = np.full(direction.shape, np.inf)
+            np.divide(x_basic, direction, out=ratios, where=blocking)
+            ratios[forced] = 0.0
+            theta = ratios.min()
+            ties = np.flatnonzero(np.abs(ratios - theta) < 1e-9)
+            # Desempate: la fila de menor índice, o con Bland la variable básica de menor índice
+            row = int(ties[np.argmin(basis[ties])]) if stalled else int(ties[0])
+            if theta <= 1e-12:
+                degenerate_run += 1
+                self.degenerate_pivots += 1
+            else:
+                degenerate_run = 0
+
+            x_basic -= theta * direction
+            x_basic[row] = theta
+            leaving = int(basis[row])
+            basis[row] = enter
+            self.pivots += 1
+            self.limits.iterations += 1
+            if factor.update(basis, row, direction):
+                # Tras refactorizar, recalcular x_B para no arrastrar error numérico
+                x_basic = factor.ftran(b)
+            yield row, enter, leaving
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.simplex_models import Range, Sensitivity
+
+
+TOL = 1e-9
+
+
+@dataclass
+class RangingContext:
+    """Lo necesario para leer B^{-1}, duales y rangos directamente de la tabla final.
+
+    Cada fila de la tabla tiene una columna que empezó siendo ±e_k (holgura, artificial o excedente):
+    en la tabla final esa columna es ±B^{-1} e_k, así que no hace falta invertir nada.
+    """
+
+    costs: np.ndarray  # costo interno (maximización) de cada columna en la fila objetivo actual
+    identity_cols: np.ndarray  # por fila de la tabla
+    identity_sign: np.ndarray  # +1, o -1 si la columna es -e_k (excedente)
+    terms: List[List[Tuple[int, float]]]  # por fila original: (fila de la tabla, coeficiente de b_i en ella)
+    objective: np.ndarray  # coeficientes del objetivo tal como llegaron
+    rhs: np.ndarray  # lado derecho tal como llegó
+    sense: str = "max"
+    excluded: Optional[np.ndarray] = None  # artificiales: no cuentan como columnas no básicas al medir rangos
+    surplus_for: Dict[int, int] = field(default_factory=dict)  # artificial de una fila '>=' -> su excedente
+
+    @property
+    def num_vars(self) -> int:
+        return self.objective.size
+
+    def without_rows(self, rows: List[int]) -> "RangingContext":
+        """Contexto tras eliminar filas redundantes de la tabla: esas restricciones quedan sin términos."""
+        keep = np.setdiff1d(np.arange(self.identity_cols.size), rows)
+        new_index = {int(old): new for new, old in enumerate(keep)}
+        terms = [[(new_index[k], coef) for k, coef in row if k in new_index] for row in self.terms]
+        return replace(self, identity_cols=self.identity_cols[keep], identity_sign=self.identity_sign[keep], terms=terms)
+
+    def without_columns(self, cols: List[int]) -> "RangingContext":
+        """Contexto tras quitar artificiales de filas '>=': su excedente pasa a ser la columna identidad (signo -1)."""
+        identity_cols, identity_sign = self.identity_cols.copy(), self.identity_sign.copy()
+        for k, col in enumerate(identity_cols):
+            if col in self.surplus_for and col in cols:
+                identity_cols[k], identity_sign[k] = self.surplus_for[int(col)], -1.0
+        keep = np.setdiff1d(np.arange(self.costs.size), cols)
+        return replace(
+            self,
+            costs=self.costs[keep],
+            identity_cols=np.searchsorted(keep, identity_cols),
+            identity_sign=identity_sign,
+            excluded=self.excluded[keep] if self.excluded is not None else None,
+            surplus_for={},
+        )
+
+
+def _ratio_limits(x: np.ndarray, d: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+    # Máximo aumento y disminución de t que mantienen x + t·d >= 0 (None: sin límite)
+    x = np.maximum(x, 0.0)
+    down, up = d > TOL, d < -TOL
+    increase = float(np.min(x[up] / -d[up])) if up.any() else None
+    decrease = float(np.min(x[down] / d[down])) if down.any() else None
+    return increase, decrease
+
+
+def analyze(tableau: np.ndarray, basis_cols: List[int], ctx: RangingContext) -> Tuple[Dict[str, float], Dict[str, float], Sensitivity]:
+    """Precios duales, costos reducidos y rangos de c y b leídos de la tabla óptima.
+
+    Duales y costos reducidos están en la convención de objective_value (maximización interna);
+    los rangos se expresan sobre los coeficientes y lados derechos tal como llegaron en el request.
+    """
+    m = tableau.shape[0] - 1
+    reduced = tableau[-1, :-1]
+    x_basic = tableau[:m, -1]
+
+    # B^{-1} e_k = signo_k · (columna identidad k); y_k = signo_k · (d_j + c_j) en esa misma columna
+    binv = tableau[:m, ctx.identity_cols] * ctx.identity_sign
+    y_rows = ctx.identity_sign * (reduced[ctx.identity_cols] + ctx.costs[ctx.identity_cols])
+
+    pinned = np.zeros(m, dtype=bool)
+    if ctx.excluded is not None:
+        # Con Big-M, una artificial básica en 0 (p. ej. de una igualdad redundante) arrastra su costo -M a los
+        # duales. Se leen los de la Fase II: la misma base con costo 0 para las artificiales, es decir
+        # c_B' = c_B + δ, y' = y + δ B^{-1} y d' = d + δ B^{-1} A
+        basic = np.asarray(basis_cols, dtype=int)
+        pinned = ctx.excluded[basic]
+        delta = np.where(pinned, -ctx.costs[basic], 0.0)
+        if np.any(delta != 0.0):
+            reduced = reduced + delta @ tableau[:m, :-1]
+            y_rows = y_rows + delta @ binv
+
+    shadow_prices: Dict[str, float] = {}
+    rhs_ranges: Dict[str, Range] = {}
+    for i, terms in enumerate(ctx.terms):
+        name = f"y{i+1}"
+        if not terms:
+            # Fila redundante eliminada en la Fase I: cualquier cambio aislado de b_i la vuelve infactible
+            shadow_prices[name] = 0.0
+            rhs_ranges[name] = Range(value=float(ctx.rhs[i]), allowable_increase=0.0, allowable_decrease=0.0)
+            continue
+        rows = [k for k, _ in terms]
+        coefs = np.array([coef for _, coef in terms])
+        shadow_prices[name] = float(coefs @ y_rows[rows])
+        direction = binv[:, rows] @ coefs
+        if np.any(np.abs(direction[pinned]) > TOL):
+            # Mover b_i haría positiva una artificial básica: la base deja de ser factible en ambos sentidos
+            increase, decrease = 0.0, 0.0
+        else:
+            increase, decrease = _ratio_limits(x_basic, direction)
+        rhs_ranges[name] = Range(value=float(ctx.rhs[i]), allowable_increase=increase, allowable_decrease=decrease)
+
+    n = ctx.num_vars
+    row_of = {int(j): p for p, j in enumerate(basis_cols)}
+    nonbasic = np.ones(reduced.size, dtype=bool)
+    nonbasic[list(row_of)] = False
+    if ctx.excluded is not None:
+        nonbasic &= ~ctx.excluded
+
+    reduced_costs: Dict[str, float] = {}
+    objective_ranges: Dict[str, Range] = {}
+    for j in range(n):
+        reduced_costs[f"x{j+1}"] = float(reduced[j])
+        if j not in row_of:
+            # No básica: puede mejorar hasta anular su costo reducido
+            increase, decrease = float(reduced[j]), None
+        else:
+            # Básica en la fila p: un cambio δ de c_j mueve cada d_k en δ·α_pk
+            alpha = tableau[row_of[j], :-1]
+            increase, decrease = _ratio_limits(np.where(nonbasic, reduced, np.inf), np.where(nonbasic, alpha, 0.0))
+        if ctx.sense == "min":
+            # El objetivo interno es -c: subir c_j interno equivale a bajarlo en el request
+            increase, decrease = decrease, increase
+        objective_ranges[f"x{j+1}"] = Range(value=float(ctx.objective[j]), allowable_increase=increase, allowable_decrease=decrease)
+
+    return shadow_prices, reduced_costs, Sensitivity(objective=objective_ranges, rhs=rhs_ranges)
@@ -1,277 +1,1019 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Dict, Optional
+from concurrent.futures import Executor, Future
+from dataclasses import replace
+from typing import Dict, Generator, Iterator, List, Optional, Tuple, Union
 import numpy as np
+from scipy import linalg, sparse
 
-from ..models.simplex_models import SimplexRequest, SimplexResponse, Iteration, Solution
+from ..models.simplex_models import ScenarioTable, SimplexRequest, SimplexResponse, SimplexScenarioRequest, SimplexScenarioResponse, Iteration, Solution, WarmStart
+from .batch_simplex import StackedTableauSimplex
+from .instrumentation import ProfileHook, SolveStats
+from .interior_point import InteriorPoint, identify_basis
+from .limits import SolveLimits
+from .model_input import decode_array, encode_array, load_model
+from .presolve import postsolve, presolve
+from .pricing import BlandPricing, DantzigPricing, PricingRule, make_pricing
+from .revised_simplex import RevisedResult, RevisedSimplex
+from .sensitivity import RangingContext, analyze
+from .trace import IterationTrace
+from .warm_start import decode_basis_token, encode_basis_token
+
+
+LIMIT_MESSAGES = {
+    "iteration_limit": "Se alcanzó el límite de iteraciones antes de llegar al óptimo.",
+    "time_limit": "Se alcanzó el límite de tiempo antes de llegar al óptimo.",
+}
+
+
+def _run_to_end(steps: Generator):
+    # Avanza un generador de resolución descartando lo que entregue y devuelve su valor de retorno
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _scenario_matrix(value, width: int, label: str) -> np.ndarray:
+    matrix = decode_array(value)
+    if matrix.ndim == 1 and width and matrix.size % width == 0:
+        matrix = matrix.reshape(-1, width)
+    if matrix.ndim != 2 or matrix.shape[1] != width:
+        raise ValueError(f"'{label}' debe tener {width} columnas por escenario; se recibió forma {matrix.shape}.")
+    return matrix
 
 
 class SimplexService:
     BIG_M = 1e6
+    # Perfilado opcional de las resoluciones lentas (SOLVER_PROFILE_THRESHOLD)
+    profile_hook = ProfileHook.from_env()
 
     def solve(self, req: SimplexRequest) -> SimplexResponse:
+        response, profile = self.profile_hook.run(self._solve_collected, req)
+        if profile is not None:
+            response.metadata = {**(response.metadata or {}), "profile": profile}
+        return response
+
+    def _solve_collected(self, req: SimplexRequest) -> SimplexResponse:
+        iterations: List[Iteration] = []
+        for event in self.solve_iter(req):
+            if isinstance(event, Iteration):
+                iterations.append(event)
+            else:
+                event.iterations = iterations
+                return event
+
+    def solve_iter(self, req: SimplexRequest) -> Iterator[Union[Iteration, SimplexResponse]]:
+        """Resuelve como generador: entrega cada Iteration apenas se pivota y termina con la SimplexResponse
+        (sin iteraciones), así quien consume no necesita guardar la traza completa.
+
+        metadata["stats"] lleva los tiempos por etapa, los pivotes (y cuántos fueron degenerados) y la forma
+        y densidad de la matriz pivotada."""
+        stats = SolveStats()
         try:
+            response = yield from self._solve_events(req, stats)
+        except Exception as exc:
+            sol = Solution(status="error", message=f"Error al resolver: {exc}")
+            response = SimplexResponse(iterations=[], solution=sol)
+        response.metadata = {**(response.metadata or {}), "stats": stats.as_dict()}
+        yield response
+
+    def _solve_events(self, req: SimplexRequest, stats: Optional[SolveStats] = None) -> Generator[Iteration, None, SimplexResponse]:
+        stats = stats or SolveStats()
+        if req.integer is not None and any(req.integer):
+            # Import local: branch_and_bound se apoya en este módulo para resolver cada nodo
+            from .branch_and_bound import BranchAndBound
+
+            return BranchAndBound(self).solve(req, stats)
+        if req.presolve:
+            with stats.stage("presolve"):
+                reduced = presolve(req)
+            if reduced.request is None:
+                return postsolve(reduced)
+            response = yield from self._solve_events(reduced.request.model_copy(update={"presolve": False}), stats)
+            with stats.stage("postsolve"):
+                return postsolve(reduced, response)
+
+        limits = SolveLimits(req.max_iterations, req.time_limit)
+        trace = IterationTrace(req.trace_level, stats)
+        if req.method == "revised":
+            return (yield from self._solve_revised(req, trace, limits))
+        if req.method == "interior_point":
+            return (yield from self._solve_interior_point(req, trace, limits))
+
+        notes: List[str] = []
+        if req.method == "dual":
+            dual = yield from self._solve_dual(req, trace, limits)
+            if dual is not None:
+                return dual
+            # La base de holguras no es dual factible: se resuelve con el simplex primal de dos fases
+            notes.append("La base inicial no es dual factible; se resolvió con el método de dos fases.")
+            req = req.model_copy(update={"phases": "two_phase"})
+
+        with stats.stage("standard_form"):
             c, A, b, var_names, basics_info = self._build_standard_form(req)
-            iterations: List[Iteration] = []
+            stats.record_matrix(A)
+        pricing = make_pricing(req.pricing)
 
-            tableau, basis_names = self._initial_tableau(c, A, b, basics_info)
-            iteration_idx = 0
-            iterations.append(self._snapshot(iteration_idx, tableau, basis_names, None, None, None, "Tabla inicial."))
+        if req.warm_start is not None:
+            warm = yield from self._solve_warm(req, c, A, b, var_names, basics_info, trace, pricing, limits)
+            if warm is not None:
+                return warm
+            notes.append("La base inicial indicada no es válida para este modelo; se resolvió desde cero.")
 
-            while True:
-                iteration_idx += 1
-                enter_idx = self._choose_entering_variable(tableau)
+        if req.phases == "two_phase" and basics_info["artificial_rows"]:
+            response = yield from self._solve_two_phase(c, A, b, var_names, basics_info, trace, pricing, limits, req.anti_cycling)
+        else:
+            with stats.stage("initial_tableau"):
+                tableau, basis_names = self._initial_tableau(c, A, b, basics_info, var_names)
+            yield from trace.record(0, tableau, basis_names, None, None, None, "Tabla inicial.")
+            status, iteration_idx = yield from self._run_simplex(tableau, basis_names, var_names, trace, 0, pricing=pricing, limits=limits, anti_cycling=req.anti_cycling)
+            ranging = basics_info["ranging"]
+            artificial_rows = [i for i, name in enumerate(basis_names) if name in {var_names[j] for j in basics_info["artificial_rows"]}]
+            if status == "optimal" and artificial_rows and np.all(tableau[artificial_rows, -1] <= 1e-7):
+                # Una artificial básica en 0 oculta con su -M costos reducidos que sin la penalización mejoran el
+                # objetivo: se termina como la Fase II del método de dos fases, sobre la misma tabla
+                status, tableau, basis_names, var_names, ranging = yield from self._phase_two(
+                    tableau, basis_names, c, var_names, basics_info, trace, iteration_idx, pricing, limits, req.anti_cycling, "Big-M: "
+                )
+            with stats.stage("extraction"):
+                response = self._finish(status, tableau, basis_names, var_names, ranging)
+        response.notes = notes or None
+        return response
+
+    # ---------- Resolución por lotes ----------
+    def solve_batch(self, reqs: List[SimplexRequest], executor: Optional[Executor] = None) -> Iterator[SimplexResponse]:
+        """Resuelve varios problemas y devuelve las respuestas en el orden de entrada.
+
+        Los problemas con base de holguras factible se agrupan por forma y se pivotan juntos en un arreglo 3-D;
+        cada grupo y cada sobrante es un trabajo en `executor` (o se resuelve aquí mismo si no se indica). Los
+        trabajos se envían al llamar, no al iterar: si `executor` rechaza alguno, se cancelan los ya enviados y el
+        error llega a quien llama.
+        """
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i, req in enumerate(reqs):
+            shape = self._stack_shape(req)
+            if shape is not None:
+                groups.setdefault(shape, []).append(i)
+        group_of: Dict[int, List[int]] = {i: members for members in groups.values() if len(members) > 1 for i in members}
+
+        # Por índice: el future del sobrante, o el del lote completo en el primer miembro de cada grupo
+        pending: Dict[int, Future] = {}
+        if executor is not None:
+            try:
+                for i, req in enumerate(reqs):
+                    if i not in group_of:
+                        pending[i] = executor.submit(self.solve, req)
+                    elif group_of[i][0] == i:
+                        pending[i] = executor.submit(self._solve_stacked, [reqs[j] for j in group_of[i]])
+            except BaseException:
+                for future in pending.values():
+                    future.cancel()
+                raise
+        return self._batch_responses(reqs, group_of, pending)
+
+    def _batch_responses(self, reqs: List[SimplexRequest], group_of: Dict[int, List[int]], pending: Dict[int, Future]) -> Iterator[SimplexResponse]:
+        done: Dict[int, SimplexResponse] = {}
+        for i, req in enumerate(reqs):
+            if i in group_of and i not in done:
+                members = group_of[i]
+                stacked = pending.pop(i).result() if i in pending else self._solve_stacked([reqs[j] for j in members])
+                done.update(zip(members, stacked))
+            if i in done:
+                yield done.pop(i)
+            elif i in pending:
+                yield pending.pop(i).result()
+            else:
+                yield self.solve(req)
+
+    # ---------- Barrido de escenarios ----------
+    def solve_scenarios(self, req: SimplexScenarioRequest) -> SimplexScenarioResponse:
+        """Resuelve el caso base una vez y evalúa cada lado derecho (u objetivo) con la misma base óptima.
+
+        x_B = B^{-1} b de todos los escenarios se calcula en un solo producto de matrices; solo los escenarios
+        en que esa base deja de ser factible (u óptima) se re-optimizan, con el simplex dual (o primal) desde ella.
+        """
+        if (req.rhs is None) == (req.objectives is None):
+            raise ValueError("Indique los escenarios en 'rhs' o en 'objectives' (exactamente uno).")
+        problem = req.problem.model_copy(update={"method": "tableau", "presolve": False, "warm_start": None, "trace_level": "none"})
+        model = load_model(problem)
+        m, n = model.shape
+        rhs = _scenario_matrix(req.rhs, m, "rhs") if req.rhs is not None else None
+        objectives = _scenario_matrix(req.objectives, n, "objectives") if req.objectives is not None else None
+        count = (rhs if rhs is not None else objectives).shape[0]
+
+        limits = SolveLimits(problem.max_iterations, problem.time_limit)
+        trace = IterationTrace("none")
+        pricing = make_pricing(problem.pricing)
+        c, A, b, var_names, basics_info = self._build_standard_form(problem)
+        status, tableau, basis_names, var_names, ranging = _run_to_end(self._two_phase_tableau(c, A, b, var_names, basics_info, trace, pricing, limits, problem.anti_cycling))
+        if tableau is None:
+            sol = Solution(status="infeasible", message="Problema infeasible (la Fase I termina con artificiales positivas).")
+            base = SimplexResponse(iterations=[], solution=sol)
+        else:
+            base = self._finish(status, tableau, basis_names, var_names, ranging)
+
+        table = ScenarioTable(variables=[f"x{j+1}" for j in range(n)], status=[], objective_value=[], values=[], pivots=[])
+        metadata = {"scenarios": count, "shared_basis": 0, "reoptimized": 0, "cold_solves": 0}
+        if base.solution.status not in ("optimal", "multiple_optima"):
+            # Sin base óptima que compartir: cada escenario se resuelve desde cero
+            for k in range(count):
+                scenario = self._scenario_request(problem, rhs[k] if rhs is not None else None, objectives[k] if objectives is not None else None)
+                sol = self.solve(scenario).solution
+                values = [sol.variable_values.get(name, 0.0) for name in table.variables] if sol.variable_values is not None and sol.status != "infeasible" else None
+                self._add_scenario_row(table, sol.status, sol.objective_value if values is not None else None, values, None)
+            metadata["cold_solves"] = count
+            return SimplexScenarioResponse(base=base, scenarios=table, metadata=metadata)
+
+        rows = tableau.shape[0] - 1
+        col_of = {name: j for j, name in enumerate(var_names)}
+        basis_cols = np.array([col_of[name] for name in basis_names], dtype=int)
+        if rhs is not None:
+            # Cada fila original entra en la tabla con el signo con que se normalizó: b_tabla = P b
+            P = np.zeros((rows, m))
+            for i, terms in enumerate(ranging.terms):
+                for k, coef in terms:
+                    P[k, i] += coef
+            binv = tableau[:rows, ranging.identity_cols] * ranging.identity_sign
+            X = binv @ (P @ rhs.T)
+            costs = np.tile(ranging.costs, (count, 1))
+            ready = np.all(X >= -1e-9, axis=0)
+        else:
+            internal = -objectives if model.sense == "min" else objectives
+            costs = np.tile(ranging.costs, (count, 1))
+            costs[:, :n] = internal
+            # Costos reducidos de todos los escenarios con la misma B^{-1}A: d = c_B B^{-1}A - c
+            X = np.repeat(tableau[:rows, -1:], count, axis=1)
+            D = costs[:, basis_cols] @ tableau[:rows, :-1] - costs
+            ready = np.all(D[:, ~ranging.excluded] >= -1e-9, axis=1)
+        objective = np.einsum("kp,pk->k", costs[:, basis_cols], X)
+
+        structural = basis_cols < n
+        for k in range(count):
+            if ready[k]:
+                x = np.zeros(n)
+                x[basis_cols[structural]] = X[structural, k]
+                self._add_scenario_row(table, "optimal", float(objective[k]), x, 0)
+                metadata["shared_basis"] += 1
+                continue
+            # La base compartida dejó de servir: re-optimizar desde ella (dual si cambió b, primal si cambió c)
+            t = tableau.copy()
+            t[:rows, -1] = X[:, k]
+            t[-1, -1] = objective[k]
+            scenario_basis = basis_names.copy()
+            scenario_limits = SolveLimits(problem.max_iterations)
+            scenario_limits.deadline = limits.deadline
+            if rhs is not None:
+                status, _ = _run_to_end(self._run_dual_simplex(t, scenario_basis, var_names, trace, 0, "", scenario_limits, ranging.excluded))
+            else:
+                t[-1, :-1] = D[k]
+                status, _ = _run_to_end(self._run_simplex(t, scenario_basis, var_names, trace, 0, "", pricing, scenario_limits, problem.anti_cycling, ranging.excluded))
+            metadata["reoptimized"] += 1
+            if status != "optimal":
+                self._add_scenario_row(table, status, None, None, scenario_limits.iterations)
+                continue
+            x = np.zeros(n)
+            for p, name in enumerate(scenario_basis):
+                if col_of[name] < n:
+                    x[col_of[name]] = t[p, -1]
+            self._add_scenario_row(table, "optimal", float(t[-1, -1]), x, scenario_limits.iterations)
+
+        if rhs is not None:
+            # Las filas redundantes que la Fase I eliminó no están en la tabla: se verifican sobre el modelo original
+            self._check_scenario_rows(table, model, rhs)
+        return SimplexScenarioResponse(base=base, scenarios=table, metadata=metadata)
+
+    def _add_scenario_row(self, table: ScenarioTable, status: str, objective: Optional[float], values, pivots: Optional[int]) -> None:
+        table.status.append(status)
+        table.objective_value.append(objective)
+        table.values.append([float(v) for v in values] if values is not None else None)
+        table.pivots.append(pivots)
+
+    def _check_scenario_rows(self, table: ScenarioTable, model, rhs: np.ndarray) -> None:
+        for k, values in enumerate(table.values):
+            if values is None:
+                continue
+            activity = model.as_sparse() @ np.asarray(values)
+            slack = np.where(model.signs == ">=", activity - rhs[k], rhs[k] - activity)
+            violated = slack < -1e-7 * (1.0 + np.abs(rhs[k]))
+            violated |= (model.signs == "=") & (np.abs(activity - rhs[k]) > 1e-7 * (1.0 + np.abs(rhs[k])))
+            if violated.any():
+                table.status[k], table.objective_value[k], table.values[k] = "infeasible", None, None
+
+    def _scenario_request(self, problem: SimplexRequest, rhs: Optional[np.ndarray], objective: Optional[np.ndarray]) -> SimplexRequest:
+        # Dos fases como el caso base: con big_m un escenario infactible puede salir como no acotado
+        update: Dict = {"phases": "two_phase"}
+        if objective is not None:
+            update["objective"] = problem.objective.model_copy(update={"coefficients": objective.tolist()})
+        if rhs is not None and problem.matrix is not None:
+            update["matrix"] = problem.matrix.model_copy(update={"rhs": encode_array(rhs)})
+        elif rhs is not None:
+            update["constraints"] = [cons.model_copy(update={"rhs": float(value)}) for cons, value in zip(problem.constraints, rhs)]
+        return problem.model_copy(update=update)
+
+    def _stack_shape(self, req: SimplexRequest) -> Optional[Tuple[int, int]]:
+        # Solo filas '<=' tras normalizar el signo del lado derecho: la base inicial son las holguras
+        # Enteras (branch-and-bound) y warm start tienen su propio camino: la pila solo resuelve la relajación en frío
+        if req.method != "tableau" or req.pricing != "dantzig" or req.presolve or req.warm_start is not None or (req.integer is not None and any(req.integer)):
+            return None
+        try:
+            model = load_model(req)
+        except ValueError:
+            return None  # el error se informa al resolverlo por separado
+        le = ((model.signs == "<=") & (model.b >= 0)) | ((model.signs == ">=") & (model.b <= 0))
+        if model.b.size == 0 or not le.all():
+            return None
+        return model.shape
+
+    def _solve_stacked(self, reqs: List[SimplexRequest]) -> List[SimplexResponse]:
+        try:
+            forms = [self._build_standard_form(req) for req in reqs]
+            c = np.stack([form[0] for form in forms])
+            A = np.stack([form[1] for form in forms])
+            b = np.stack([form[2] for form in forms])
+            k, m, n = A.shape
+            # La base inicial son las holguras (costo 0), así que la fila objetivo ya es consistente: no hace falta escanear
+            tableaus = np.zeros((k, m + 1, n + 1))
+            tableaus[:, :m, :n] = A
+            tableaus[:, :m, -1] = b
+            tableaus[:, -1, :n] = -c
+            slack_cols = np.array(forms[0][4]["slack_rows"])
+            basis = np.tile(slack_cols, (k, 1))
+            max_iterations = np.array([req.max_iterations or np.iinfo(np.int64).max for req in reqs])
+            time_limits = np.array([req.time_limit if req.time_limit is not None else np.inf for req in reqs])
+            result = StackedTableauSimplex(tableaus, basis, max_iterations, time_limits=time_limits).solve()
+        except Exception as exc:
+            sol = Solution(status="error", message=f"Error al resolver: {exc}")
+            return [SimplexResponse(iterations=[], solution=sol) for _ in reqs]
+
+        var_names = forms[0][3]
+        responses: List[SimplexResponse] = []
+        for idx in range(k):
+            tableau, status = result.tableaus[idx], str(result.status[idx])
+            metadata = {"method": "batched", "batch_size": k, "pivots": int(result.pivots[idx])}
+            if status != "optimal":
+                response = self._finish(status, tableau, [], var_names)
+                response.metadata = metadata
+                responses.append(response)
+                continue
+            # Con base inicial de holguras, B^{-1} y los precios duales están en las columnas de holgura
+            basis_cols = result.basis[idx].tolist()
+            basis_names = [var_names[j] for j in basis_cols]
+            _, sol = self._extract_solution(tableau, basis_names, var_names, forms[idx][4]["ranging"], basis_cols)
+            responses.append(SimplexResponse(iterations=[], solution=sol, metadata=metadata))
+        return responses
+
+    def _run_simplex(self, tableau: np.ndarray, basis_names: List[str], var_names: List[str], trace: IterationTrace, iteration_idx: int, prefix: str = "", pricing: Optional[PricingRule] = None, limits: Optional[SolveLimits] = None, anti_cycling: str = "none", excluded: Optional[np.ndarray] = None) -> Generator[Iteration, None, Tuple[str, int]]:
+        pricing = pricing or DantzigPricing()
+        pricing.reset(tableau)
+        limits = limits or SolveLimits()
+        bland = BlandPricing()
+        # Columnas que no pueden volver a entrar (artificiales de filas '=' en la Fase II)
+        pricing.excluded = bland.excluded = excluded
+        col_of = {name: j for j, name in enumerate(var_names)}
+        # Columnas de la base de partida: en ellas la tabla guarda B^{-1}, base de la regla lexicográfica
+        lex_cols = [col_of[name] for name in basis_names if name in col_of]
+        degenerate_run = 0
+
+        while True:
+            # La etapa 'pivoting' cubre pricing, test del cociente y pivote; la copia para la traza va aparte
+            with trace.stats.stage("pivoting"):
+                exceeded = limits.exceeded()
+                if exceeded:
+                    return exceeded, iteration_idx
+
+                # Tras una racha de pivotes degenerados se usa la regla anti-ciclado hasta que el objetivo vuelva a mejorar
+                stalled = anti_cycling != "none" and degenerate_run >= limits.stall_pivots
+                enter_idx = self._choose_entering_variable(tableau, bland if stalled and anti_cycling == "bland" else pricing)
                 if enter_idx is None:
                     # Costos óptimos o todos reducidos cerca de 0
-                    status, sol = self._extract_solution(tableau, basis_names, var_names)
-                    if status == "optimal":
-                        reduced = tableau[-1][:-1]
-                        if any(abs(v) < 1e-9 for i, v in enumerate(reduced) if self._col_is_nonbasic(i, basis_names)):
-                            sol.status = "multiple_optima"
-                    return SimplexResponse(iterations=iterations, solution=sol)
-
-                leave_row = self._choose_leaving_row(tableau, enter_idx)
+                    return "optimal", iteration_idx
+
+                if stalled and anti_cycling == "lexicographic":
+                    leave_row = self._choose_leaving_row(tableau, enter_idx, lex_cols=lex_cols)
+                elif stalled:
+                    leave_row = self._choose_leaving_row(tableau, enter_idx, basis_cols=[col_of.get(name, len(col_of)) for name in basis_names])
+                else:
+                    leave_row = self._choose_leaving_row(tableau, enter_idx)
                 if leave_row is None:
-                    sol = Solution(status="unbounded", message="La solución es no acotada.")
-                    return SimplexResponse(iterations=iterations, solution=sol)
+                    return "unbounded", iteration_idx
 
+                step = tableau[leave_row, -1] / tableau[leave_row, enter_idx]
+                degenerate_run = degenerate_run + 1 if step <= 1e-12 else 0
+                trace.stats.count_pivot(step)
+
+                iteration_idx += 1
+                limits.iterations += 1
                 leaving_var = basis_names[leave_row]
                 entering_var = self._column_name(enter_idx, var_names)
 
+                pricing.before_pivot(tableau, leave_row, enter_idx)
                 self._pivot(tableau, leave_row, enter_idx)
                 basis_names[leave_row] = entering_var
+            rule_note = f"[{anti_cycling}] " if stalled else ""
 
-                iterations.append(
-                    self._snapshot(
-                        iteration_idx,
-                        tableau,
-                        basis_names,
-                        entering_var,
-                        leaving_var,
-                        (leave_row, enter_idx),
-                        f"Pivote en fila {leave_row+1}, columna {enter_idx+1}. Entra {entering_var}, sale {leaving_var}.",
-                    )
+            yield from trace.record(
+                    iteration_idx,
+                    tableau,
+                    basis_names,
+                    entering_var,
+                    leaving_var,
+                    (leave_row, enter_idx),
+                    f"{prefix}{rule_note}Pivote en fila {leave_row+1}, columna {enter_idx+1}. Entra {entering_var}, sale {leaving_var}.",
+            )
+
+    def _finish(self, status: str, tableau: np.ndarray, basis_names: List[str], var_names: List[str], ranging: Optional[RangingContext] = None) -> SimplexResponse:
+        if status == "unbounded":
+            sol = Solution(status="unbounded", message="La solución es no acotada.")
+            return SimplexResponse(iterations=[], solution=sol)
+        if status in LIMIT_MESSAGES:
+            sol = Solution(status=status, message=LIMIT_MESSAGES[status])
+            return SimplexResponse(iterations=[], solution=sol)
+
+        if status == "infeasible":
+            sol = Solution(status="infeasible", objective_value=None, variable_values=None, message="Problema infeasible (el simplex dual no encuentra fila pivote).")
+            return SimplexResponse(iterations=[], solution=sol)
+
+        status, sol = self._extract_solution(tableau, basis_names, var_names, ranging)
+        metadata = None
+        if status == "optimal":
+            # Base final para re-optimizar después (warm start) enviándola de vuelta o vía token
+            metadata = {"basis": basis_names.copy(), "basis_token": encode_basis_token(basis_names)}
+        return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+
+    # ---------- Simplex dual sin artificiales ----------
+    def _solve_dual(self, req: SimplexRequest, trace: IterationTrace, limits: Optional[SolveLimits] = None) -> Generator[Iteration, None, Optional[SimplexResponse]]:
+        with trace.stats.stage("standard_form"):
+            model = load_model(req)
+        c = -model.c if model.sense == "min" else model.c
+        # La base de holguras es dual factible si ningún costo reducido inicial (-c) es negativo
+        if np.any(c > 1e-9):
+            return None
+
+        # Todas las filas como '<=': las '>=' se multiplican por -1 (lado derecho negativo) y las '=' se desdoblan
+        le = np.isin(model.signs, ("<=", "="))
+        ge = np.isin(model.signs, (">=", "="))
+        # Cada fila original ocupa una posición (dos si es '='), en el mismo orden de entrada
+        source = np.repeat(np.arange(model.b.size), le.astype(int) + ge.astype(int))
+        negate = np.zeros(source.size, dtype=bool)
+        negate[np.cumsum(le.astype(int) + ge.astype(int))[ge] - 1] = True
+        scale = np.where(negate, -1.0, 1.0)
+        m, n = source.size, c.size
+
+        with trace.stats.stage("initial_tableau"):
+            tableau = np.zeros((m + 1, n + m + 1))
+            tableau[:m, :n] = model.as_dense()[source] * scale[:, None]
+            tableau[np.arange(m), n + np.arange(m)] = 1.0
+            tableau[:m, -1] = model.b[source] * scale
+            tableau[-1, :n] = -c
+        trace.stats.record_matrix(tableau[:m, :-1])
+        var_names = [f"x{j+1}" for j in range(n)] + [f"s{i+1}" for i in range(m)]
+        basis_names = var_names[n:]
+        # Cada fila original aporta a sus posiciones con el signo con que se copió (dos términos si es '=')
+        terms: List[List[Tuple[int, float]]] = [[] for _ in range(model.b.size)]
+        for k, i in enumerate(source):
+            terms[i].append((k, float(scale[k])))
+        ranging = RangingContext(np.concatenate([c, np.zeros(m)]), n + np.arange(m), np.ones(m), terms, model.c, model.b, model.sense)
+
+        yield from trace.record(0, tableau, basis_names, None, None, None, "Tabla inicial (simplex dual, sin artificiales).")
+        status, _ = yield from self._run_dual_simplex(tableau, basis_names, var_names, trace, 0, "Dual: ", limits)
+        with trace.stats.stage("extraction"):
+            response = self._finish(status, tableau, basis_names, var_names, ranging)
+        response.metadata = {**(response.metadata or {}), "method": "dual"}
+        return response
+
+    # ---------- Warm start desde una base previa ----------
+    def _solve_warm(self, req: SimplexRequest, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str], basics_info: Dict, trace: IterationTrace, pricing: PricingRule, limits: SolveLimits) -> Generator[Iteration, None, Optional[SimplexResponse]]:
+        warm = req.warm_start
+        basis = decode_basis_token(warm.basis_token) if warm.basis_token else warm.basis
+        artificial_cols = basics_info["artificial_rows"]
+        artificial_names = {var_names[j] for j in artificial_cols}
+        m = A.shape[0]
+        if not basis or len(basis) != m or len(set(basis)) != m or not set(basis) <= set(var_names) - artificial_names:
+            return None
+
+        # Partiendo de una base sin artificiales, sobran las de filas '>=' (su excedente guarda B^{-1});
+        # las de filas '=' se conservan con costo 0 y sin poder entrar, solo para leer B^{-1} al final
+        ranging, c = self._phase_two_costs(basics_info["ranging"], c, artificial_cols)
+        ranging, keep = self._drop_surplus_artificials(ranging)
+        var_names = [var_names[j] for j in keep]
+        with trace.stats.stage("initial_tableau"):
+            tableau = np.zeros((m + 1, len(keep) + 1))
+            tableau[:m, :-1] = A[:, keep]
+            tableau[:m, -1] = b
+            tableau[-1, :-1] = -c[keep]
+
+            # Instalar la base con una sola factorización LU: [B^{-1} A | B^{-1} b] y la fila objetivo canónica
+            col_of = {name: j for j, name in enumerate(var_names)}
+            basis_cols = [col_of[name] for name in basis]
+            lu, piv = linalg.lu_factor(tableau[:m, basis_cols], check_finite=False)
+            pivots = np.abs(np.diag(lu))
+            if pivots.min() <= 1e-9 * max(1.0, pivots.max()):
+                return None  # base singular para este modelo
+            tableau[:m, :] = linalg.lu_solve((lu, piv), tableau[:m, :], check_finite=False)
+            tableau[-1, :] -= tableau[-1, basis_cols] @ tableau[:m, :]
+            basis_names = list(basis)
+
+        primal_feasible = bool(np.all(tableau[:m, -1] >= -1e-9))
+        dual_feasible = bool(np.all(tableau[-1, :-1] >= -1e-9))
+        if not (primal_feasible or dual_feasible):
+            return None
+        yield from trace.record(0, tableau, basis_names, None, None, None, "Tabla inicial desde la base previa (warm start).")
+        if primal_feasible:
+            # Cambió el objetivo (o nada): la base sigue siendo factible, basta con el simplex primal
+            status, _ = yield from self._run_simplex(tableau, basis_names, var_names, trace, 0, "Primal: ", pricing, limits, req.anti_cycling, ranging.excluded)
+        elif dual_feasible:
+            # Cambió el lado derecho: la base sigue siendo óptima en costos, el simplex dual recupera la factibilidad
+            status, _ = yield from self._run_dual_simplex(tableau, basis_names, var_names, trace, 0, "Dual: ", limits, ranging.excluded)
+        with trace.stats.stage("extraction"):
+            response = self._finish(status, tableau, basis_names, var_names, ranging)
+        response.metadata = {**(response.metadata or {}), "warm_start": True}
+        return response
+
+    # ---------- Punto interior con crossover ----------
+    def _solve_interior_point(self, req: SimplexRequest, trace: IterationTrace, limits: SolveLimits) -> Generator[Iteration, None, SimplexResponse]:
+        stats = trace.stats
+        with stats.stage("standard_form"):
+            c, A, b, var_names, basics_info = self._build_standard_form(req)
+            stats.record_matrix(A)
+        # La barrera no necesita base inicial: trabaja sobre A x = b, x >= 0 sin columnas artificiales
+        real = np.setdiff1d(np.arange(c.size), basics_info["artificial_rows"])
+        metadata: Dict = {"method": "interior_point"}
+        notes: List[str] = []
+        basis: Optional[List[str]] = None
+        iteration_idx = 0
+
+        if A.shape[0]:
+            engine = InteriorPoint(A[:, real], b, -c[real], limits=limits)
+            yield from trace.record(0, None, [], None, None, None, f"Barrera: punto inicial de Mehrotra ({A.shape[0]} filas, {real.size} columnas).")
+            steps = engine.iterate()
+            while True:
+                try:
+                    with stats.stage("barrier"):
+                        step = next(steps)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                iteration_idx = step.iteration
+                yield from trace.record(
+                    step.iteration,
+                    None,
+                    [],
+                    None,
+                    None,
+                    None,
+                    f"Barrera {step.iteration}: μ = {step.mu:.3e}, infactibilidad primal {step.primal_infeasibility:.2e}, "
+                    f"dual {step.dual_infeasibility:.2e}, pasos ({step.step_primal:.3f}, {step.step_dual:.3f}), σ = {step.sigma:.3f}.",
                 )
-        except Exception as exc:
-            sol = Solution(status="error", message=f"Error al resolver: {exc}")
+            metadata["barrier"] = {"status": result.status, "iterations": result.iterations, "mu": result.mu, "factorizations": engine.factorizations}
+            if result.status in LIMIT_MESSAGES:
+                sol = Solution(status=result.status, message=LIMIT_MESSAGES[result.status])
+                return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+            if result.status == "optimal":
+                with stats.stage("crossover"):
+                    cols = identify_basis(A[:, real], result.x, result.s)
+                if cols is not None:
+                    basis = [var_names[j] for j in real[cols]]
+            else:
+                # Sin certificado de la barrera: el simplex decide si es infactible o no acotado
+                notes.append("La barrera no convergió (posible problema infactible o no acotado); se resolvió con el método de dos fases.")
+
+        # Crossover: se instala la base identificada y el simplex (primal o dual) termina en una solución básica;
+        # sus pivotes no se trazan, el registro de iteraciones queda con las de barrera
+        silent = IterationTrace("none", stats)
+        pricing = make_pricing(req.pricing)
+        pivots_before = limits.iterations
+        response = None
+        if basis is not None:
+            warm = req.model_copy(update={"warm_start": WarmStart(basis=basis)})
+            response = yield from self._solve_warm(warm, c, A, b, var_names, basics_info, silent, pricing, limits)
+            if response is None:
+                notes.append("La base identificada tras la barrera no es factible ni óptima; el crossover se hizo con el método de dos fases.")
+        if response is None:
+            response = yield from self._solve_two_phase(c, A, b, var_names, basics_info, silent, pricing, limits, req.anti_cycling)
+
+        crossover_pivots = limits.iterations - pivots_before
+        final_basis = (response.metadata or {}).get("basis", [])
+        yield from trace.record(iteration_idx + 1, None, final_basis, None, None, None, f"Crossover: solución básica tras {crossover_pivots} pivotes del simplex.")
+        metadata["crossover"] = {"pivots": crossover_pivots, "basis_from_barrier": basis is not None and not notes}
+        response.metadata = {**{k: v for k, v in (response.metadata or {}).items() if k not in ("warm_start", "method")}, **metadata}
+        response.notes = notes or None
+        return response
+
+    def _run_dual_simplex(self, tableau: np.ndarray, basis_names: List[str], var_names: List[str], trace: IterationTrace, iteration_idx: int, prefix: str = "", limits: Optional[SolveLimits] = None, excluded: Optional[np.ndarray] = None) -> Generator[Iteration, None, Tuple[str, int]]:
+        limits = limits or SolveLimits()
+        while True:
+            with trace.stats.stage("pivoting"):
+                exceeded = limits.exceeded()
+                if exceeded:
+                    return exceeded, iteration_idx
+
+                # Sale la fila con el lado derecho más negativo (mayor infactibilidad primal)
+                rhs = tableau[:-1, -1]
+                if rhs.size == 0 or rhs.min() >= -1e-9:
+                    return "optimal", iteration_idx
+                leave_row = int(np.argmin(rhs))
+
+                # Entra la columna que conserva la factibilidad dual: mínimo de d_j / |α_rj| con α_rj < 0
+                row = tableau[leave_row, :-1]
+                negative = row < -1e-12
+                if excluded is not None:
+                    negative &= ~excluded
+                if not negative.any():
+                    return "infeasible", iteration_idx
+                ratios = np.full(row.shape, np.inf)
+                np.divide(tableau[-1, :-1], -row, out=ratios, where=negative)
+                enter_idx = int(np.flatnonzero(np.abs(ratios - ratios.min()) < 1e-9)[0])
+                # Pivote dual degenerado: el paso dual (cociente mínimo) es nulo y el objetivo no cambia
+                trace.stats.count_pivot(ratios[enter_idx])
+
+                iteration_idx += 1
+                limits.iterations += 1
+                leaving_var = basis_names[leave_row]
+                entering_var = self._column_name(enter_idx, var_names)
+                self._pivot(tableau, leave_row, enter_idx)
+                basis_names[leave_row] = entering_var
+            yield from trace.record(
+                    iteration_idx,
+                    tableau,
+                    basis_names,
+                    entering_var,
+                    leaving_var,
+                    (leave_row, enter_idx),
+                    f"{prefix}Pivote en fila {leave_row+1}, columna {enter_idx+1}. Entra {entering_var}, sale {leaving_var}.",
+            )
+
+    # ---------- Método de dos fases ----------
+    def _solve_two_phase(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str], basics_info: Dict, trace: IterationTrace, pricing: Optional[PricingRule] = None, limits: Optional[SolveLimits] = None, anti_cycling: str = "none") -> Generator[Iteration, None, SimplexResponse]:
+        status, tableau, basis_names, var_names, ranging = yield from self._two_phase_tableau(c, A, b, var_names, basics_info, trace, pricing, limits, anti_cycling)
+        if tableau is None:
+            sol = Solution(status="infeasible", objective_value=None, variable_values=None, message="Problema infeasible (la Fase I termina con artificiales positivas).")
             return SimplexResponse(iterations=[], solution=sol)
+        with trace.stats.stage("extraction"):
+            return self._finish(status, tableau, basis_names, var_names, ranging)
+
+    def _two_phase_tableau(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, var_names: List[str], basics_info: Dict, trace: IterationTrace, pricing: Optional[PricingRule] = None, limits: Optional[SolveLimits] = None, anti_cycling: str = "none") -> Generator[Iteration, None, Tuple[str, Optional[np.ndarray], List[str], List[str], Optional[RangingContext]]]:
+        # Estado final (estado, tabla, base, columnas, contexto de rangos); tabla None si la Fase I es infactible
+        artificial_cols = basics_info["artificial_rows"]
+
+        # Fase I: maximizar -(suma de artificiales), sin ninguna penalización M
+        phase1_c = np.zeros_like(c)
+        phase1_c[artificial_cols] = -1.0
+        with trace.stats.stage("initial_tableau"):
+            tableau, basis_names = self._initial_tableau(phase1_c, A, b, basics_info, var_names)
+        yield from trace.record(0, tableau, basis_names, None, None, None, "Fase I: tabla inicial (minimizar la suma de artificiales).")
+        status, iteration_idx = yield from self._run_simplex(tableau, basis_names, var_names, trace, 0, "Fase I: ", pricing, limits, anti_cycling)
+        if status in LIMIT_MESSAGES:
+            return status, tableau, basis_names, var_names, None
+        if tableau[-1, -1] < -1e-7:
+            return "infeasible", None, basis_names, var_names, None
+
+        return (yield from self._phase_two(tableau, basis_names, c, var_names, basics_info, trace, iteration_idx, pricing, limits, anti_cycling))
+
+    def _phase_two(self, tableau: np.ndarray, basis_names: List[str], c: np.ndarray, var_names: List[str], basics_info: Dict, trace: IterationTrace, iteration_idx: int, pricing: Optional[PricingRule] = None, limits: Optional[SolveLimits] = None, anti_cycling: str = "none", prefix: str = "Fase I: ") -> Generator[Iteration, None, Tuple[str, np.ndarray, List[str], List[str], RangingContext]]:
+        # Desde una base factible con artificiales en 0: sacarlas y optimizar el objetivo real sin dejarlas entrar
+        artificial_cols = basics_info["artificial_rows"]
+        tableau, basis_names, iteration_idx, redundant = yield from self._drive_out_artificials(tableau, basis_names, var_names, artificial_cols, trace, iteration_idx, prefix)
+        ranging, c = self._phase_two_costs(basics_info["ranging"].without_rows(redundant), c, artificial_cols)
+
+        # Quitar de la tabla de trabajo las artificiales de filas '>=' (las de filas '=' quedan fuera del pricing)
+        with trace.stats.stage("initial_tableau"):
+            ranging, keep = self._drop_surplus_artificials(ranging)
+            tableau = np.ascontiguousarray(tableau[:, np.append(keep, tableau.shape[1] - 1)])
+            var_names = [var_names[j] for j in keep]
+
+            # Fase II: fila objetivo real, expresada en función de la base alcanzada
+            tableau[-1, :] = 0.0
+            tableau[-1, :-1] = -c[keep]
+            self._canonicalize_objective(tableau, basis_names, var_names)
+        yield from trace.record(iteration_idx, tableau, basis_names, None, None, None, "Fase II: tabla inicial con el objetivo original.")
+        status, _ = yield from self._run_simplex(tableau, basis_names, var_names, trace, iteration_idx, "Fase II: ", pricing, limits, anti_cycling, ranging.excluded)
+        return status, tableau, basis_names, var_names, ranging
+
+    def _phase_two_costs(self, ranging: RangingContext, c: np.ndarray, artificial_cols: List[int]) -> Tuple[RangingContext, np.ndarray]:
+        # Sin penalización M: las artificiales que sigan en la tabla valen 0 y no pueden entrar
+        c = c.copy()
+        c[artificial_cols] = 0.0
+        excluded = np.zeros(c.size, dtype=bool)
+        excluded[artificial_cols] = True
+        return replace(ranging, costs=c, excluded=excluded), c
+
+    def _drop_surplus_artificials(self, ranging: RangingContext) -> Tuple[RangingContext, np.ndarray]:
+        dropped = list(ranging.surplus_for)
+        keep = np.setdiff1d(np.arange(ranging.costs.size), dropped)
+        return ranging.without_columns(dropped), keep
+
+    def _drive_out_artificials(self, tableau: np.ndarray, basis_names: List[str], var_names: List[str], artificial_cols: List[int], trace: IterationTrace, iteration_idx: int, prefix: str = "Fase I: ") -> Generator[Iteration, None, Tuple[np.ndarray, List[str], int, List[int]]]:
+        # Las artificiales que quedan básicas (con valor 0) salen pivotando sobre cualquier columna real no nula;
+        # si la fila no tiene ninguna, la restricción es redundante y se elimina
+        artificial_names = {var_names[j] for j in artificial_cols}
+        real = np.ones(len(var_names), dtype=bool)
+        real[artificial_cols] = False
+        redundant: List[int] = []
+        for row_idx, name in enumerate(basis_names):
+            if name not in artificial_names:
+                continue
+            candidates = np.flatnonzero(real & (np.abs(tableau[row_idx, :-1]) > 1e-9))
+            if candidates.size == 0:
+                redundant.append(row_idx)
+                continue
+            enter_idx = int(candidates[0])
+            iteration_idx += 1
+            with trace.stats.stage("pivoting"):
+                self._pivot(tableau, row_idx, enter_idx)
+            trace.stats.count_pivot(0.0)  # la artificial sale con valor 0
+            basis_names[row_idx] = var_names[enter_idx]
+            yield from trace.record(
+                    iteration_idx,
+                    tableau,
+                    basis_names,
+                    var_names[enter_idx],
+                    name,
+                    (row_idx, enter_idx),
+                    f"{prefix}sale la artificial {name} (valor 0), entra {var_names[enter_idx]}.",
+            )
+        if redundant:
+            tableau = np.delete(tableau, redundant, axis=0)
+            basis_names = [n for i, n in enumerate(basis_names) if i not in redundant]
+        return tableau, basis_names, iteration_idx, redundant
+
+    def _canonicalize_objective(self, tableau: np.ndarray, basis_names: List[str], var_names: List[str]) -> None:
+        # Anular el costo reducido de cada columna básica restando múltiplos de su fila
+        col_of = {name: j for j, name in enumerate(var_names)}
+        for row_idx, name in enumerate(basis_names):
+            col_idx = col_of.get(name)
+            if col_idx is not None and tableau[-1, col_idx] != 0.0:
+                tableau[-1, :] -= tableau[-1, col_idx] * tableau[row_idx, :]
 
     # ---------- Construcción del formulario estándar para la resolución del problema  ----------
     def _build_standard_form(self, req: SimplexRequest):
-        sense = req.objective.sense
-        c = np.array(req.objective.coefficients, dtype=float)
+        # Lado derecho no negativo: las filas con b < 0 se multiplican por -1 y su signo se invierte
+        raw = load_model(req)
+        model = raw.normalized()
+        c = np.array(model.c, dtype=float)
         num_vars = len(c)
 
         # La variable 'sense' para el caso de 'minimización', se multiplica por -1
-        if sense == "min":
+        if model.sense == "min":
             c = -c
 
-        rows: List[np.ndarray] = []
-        b_list: List[float] = []
-        aug_cols: List[Tuple[str, int]] = []  # (type, index) type en {"slack","surplus","artif"}
-
-        for cons in req.constraints:
-            a = np.array(cons.coefficients, dtype=float)
-            rhs = float(cons.rhs)
-
-            # Asegurar que el lado derecho (RHS) no sea negativo multiplicando ambos lados si es necesario
-            sign = cons.sign
-            if rhs < 0:
-                a = -a
-                rhs = -rhs
-                if sign == "<=":
-                    sign = ">="
-                elif sign == ">=":
-                    sign = "<="
-                # '=' remains '='
-
-            rows.append(a)
-            b_list.append(rhs)
-            if sign == "<=":
-                aug_cols.append(("slack", 1))
-            elif sign == ">=":
-                aug_cols.append(("surplus_artif", 2))  # surplus + artificial
-            elif sign == "=":
-                aug_cols.append(("artif", 1))
-            else:
-                raise ValueError(f"Signo no soportado: {cons.sign}")
+        signs = model.signs
+        le, ge, eq = signs == "<=", signs == ">=", signs == "="
+        unknown = ~(le | ge | eq)
+        if unknown.any():
+            raise ValueError(f"Signo no soportado: {signs[unknown][0]}")
+        m = signs.size
 
-        A = np.vstack(rows) if rows else np.zeros((0, num_vars))
-        b = np.array(b_list, dtype=float)
-        m = A.shape[0]
+        # Columnas aumentadas en el orden de las filas: s para '<=', u y a para '>=', a para '='
+        per_row = np.where(ge, 2, 1)
+        first = num_vars + np.concatenate([[0], np.cumsum(per_row)[:-1]]).astype(int)
+        total = num_vars + int(per_row.sum())
+        slack_cols = first[le]
+        surplus_cols = first[ge]
+        artificial_cols = np.where(ge, first + 1, first)[ge | eq]
+        # Columna básica inicial de cada fila: su holgura o su artificial
+        basis_cols = np.where(le, first, np.where(ge, first + 1, first))
+
+        # Matriz aumentada reservada una sola vez; los bloques identidad se escriben por índice
+        aug_matrix = np.zeros((m, total))
+        aug_matrix[:, :num_vars] = model.as_dense()
+        rows = np.arange(m)
+        aug_matrix[rows[le], slack_cols] = 1.0
+        aug_matrix[rows[ge], surplus_cols] = -1.0
+        aug_matrix[rows[ge | eq], artificial_cols] = 1.0
+        b = np.array(model.b, dtype=float)
 
-        # Armado de la matriz aumentada con columnas slack/surplus/artificial
-        slack_cols = []
-        artificial_cols = []
-        surplus_cols = []
-
-        aug_matrix = A
-        for row_idx, kind in enumerate(aug_cols):
-            if kind[0] == "slack":
-                col = np.zeros((m,))
-                col[row_idx] = 1.0
-                aug_matrix = np.column_stack([aug_matrix, col])
-                slack_cols.append(aug_matrix.shape[1] - 1)
-            elif kind[0] == "surplus_artif":
-                # Añadir variable surplus (-1) y artificial (+1)
-                col_surplus = np.zeros((m,))
-                col_surplus[row_idx] = -1.0
-                aug_matrix = np.column_stack([aug_matrix, col_surplus])
-                surplus_cols.append(aug_matrix.shape[1] - 1)
-
-                col_art = np.zeros((m,))
-                col_art[row_idx] = 1.0
-                aug_matrix = np.column_stack([aug_matrix, col_art])
-                artificial_cols.append(aug_matrix.shape[1] - 1)
-            elif kind[0] == "artif":
-                col_art = np.zeros((m,))
-                col_art[row_idx] = 1.0
-                aug_matrix = np.column_stack([aug_matrix, col_art])
-                artificial_cols.append(aug_matrix.shape[1] - 1)
+        # Los nombres siguen el orden real de las columnas aumentadas
+        kinds = np.full(total - num_vars, "s", dtype=object)
+        kinds[surplus_cols - num_vars] = "u"
+        kinds[artificial_cols - num_vars] = "a"
+        counters = {"s": 0, "u": 0, "a": 0}
+        var_names = [f"x{j+1}" for j in range(num_vars)]
+        for kind in kinds:
+            counters[kind] += 1
+            var_names.append(f"{kind}{counters[kind]}")
 
         # Fila objetivo: maximizar => -c en tableau (según la convención de la fila de costos reducidos)
-        c_full = np.concatenate([c, np.zeros(aug_matrix.shape[1] - num_vars)])
+        c_full = np.zeros(total)
+        c_full[:num_vars] = c
         # Penalizar las variables artificiales con −M (dado que, al maximizar, los costos negativos las hacen muy indeseables)
-        for j in artificial_cols:
-            c_full[j] = -self.BIG_M
+        c_full[artificial_cols] = -self.BIG_M
         # Las variables surplus y slack valen 0
 
-        var_names = [f"x{j+1}" for j in range(num_vars)]
-        var_names += [f"s{idx+1}" for idx in range(len(slack_cols))]
-        var_names += [f"u{idx+1}" for idx in range(len(surplus_cols))]
-        var_names += [f"a{idx+1}" for idx in range(len(artificial_cols))]
+        # Columnas identidad de partida y filas invertidas: con ellas se leen B^{-1} y los duales de la tabla final
+        artificial = np.zeros(total, dtype=bool)
+        artificial[artificial_cols] = True
+        ranging = RangingContext(
+            costs=c_full,
+            identity_cols=basis_cols,
+            identity_sign=np.ones(m),
+            terms=[[(i, -1.0 if flipped else 1.0)] for i, flipped in enumerate(raw.b < 0)],
+            objective=raw.c,
+            rhs=raw.b,
+            sense=model.sense,
+            excluded=artificial,
+            surplus_for=dict(zip(np.where(ge, first + 1, first)[ge].tolist(), surplus_cols.tolist())),
+        )
 
         basics_info = {
-            "slack_rows": slack_cols,
-            "artificial_rows": artificial_cols,
+            "slack_rows": slack_cols.tolist(),
+            "artificial_rows": artificial_cols.tolist(),
+            "basis": basis_cols.tolist(),
+            "ranging": ranging,
         }
 
         return c_full, aug_matrix, b, var_names, basics_info
 
-    def _initial_tableau(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, basics_info: Dict) -> Tuple[List[List[float]], List[str]]:
+    def _build_sparse_standard_form(self, req: SimplexRequest) -> Tuple[np.ndarray, sparse.csc_matrix, np.ndarray, List[str], List[int], np.ndarray]:
+        raw = load_model(req)
+        model = raw.normalized()
+        # -1 en las filas que normalized() invirtió (b < 0): sus duales cambian de signo al volver al modelo original
+        row_sign = np.where(raw.b < 0, -1.0, 1.0)
+        c = -model.c if model.sense == "min" else np.array(model.c, dtype=float)
+        num_vars = len(c)
+        m = model.b.size
+
+        # Tripletas COO: los coeficientes no nulos del modelo, sin pasar por una matriz densa
+        coo = model.as_sparse().tocoo()
+        row_idx: List[np.ndarray] = [coo.row]
+        col_idx: List[np.ndarray] = [coo.col]
+        values: List[np.ndarray] = [coo.data]
+        b = np.array(model.b, dtype=float)
+        var_names = [f"x{j+1}" for j in range(num_vars)]
+        extra_costs: List[float] = []
+        counters = {"s": 0, "u": 0, "a": 0}
+        basis: List[int] = []
+
+        def add_column(row: int, kind: str, value: float, cost: float) -> int:
+            col = len(var_names)
+            counters[kind] += 1
+            var_names.append(f"{kind}{counters[kind]}")
+            extra_costs.append(cost)
+            row_idx.append(np.array([row]))
+            col_idx.append(np.array([col]))
+            values.append(np.array([value]))
+            return col
+
+        for i, sign in enumerate(model.signs):
+            if sign == "<=":
+                basis.append(add_column(i, "s", 1.0, 0.0))
+            elif sign == ">=":
+                add_column(i, "u", -1.0, 0.0)
+                basis.append(add_column(i, "a", 1.0, -self.BIG_M))
+            elif sign == "=":
+                basis.append(add_column(i, "a", 1.0, -self.BIG_M))
+            else:
+                raise ValueError(f"Signo no soportado: {sign}")
+
+        A = sparse.csc_matrix(
+            (np.concatenate(values), (np.concatenate(row_idx), np.concatenate(col_idx))),
+            shape=(m, len(var_names)),
+        )
+        c_full = np.concatenate([c, np.array(extra_costs)])
+        return c_full, A, b, var_names, basis, row_sign
+
+    def _solve_revised(self, req: SimplexRequest, trace: IterationTrace, limits: Optional[SolveLimits] = None) -> Generator[Iteration, None, SimplexResponse]:
+        with trace.stats.stage("standard_form"):
+            c, A, b, var_names, basis, row_sign = self._build_sparse_standard_form(req)
+            trace.stats.record_matrix(A)
+        basis_names = [var_names[j] for j in basis]
+        artificial = np.array([name.startswith("a") for name in var_names], dtype=bool)
+        with trace.stats.stage("initial_tableau"):
+            engine = RevisedSimplex(A, b, basis, limits=limits, anti_cycling=req.anti_cycling != "none")
+        yield from trace.record(0, None, basis_names, None, None, None, "Base inicial.")
+
+        # Fase I: minimizar la suma de artificiales; Fase II: objetivo real sin dejar entrar artificiales
+        status = "optimal"
+        if artificial.any():
+            phase1 = yield from self._run_revised(engine, np.where(artificial, -1.0, 0.0), basis_names, var_names, trace)
+            if phase1.status in LIMIT_MESSAGES:
+                status = phase1.status
+            elif phase1.x_basic[artificial[phase1.basis]].sum() > 1e-7:
+                status = "infeasible"
+        if status == "optimal":
+            result = yield from self._run_revised(engine, np.where(artificial, 0.0, c), basis_names, var_names, trace, excluded=artificial)
+            status = result.status
+
+        metadata = {"method": "revised", "refactorizations": engine.refactorizations}
+        trace.stats.pivots += engine.pivots
+        trace.stats.degenerate_pivots += engine.degenerate_pivots
+
+        if status == "infeasible":
+            sol = Solution(status="infeasible", objective_value=None, variable_values=None, message="Problema infeasible (variables artificiales positivas en la base).")
+            return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+        if status == "unbounded":
+            sol = Solution(status="unbounded", message="La solución es no acotada.")
+            return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+        if status in LIMIT_MESSAGES:
+            sol = Solution(status=status, message=LIMIT_MESSAGES[status])
+            return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+
+        values: Dict[str, float] = {name: 0.0 for name in var_names}
+        for j, value in zip(result.basis, result.x_basic):
+            values[var_names[j]] = float(value)
+        final_basis = [var_names[j] for j in result.basis]
+        metadata.update({"basis": final_basis, "basis_token": encode_basis_token(final_basis)})
+        objective_value = float(c[result.basis] @ result.x_basic)
+        shadow_prices = {f"y{i+1}": float(v) for i, v in enumerate(result.duals * row_sign + 0.0)}
+        # Misma convención que la fila objetivo de la tabla: d_j = y·a_j - c_j
+        num_vars = len(req.objective.coefficients)
+        reduced_costs = {f"x{j+1}": float(-result.reduced_costs[j]) for j in range(num_vars)}
+        sol = Solution(status="optimal", objective_value=objective_value, variable_values=values, shadow_prices=shadow_prices, reduced_costs=reduced_costs)
+
+        nonbasic = np.ones(len(var_names), dtype=bool)
+        nonbasic[result.basis] = False
+        if np.any(np.abs(result.reduced_costs[nonbasic & ~artificial]) < 1e-9):
+            sol.status = "multiple_optima"
+        return SimplexResponse(iterations=[], solution=sol, metadata=metadata)
+
+    def _run_revised(self, engine: RevisedSimplex, c: np.ndarray, basis_names: List[str], var_names: List[str], trace: IterationTrace, excluded: Optional[np.ndarray] = None) -> Generator[Iteration, None, RevisedResult]:
+        # Sin tabla: cada iteración informa solo la base y el pivote, aun con traza completa
+        steps = engine.iterate(c, excluded)
+        while True:
+            try:
+                with trace.stats.stage("pivoting"):
+                    row, enter, leave = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            basis_names[row] = var_names[enter]
+            yield from trace.record(
+                engine.pivots,
+                None,
+                basis_names,
+                var_names[enter],
+                var_names[leave],
+                (row, enter),
+                f"Pivote en fila {row+1}, columna {enter+1}. Entra {var_names[enter]}, sale {var_names[leave]}.",
+            )
+
+    def _initial_tableau(self, c: np.ndarray, A: np.ndarray, b: np.ndarray, basics_info: Dict, var_names: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
         m, n = A.shape
-        tableau = np.zeros((m + 1, n + 1))
+        # Un único arreglo contiguo float64 que se modifica in situ durante toda la resolución
+        tableau = np.zeros((m + 1, n + 1), dtype=float)
         tableau[:m, :n] = A
         tableau[:m, -1] = b
         tableau[-1, :n] = -c  # La tabla simplex usa coeficientes objetivos negativos
         tableau[-1, -1] = 0.0
 
-        # Elegir una base factible inicial: preferir las variables de holgura (columnas identidad).
-        # Si hay variables artificiales, esas formarán la base
-        basis_names: List[str] = []
-        # Intentar encontrar una columna identidad en todas las columnas
-        for i in range(m):
-            col = tableau[:m, i]
-        
-        # Identificar las columnas básicas escaneando el patrón identidad por fila
-        used_cols = set()
-        for row_idx in range(m):
-            col_idx = self._find_basic_column(tableau[:m, : -1], row_idx, used_cols)
-            if col_idx is None:
-                # Elegir la columna artificial si existe alguna para esa fila
-                col_idx = self._find_artificial_for_row(tableau[:m, : -1], row_idx)
-                if col_idx is None:
-                    # Dejar el nombre de la variable básica como 'desconocido'; el algoritmo pivotará
-                    basis_names.append(f"b{row_idx+1}")
-                    continue
-            used_cols.add(col_idx)
-            basis_names.append(self._column_name(col_idx, None))
-
-        # Si alguna variable artificial está en la base, ajustar la fila objetivo para reflejar la base inicial
-        # Hacer que la fila Z (objetivo) sea consistente con la base actual: z_row = -c + sum(M * row_of_artificial)
-        for row_idx, name in enumerate(basis_names):
-            if name.startswith("a"):
-                tableau[-1, :] += self.BIG_M * tableau[row_idx, :]
+        # Base inicial registrada al construir la forma estándar: holguras y artificiales (columnas identidad)
+        basis_cols = basics_info["basis"]
+        basis_names = [self._column_name(j, var_names) for j in basis_cols]
 
-        return tableau.tolist(), basis_names
+        # Hacer que la fila Z (objetivo) sea consistente con la base inicial: con artificiales en la base
+        # esto equivale a z_row = -c - sum(M * row_of_artificial)
+        if basis_cols:
+            tableau[-1, :] -= tableau[-1, basis_cols] @ tableau[:m, :]
 
-    def _find_basic_column(self, mat: np.ndarray, row_idx: int, used_cols: set) -> Optional[int]:
-        m, n = mat.shape
-        for j in range(n):
-            if j in used_cols:
-                continue
-            col = mat[:, j]
-            if np.allclose(col, 0) and np.isclose(col[row_idx], 0):
-                continue
-            if np.count_nonzero(~np.isclose(col, 0)) == 1 and np.isclose(col[row_idx], 1.0):
-                return j
-        return None
-
-    def _find_artificial_for_row(self, mat: np.ndarray, row_idx: int) -> Optional[int]:
-        m, n = mat.shape
-        for j in range(n):
-            col = mat[:, j]
-            if np.count_nonzero(~np.isclose(col, 0)) == 1 and np.isclose(col[row_idx], 1.0):
-                return j
-        return None
+        return tableau, basis_names
 
     # ---------- Núcleo del método simplex ----------
-    def _choose_entering_variable(self, tableau: List[List[float]]) -> Optional[int]:
-        last_row = tableau[-1]
-        reduced_costs = last_row[:-1]
-        # Para maximización, con la convención de la tabla (−c en la última fila), elegimos el costo reducido más negativo
-        min_value = min(reduced_costs)
-        if min_value >= -1e-9:
-            return None
-        return int(np.argmin(reduced_costs))
-
-    def _choose_leaving_row(self, tableau: List[List[float]], enter_idx: int) -> Optional[int]:
-        ratios = []
-        for i, row in enumerate(tableau[:-1]):
-            a = row[enter_idx]
-            if a <= 1e-12:
-                ratios.append(np.inf)
-                continue
-            ratios.append(row[-1] / a)
-        min_ratio = min(ratios)
-        if np.isinf(min_ratio):
+    def _choose_entering_variable(self, tableau: np.ndarray, pricing: Optional[PricingRule] = None) -> Optional[int]:
+        # Por defecto, regla de Dantzig: el costo reducido más negativo
+        return (pricing or DantzigPricing()).choose(tableau)
+
+    def _choose_leaving_row(self, tableau: np.ndarray, enter_idx: int, basis_cols: Optional[List[int]] = None, lex_cols: Optional[List[int]] = None) -> Optional[int]:
+        column = tableau[:-1, enter_idx]
+        rhs = tableau[:-1, -1]
+        positive = column > 1e-12
+        if not positive.any():
             return None
-        # Desempate de la regla de Bland: elegir el índice más pequeño entre los empates
-        candidates = [i for i, r in enumerate(ratios) if abs(r - min_ratio) < 1e-9]
-        return candidates[0]
-
-    def _pivot(self, tableau: List[List[float]], row_idx: int, col_idx: int) -> None:
-        t = np.array(tableau, dtype=float)
-        pivot = t[row_idx, col_idx]
-        t[row_idx, :] /= pivot
-        for i in range(t.shape[0]):
-            if i == row_idx:
-                continue
-            factor = t[i, col_idx]
-            t[i, :] -= factor * t[row_idx, :]
-        for i in range(len(tableau)):
-            tableau[i] = t[i, :].tolist()
-
-    def _snapshot(self, it: int, tableau: List[List[float]], basis: List[str], entering: Optional[str], leaving: Optional[str], pivot: Optional[Tuple[int,int]], comment: str) -> Iteration:
-        return Iteration(
-            iteration=it,
-            tableau=[[round(v, 6) for v in row] for row in tableau],
-            basis=basis.copy(),
-            entering_var=entering,
-            leaving_var=leaving,
-            pivot_position=pivot,
-            comment=comment,
-        )
+        ratios = np.full(column.shape, np.inf)
+        np.divide(rhs, column, out=ratios, where=positive)
+        min_ratio = ratios.min()
+        candidates = np.flatnonzero(np.abs(ratios - min_ratio) < 1e-9)
+        if candidates.size > 1 and lex_cols:
+            # Regla lexicográfica: desempatar con las filas de B^{-1} divididas por el elemento pivote
+            keys = tableau[np.ix_(candidates, lex_cols)] / column[candidates, None]
+            for k in range(keys.shape[1]):
+                keep = np.abs(keys[:, k] - keys[:, k].min()) < 1e-12
+                candidates, keys = candidates[keep], keys[keep]
+                if candidates.size == 1:
+                    break
+        elif candidates.size > 1 and basis_cols is not None:
+            # Regla de Bland: sale la variable básica de menor índice
+            return int(candidates[np.argmin(np.asarray(basis_cols)[candidates])])
+        # Desempate por defecto: elegir la fila de menor índice entre los empates
+        return int(candidates[0])
 
-    def _col_is_nonbasic(self, col_idx: int, basis_names: List[str]) -> bool:
-            # Si coincide con la columna, considerar mapear la variable desconocida; devolver True de forma conservadora
-        for name in basis_names:
-            pass
-        return True
+    def _pivot(self, tableau: np.ndarray, row_idx: int, col_idx: int) -> None:
+        # Actualización de rango 1 in situ: T <- T - col ⊗ fila_pivote (sin copiar la tabla)
+        tableau[row_idx, :] /= tableau[row_idx, col_idx]
+        column = tableau[:, col_idx].copy()
+        column[row_idx] = 0.0
+        tableau -= np.outer(column, tableau[row_idx, :])
 
     def _column_name(self, col_idx: int, var_names: Optional[List[str]]) -> str:
         if var_names and 0 <= col_idx < len(var_names):
             return var_names[col_idx]
         return f"v{col_idx+1}"
 
-    def _extract_solution(self, tableau: List[List[float]], basis_names: List[str], var_names: List[str]) -> Tuple[str, Solution]:
-        t = np.array(tableau, dtype=float)
-        m, n_plus = t.shape
-        n = n_plus - 1
+    def _extract_solution(self, tableau: np.ndarray, basis_names: List[str], var_names: List[str], ranging: Optional[RangingContext] = None, basis_cols: Optional[List[int]] = None) -> Tuple[str, Solution]:
+        t = tableau
         values: Dict[str, float] = {name: 0.0 for name in var_names}
         for i, name in enumerate(basis_names):
             if name in values:
-                values[name] = t[i, -1]
+                values[name] = float(t[i, -1])
         objective_value = t[-1, -1]
 
         # Comprobar variables artificiales en la base con valor positivo → infactible
@@ -279,21 +1021,19 @@ class SimplexService:
             sol = Solution(status="infeasible", objective_value=None, variable_values=None, message="Problema infeasible (variables artificiales positivas en la base).")
             return "infeasible", sol
 
-        # Calcular los precios sombra (o precios duales) usando y = c_B^T B^{-1} (solo para el número de variables reales)
-        try:
-            # Identificar los índices de las columnas básicas basándose en los nombres en lo posible
-            # tomar las primeras len(basis) columnas que forman la identidad
-            B = t[:-1, :-1][:, [self._find_basic_column(t[:-1, :-1], i, set()) or 0 for i in range(m - 1)]]
-            y = None
-            if B.size:
-                y = np.linalg.pinv(B.T) @ t[-1:, :-1].T
-        except Exception:
-            y = None
-
-        shadow_prices: Dict[str, float] = {}
-        if y is not None:
-            for i in range(len(y)):
-                shadow_prices[f"y{i+1}"] = float(y[i])
-
-        sol = Solution(status="optimal", objective_value=float(objective_value), variable_values=values, shadow_prices=shadow_prices)
+        sol = Solution(status="optimal", objective_value=float(objective_value), variable_values=values, shadow_prices={})
+        if basis_cols is None:
+            col_of = {name: j for j, name in enumerate(var_names)}
+            basis_cols = [col_of[name] for name in basis_names]
+        if ranging is not None:
+            # B^{-1} se lee de las columnas identidad de partida: precios duales y rangos sin invertir la base
+            sol.shadow_prices, sol.reduced_costs, sol.sensitivity = analyze(t, basis_cols, ranging)
+
+        # Óptimos múltiples: alguna columna no básica (que pueda entrar) con costo reducido nulo
+        nonbasic = np.ones(t.shape[1] - 1, dtype=bool)
+        nonbasic[basis_cols] = False
+        if ranging is not None and ranging.excluded is not None:
+            nonbasic &= ~ranging.excluded
+        if np.any(np.abs(t[-1, :-1][nonbasic]) < 1e-9):
+            sol.status = "multiple_optima"
         return "optimal", sol
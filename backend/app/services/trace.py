@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.simplex_models import Iteration
+from .instrumentation import SolveStats
+
+
+class IterationTrace:
+    """Genera las iteraciones según el nivel de traza pedido.
+
+    - "none": no se genera nada.
+    - "pivots": base y pivote de cada iteración, sin tabla.
+    - "full": además, una copia compacta (float64) de la tabla que solo se expande a listas al serializar.
+
+    `stats` acumula los tiempos y contadores de la resolución que se está trazando.
+    """
+
+    def __init__(self, level: str = "full", stats: Optional[SolveStats] = None) -> None:
+        self.level = level
+        self.stats = stats or SolveStats()
+
+    def record(self, it: int, tableau: Optional[np.ndarray], basis: List[str], entering: Optional[str], leaving: Optional[str], pivot: Optional[Tuple[int, int]], comment: str) -> Iterator[Iteration]:
+        if self.level == "none":
+            return
+        with self.stats.stage("snapshot"):
+            iteration = Iteration(
+                iteration=it,
+                tableau=[],
+                basis=basis.copy(),
+                entering_var=entering,
+                leaving_var=leaving,
+                pivot_position=pivot,
+                comment=comment,
+            )
+            if self.level == "full" and tableau is not None:
+                iteration.set_tableau_array(tableau.copy())
+        yield iteration
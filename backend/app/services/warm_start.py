@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import List, Optional
+
+
+# Token de base emitido por el servidor: JSON en base64 url-safe, sin estado del lado del servidor,
+# así que sirve igual en cualquier worker.
+def encode_basis_token(basis: List[str]) -> str:
+    payload = json.dumps({"v": 1, "basis": basis}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_basis_token(token: str) -> Optional[List[str]]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+    basis = payload.get("basis") if isinstance(payload, dict) else None
+    if not isinstance(basis, list) or not all(isinstance(name, str) for name in basis):
+        return None
+    return basis
@@ -0,0 +1,171 @@
+"""Generadores de problemas de programación lineal con semilla fija para los benchmarks."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Union
+
+import numpy as np
+from scipy import sparse
+
+from app.models.simplex_models import ConstraintMatrix, SimplexRequest, SparseMatrix
+from app.services.model_input import encode_array
+
+
+def _request(c: np.ndarray, A: Union[np.ndarray, sparse.spmatrix], signs: List[str], b: np.ndarray, sense: str) -> SimplexRequest:
+    # La matriz viaja como buffer (o tripletas COO si es dispersa): miles de filas sin listas anidadas
+    if sparse.issparse(A):
+        coo = A.tocoo()
+        matrix = SparseMatrix(
+            format="coo",
+            shape=coo.shape,
+            data=encode_array(coo.data),
+            row=encode_array(coo.row, "int64"),
+            col=encode_array(coo.col, "int64"),
+        )
+    else:
+        matrix = encode_array(A)
+    return SimplexRequest(
+        objective={"coefficients": c.tolist(), "sense": sense},
+        matrix=ConstraintMatrix(A=matrix, rhs=encode_array(b), signs=list(signs)),
+    )
+
+
+def dense_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """max c^T x con A x <= b, A > 0 y b > 0: siempre factible y acotado."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(1.0, 10.0, (m, n))
+    b = rng.uniform(10.0, 100.0, m)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A, ["<="] * m, b, "max")
+
+
+def degenerate_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """Problema tipo planificación con la mitad de los lados derechos en cero (muchos pivotes degenerados)."""
+    rng = np.random.default_rng(seed)
+    A = rng.integers(-2, 4, (m, n)).astype(float)
+    A[0] = 1.0  # capacidad total que acota la región
+    b = np.where(rng.random(m) < 0.5, 0.0, rng.integers(1, 10, m).astype(float))
+    b[0] = float(n)
+    c = rng.integers(1, 6, n).astype(float)
+    return _request(c, A, ["<="] * m, b, "max")
+
+
+def covering_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """min c^T x con A x >= b: modelo de costos con filas '>='."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.0, 5.0, (m, n))
+    A[A < 2.0] = 0.0
+    A[np.arange(m), rng.integers(0, n, m)] += 1.0  # cada fila cubierta por al menos una variable
+    b = rng.uniform(1.0, 20.0, m)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A, [">="] * m, b, "min")
+
+
+def sparse_lp(m: int, n: int, seed: int = 0, density: float = 0.01) -> SimplexRequest:
+    """max c^T x con A x <= b dispersa y no negativa; cada columna aparece en alguna fila, así que es acotado."""
+    rng = np.random.default_rng(seed)
+    A = sparse.random(m, n, density=density, random_state=rng, data_rvs=lambda k: rng.uniform(1.0, 10.0, k), format="lil")
+    A[rng.integers(0, m, n), np.arange(n)] = rng.uniform(1.0, 10.0, n)
+    b = rng.uniform(10.0, 100.0, m)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A.tocsr(), ["<="] * m, b, "max")
+
+
+def infeasible_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """Como dense_lp, más una fila sum(x) >= B imposible: con A >= 1, sum(x) <= max(b)."""
+    rng = np.random.default_rng(seed)
+    A = np.vstack([rng.uniform(1.0, 10.0, (m - 1, n)), np.ones(n)])
+    b = np.append(rng.uniform(10.0, 100.0, m - 1), 1000.0)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A, ["<="] * (m - 1) + [">="], b, "max")
+
+
+def unbounded_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """Como dense_lp, pero la última variable solo aparece con coeficientes <= 0 y mejora el objetivo."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(1.0, 10.0, (m, n))
+    A[:, -1] = -rng.uniform(0.0, 1.0, m)
+    b = rng.uniform(10.0, 100.0, m)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A, ["<="] * m, b, "max")
+
+
+def ge_heavy_lp(m: int, n: int, seed: int = 0) -> SimplexRequest:
+    """min c^T x con ~80 % de filas '>=' (cobertura) y el resto '<=' holgadas: muchas artificiales."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.0, 5.0, (m, n))
+    A[A < 2.0] = 0.0
+    A[np.arange(m), rng.integers(0, n, m)] += 1.0
+    ge = rng.random(m) < 0.8
+    b = np.where(ge, rng.uniform(1.0, 20.0, m), 1e4)
+    c = rng.uniform(1.0, 10.0, n)
+    return _request(c, A, [">=" if g else "<=" for g in ge], b, "min")
+
+
+def klee_minty(n: int) -> SimplexRequest:
+    """Cubo de Klee–Minty: con la regla de Dantzig el simplex visita los 2^n vértices."""
+    A = np.zeros((n, n))
+    for i in range(n):
+        A[i, :i] = 2.0 ** (i - np.arange(i) + 1)
+        A[i, i] = 1.0
+    b = 5.0 ** np.arange(1, n + 1)
+    c = 2.0 ** np.arange(n - 1, -1, -1)
+    return _request(c, A, ["<="] * n, b, "max")
+
+
+GENERATORS = {
+    "dense": dense_lp,
+    "degenerate": degenerate_lp,
+    "covering": covering_lp,
+}
+
+
+def pricing_suite() -> Dict[str, SimplexRequest]:
+    suite: Dict[str, SimplexRequest] = {}
+    for kind, generator in GENERATORS.items():
+        for m, n in [(20, 30), (60, 80)]:
+            for seed in range(2):
+                suite[f"{kind}-{m}x{n}-s{seed}"] = generator(m, n, seed)
+    return suite
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    build: Callable[[], SimplexRequest]
+    expected: str  # estado esperado: optimal, infeasible o unbounded
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def request(self) -> SimplexRequest:
+        # Traza solo de pivotes: se cuentan sin pagar la copia de la tabla en cada iteración
+        return self.build().model_copy(update={"trace_level": "pivots", "max_iterations": None, **self.options})
+
+
+def regression_suite(size: str = "quick") -> List[BenchmarkCase]:
+    """Casos del benchmark de regresión. 'quick' llega a 200 filas; 'full' agrega instancias de 1000 y 5000 filas."""
+    tableau = {"phases": "two_phase"}
+    revised = {"method": "revised"}
+    cases: List[BenchmarkCase] = []
+    for m in (10, 50, 200):
+        n = m + m // 2
+        cases += [
+            BenchmarkCase(f"dense-{m}", lambda m=m, n=n: dense_lp(m, n, seed=m), "optimal", tableau),
+            BenchmarkCase(f"degenerate-{m}", lambda m=m, n=n: degenerate_lp(m, n, seed=m), "optimal", tableau),
+            BenchmarkCase(f"infeasible-{m}", lambda m=m, n=n: infeasible_lp(m, n, seed=m), "infeasible", tableau),
+            BenchmarkCase(f"unbounded-{m}", lambda m=m, n=n: unbounded_lp(m, n, seed=m), "unbounded", tableau),
+            BenchmarkCase(f"ge-heavy-{m}", lambda m=m, n=n: ge_heavy_lp(m, n, seed=m), "optimal", tableau),
+        ]
+    sparse_sizes = [10, 50, 200]
+    if size == "full":
+        # Las instancias grandes con pocos pivotes: el tamaño pone a prueba la carga y la factorización, no la paciencia
+        cases += [
+            BenchmarkCase("dense-1000", lambda: dense_lp(1000, 1500, seed=1000), "optimal", tableau),
+            BenchmarkCase("infeasible-1000", lambda: infeasible_lp(1000, 1500, seed=1000), "infeasible", tableau),
+        ]
+        sparse_sizes += [1000, 5000]
+    for m in sparse_sizes:
+        n = min(2 * m, 200)
+        cases.append(BenchmarkCase(f"sparse-{m}", lambda m=m, n=n: sparse_lp(m, n, seed=m, density=min(0.2, 5.0 / n)), "optimal", revised))
+    for n in (6, 10):
+        cases.append(BenchmarkCase(f"klee-minty-{n}", lambda n=n: klee_minty(n), "optimal", {"anti_cycling": "none"}))
+    return cases
@@ -0,0 +1,67 @@
+"""Compara las reglas de pricing (pivotes y tiempo) sobre un conjunto fijo de problemas generados.
+
+Uso: python -m benchmarks.pricing_benchmark [--json salida.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from app.services.pricing import PRICING_RULES
+from app.services.simplex_service import SimplexService
+
+from .generators import pricing_suite
+
+
+def run() -> List[Dict[str, Any]]:
+    service = SimplexService()
+    rows: List[Dict[str, Any]] = []
+    for name, req in pricing_suite().items():
+        for rule in PRICING_RULES:
+            req = req.model_copy(update={"pricing": rule, "phases": "two_phase"})
+            start = time.perf_counter()
+            res = service.solve(req)
+            elapsed = time.perf_counter() - start
+            pivots = sum(1 for it in res.iterations if it.entering_var is not None)
+            rows.append({
+                "problem": name,
+                "pricing": rule,
+                "status": res.solution.status,
+                "objective": res.solution.objective_value,
+                "pivots": pivots,
+                "seconds": round(elapsed, 6),
+            })
+    return rows
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    summary: Dict[str, Dict[str, float]] = {}
+    for row in rows:
+        total = summary.setdefault(row["pricing"], {"pivots": 0, "seconds": 0.0})
+        total["pivots"] += row["pivots"]
+        total["seconds"] += row["seconds"]
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--json", help="Ruta donde guardar los resultados detallados")
+    args = parser.parse_args()
+
+    rows = run()
+    print(f"{'problema':<26}{'regla':<16}{'estado':<18}{'pivotes':>8}{'segundos':>12}")
+    for row in rows:
+        print(f"{row['problem']:<26}{row['pricing']:<16}{row['status']:<18}{row['pivots']:>8}{row['seconds']:>12.4f}")
+    print()
+    for rule, total in summarize(rows).items():
+        print(f"{rule:<16} pivotes={total['pivots']:<8} segundos={total['seconds']:.4f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"results": rows, "summary": summarize(rows)}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
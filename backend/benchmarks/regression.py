@@ -0,0 +1,226 @@
+"""Benchmark de regresión: tiempo, pivotes/s, memoria pico y latencia de la API sobre problemas generados.
+
+Cada caso se valida contra scipy.optimize.linprog y, si se indica una línea base, se compara con ella:
+un caso empeora si su tiempo (o sus pivotes) supera la base en más de la tolerancia relativa.
+
+Uso: python -m benchmarks.regression [--size quick|full] [--output resultados.json]
+                                     [--baseline benchmarks/baseline.json] [--tolerance 0.5]
+                                     [--min-seconds 0.025] [--min-api-seconds 0.1]
+                                     [--update-baseline [--baseline-runs 3]] [--no-api]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.optimize import linprog
+
+from app.models.simplex_models import SimplexRequest, SimplexResponse
+from app.services.model_input import load_model
+from app.services.simplex_service import SimplexService
+
+from .generators import BenchmarkCase, regression_suite
+
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+# Diferencias de tiempo por debajo de este piso se consideran ruido aunque superen la tolerancia relativa
+MIN_SECONDS = 0.025
+# La latencia de la API suma el pool, la serialización y el middleware: su ruido en CI es mayor que el del solver
+MIN_API_SECONDS = 0.1
+# Estados de linprog: 0 óptimo, 2 infactible, 3 no acotado
+LINPROG_STATUS = {0: "optimal", 2: "infeasible", 3: "unbounded"}
+
+
+def _status(response: SimplexResponse) -> str:
+    status = response.solution.status
+    return "optimal" if status == "multiple_optima" else status
+
+
+def _pivots(response: SimplexResponse) -> int:
+    return sum(1 for it in response.iterations if it.entering_var is not None)
+
+
+def validate(req: SimplexRequest, response: SimplexResponse) -> Optional[str]:
+    """Compara estado y objetivo con linprog (HiGHS); devuelve la discrepancia o None."""
+    model = load_model(req)
+    signs = model.signs
+    A = model.as_sparse()
+    c = -model.c if model.sense == "max" else model.c
+    le, ge, eq = signs == "<=", signs == ">=", signs == "="
+    A_ub = A[np.flatnonzero(le | ge)]
+    b_ub = model.b[le | ge]
+    flip = np.where(ge[le | ge], -1.0, 1.0)
+    ref = linprog(
+        c,
+        A_ub=A_ub.multiply(flip[:, None]).tocsr() if A_ub.shape[0] else None,
+        b_ub=b_ub * flip if A_ub.shape[0] else None,
+        A_eq=A[np.flatnonzero(eq)] if eq.any() else None,
+        b_eq=model.b[eq] if eq.any() else None,
+        method="highs",
+    )
+    expected = LINPROG_STATUS.get(ref.status, "error")
+    status = _status(response)
+    if status != expected:
+        return f"estado {status}, linprog {expected}"
+    if status == "optimal":
+        # objective_value está en la convención interna (maximización): linprog minimiza c (o -c si es 'max')
+        objective = -ref.fun
+        if abs(response.solution.objective_value - objective) > 1e-6 * max(1.0, abs(objective)):
+            return f"objetivo {response.solution.objective_value:.9g}, linprog {objective:.9g}"
+    return None
+
+
+def measure(case: BenchmarkCase, service: SimplexService, repeat: int = 3, client: Any = None) -> Dict[str, Any]:
+    req = case.request()
+    # Tiempo: el mínimo de varias corridas (el menos afectado por ruido del sistema)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = service.solve(req)
+        seconds.append(time.perf_counter() - start)
+    best = min(seconds)
+    pivots = _pivots(response)
+
+    # Memoria pico en una corrida aparte: tracemalloc también registra los buffers de NumPy, pero ralentiza
+    tracemalloc.start()
+    service.solve(req)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    row: Dict[str, Any] = {
+        "case": case.name,
+        "shape": list(load_model(req).shape),
+        "status": _status(response),
+        "expected": case.expected,
+        "objective": response.solution.objective_value,
+        "pivots": pivots,
+        "seconds": round(best, 6),
+        "pivots_per_second": round(pivots / best, 1) if best > 0 else None,
+        "peak_mib": round(peak / 2**20, 3),
+    }
+    if client is not None:
+        row["api_seconds"] = round(api_latency(client, req.model_copy(update={"trace_level": "none"}), repeat), 6)
+    problem = validate(req, response)
+    if case.expected != row["status"]:
+        problem = problem or f"estado {row['status']}, se esperaba {case.expected}"
+    row["validation"] = problem or "ok"
+    return row
+
+
+def api_latency(client: Any, req: SimplexRequest, repeat: int) -> float:
+    """Latencia de /simplex/solve (pool de procesos incluido) sin pasar por la caché de soluciones."""
+    from app.cache import solution_cache
+
+    payload = req.model_dump(mode="json", exclude_none=True)
+    latencies = []
+    for _ in range(repeat):
+        solution_cache.clear()
+        start = time.perf_counter()
+        response = client.post("/simplex/solve", json=payload)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return min(latencies)
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float, min_seconds: float = MIN_SECONDS, min_api_seconds: float = MIN_API_SECONDS) -> List[str]:
+    """Regresiones respecto de la línea base: tiempo o pivotes por encima de base * (1 + tolerancia).
+
+    En los tiempos, además, la diferencia absoluta tiene que superar el piso de ruido de la métrica.
+    """
+    regressions: List[str] = []
+    for row in results:
+        base = baseline.get(row["case"])
+        if base is None:
+            continue
+        for metric, floor in (("seconds", min_seconds), ("api_seconds", min_api_seconds)):
+            if metric in row and metric in base:
+                limit = base[metric] * (1.0 + tolerance)
+                if row[metric] > limit and row[metric] - base[metric] > floor:
+                    regressions.append(f"{row['case']}: {metric} {row[metric]:.4f} > {base[metric]:.4f} (+{tolerance:.0%})")
+        if row["pivots"] > base["pivots"] * (1.0 + tolerance):
+            regressions.append(f"{row['case']}: pivotes {row['pivots']} > {base['pivots']} (+{tolerance:.0%})")
+    return regressions
+
+
+def run(size: str = "quick", repeat: int = 3, api: bool = True) -> List[Dict[str, Any]]:
+    service = SimplexService()
+    client = None
+    if api:
+        from fastapi.testclient import TestClient
+
+        from app.app import app
+
+        client = TestClient(app)
+    cases = regression_suite(size)
+    # Calentamiento: la primera resolución paga importaciones y el arranque del pool, no el solver
+    service.solve(cases[0].request())
+    if client is not None:
+        api_latency(client, cases[0].request(), 1)
+    return [measure(case, service, repeat, client) for case in cases]
+
+
+def baseline_entries(runs: List[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Línea base a partir de varias pasadas: por caso y métrica, el valor más lento (no el mejor)."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    for results in runs:
+        for row in results:
+            entry = entries.setdefault(row["case"], {})
+            for metric in ("seconds", "api_seconds", "pivots"):
+                if metric in row:
+                    entry[metric] = max(entry.get(metric, row[metric]), row[metric])
+    return entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=["quick", "full"], default="quick")
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas por caso (se informa la más rápida)")
+    parser.add_argument("--output", help="Ruta donde guardar los resultados en JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Línea base con la que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Empeoramiento relativo admitido (0.5 = 50 %%)")
+    parser.add_argument("--min-seconds", type=float, default=MIN_SECONDS, help="Diferencia absoluta mínima para contar como regresión")
+    parser.add_argument("--min-api-seconds", type=float, default=MIN_API_SECONDS, help="Ídem para la latencia de la API")
+    parser.add_argument("--update-baseline", action="store_true", help="Guarda estos resultados como línea base de sus casos")
+    parser.add_argument("--baseline-runs", type=int, default=3, help="Pasadas completas al actualizar la línea base (se guarda la más lenta)")
+    parser.add_argument("--no-api", action="store_true", help="No mide la latencia de /simplex/solve")
+    args = parser.parse_args()
+
+    results = run(args.size, args.repeat, api=not args.no_api)
+    # Al grabar la base se repite la suite: una sola pasada rápida deja una base que la corrida siguiente no alcanza
+    runs = [results] + [run(args.size, args.repeat, api=not args.no_api) for _ in range(args.baseline_runs - 1)] if args.update_baseline else [results]
+    print(f"{'caso':<18}{'estado':<12}{'pivotes':>8}{'segundos':>11}{'piv/s':>11}{'MiB':>9}{'API s':>9}  validación")
+    for row in results:
+        api_seconds = f"{row['api_seconds']:>9.4f}" if "api_seconds" in row else f"{'-':>9}"
+        print(
+            f"{row['case']:<18}{row['status']:<12}{row['pivots']:>8}{row['seconds']:>11.4f}"
+            f"{row['pivots_per_second'] or 0:>11.0f}{row['peak_mib']:>9.2f}{api_seconds}  {row['validation']}"
+        )
+
+    failures = [f"{row['case']}: {row['validation']}" for row in results if row["validation"] != "ok"]
+    baseline_path = Path(args.baseline)
+    regressions: List[str] = []
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        baseline.update(baseline_entries(runs))
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nLínea base actualizada: {baseline_path}")
+    elif baseline_path.exists():
+        regressions = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance, args.min_seconds, args.min_api_seconds)
+
+    if args.output:
+        report = {"size": args.size, "tolerance": args.tolerance, "results": results, "regressions": regressions, "failures": failures}
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for line in failures + regressions:
+        print(f"FALLA {line}")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
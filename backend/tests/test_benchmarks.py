@@ -0,0 +1,43 @@
+import pytest
+
+from app.services.simplex_service import SimplexService
+from benchmarks.generators import klee_minty, regression_suite
+from benchmarks.regression import compare, measure
+
+service = SimplexService()
+
+
+@pytest.mark.parametrize("case", [c for c in regression_suite("quick") if c.name.endswith("-10") or c.name == "klee-minty-6"], ids=lambda c: c.name)
+def test_small_benchmark_cases_match_linprog(case):
+    row = measure(case, service, repeat=1)
+    assert row["validation"] == "ok"
+    assert row["status"] == case.expected
+    assert row["peak_mib"] > 0
+
+
+def test_klee_minty_visits_every_vertex_with_dantzig():
+    req = klee_minty(5).model_copy(update={"trace_level": "pivots", "anti_cycling": "none"})
+    res = service.solve(req)
+    assert sum(1 for it in res.iterations if it.entering_var is not None) == 2**5 - 1
+    assert res.solution.objective_value == pytest.approx(5.0**5)
+
+
+def test_compare_flags_regressions_beyond_tolerance_and_noise_floor():
+    baseline = {"a": {"seconds": 1.0, "api_seconds": 0.06, "pivots": 100}, "b": {"seconds": 0.001, "pivots": 10}}
+    results = [
+        # La API duplica su latencia, pero 60 ms quedan bajo el piso de ruido de la API
+        {"case": "a", "seconds": 1.6, "api_seconds": 0.12, "pivots": 100},
+        {"case": "b", "seconds": 0.004, "pivots": 20},
+        {"case": "c", "seconds": 9.0, "pivots": 1},
+    ]
+    regressions = compare(results, baseline, tolerance=0.5)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a: seconds") and regressions[1].startswith("b: pivotes")
+    assert compare(results, baseline, tolerance=0.5, min_api_seconds=0.05)[1].startswith("a: api_seconds")
+
+
+def test_pricing_benchmark_suite_is_available():
+    from benchmarks.generators import pricing_suite
+    from benchmarks.pricing_benchmark import run  # noqa: F401 (importa pricing_suite desde generators)
+
+    assert len(pricing_suite()) == 12
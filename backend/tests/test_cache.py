@@ -0,0 +1,48 @@
+from app.cache import SolutionCache
+from app.models.simplex_models import SimplexRequest, SimplexResponse, Solution
+
+
+def _request(rhs=4.0, sign="<="):
+    return SimplexRequest(
+        objective={"coefficients": [3, 2], "sense": "max"},
+        constraints=[{"coefficients": [1, 1], "sign": sign, "rhs": rhs}],
+    )
+
+
+def _response(message=""):
+    return SimplexResponse(iterations=[], solution=Solution(status="optimal", objective_value=1.0, message=message))
+
+
+def test_key_is_canonical_under_rounding_but_keeps_row_orientation():
+    cache = SolutionCache()
+    flipped = SimplexRequest(
+        objective={"coefficients": [3, 2], "sense": "max"},
+        constraints=[{"coefficients": [-1, -1], "sign": ">=", "rhs": -4.0}],
+    )
+    # Misma región, pero el dual y los rangos de la fila invertida tienen el signo opuesto: otra clave
+    assert cache.key_for(_request()) != cache.key_for(flipped)
+    assert cache.key_for(_request()) == cache.key_for(_request(rhs=4.0 + 1e-13))
+    assert cache.key_for(_request()) != cache.key_for(_request(rhs=5.0))
+
+
+def test_lru_eviction_is_bounded_by_bytes():
+    size = len(_response("a").model_dump_json())
+    cache = SolutionCache(max_bytes=2 * size)
+    cache.put("a", _response("a"))
+    cache.put("b", _response("b"))
+    assert cache.get("a") is not None  # "a" pasa a ser la más reciente
+    cache.put("c", _response("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= 2 * size
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_ttl_expiry_and_uncacheable_statuses():
+    cache = SolutionCache(ttl=-1.0)
+    cache.put("a", _response())
+    assert cache.get("a") is None
+    cache = SolutionCache()
+    cache.put("b", SimplexResponse(iterations=[], solution=Solution(status="time_limit")))
+    assert cache.get("b") is None
@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.app import app
+from app.history import HistoryStore, InMemoryHistory, SQLiteHistory, encode_entry
+from app.models.simplex_models import SimplexRequest, SimplexResponse, Solution
+
+client = TestClient(app)
+
+
+def _entry(rhs: float, message: str = ""):
+    req = SimplexRequest(
+        objective={"coefficients": [3, 2], "sense": "max"},
+        constraints=[{"coefficients": [1, 1], "sign": "<=", "rhs": rhs}],
+    )
+    response = SimplexResponse(iterations=[], solution=Solution(status="optimal", objective_value=3 * rhs, message=message))
+    return req, response
+
+
+def test_entries_are_stored_compressed():
+    req, response = _entry(4.0, message="x" * 10_000)
+    raw = len(req.model_dump_json()) + len(response.model_dump_json())
+    assert len(encode_entry(req, response)) < raw / 10
+
+
+def test_incomplete_backend_fails_at_construction():
+    class AppendOnly(HistoryStore):
+        def append(self, blob):
+            pass
+
+    with pytest.raises(TypeError):
+        AppendOnly()
+
+
+def test_memory_history_is_bounded_by_bytes_and_entries():
+    size = len(encode_entry(*_entry(1.0)))
+    # Margen de media entrada: el tamaño comprimido varía en algún byte según el contenido
+    store = InMemoryHistory(max_entries=None, max_bytes=3 * size + size // 2)
+    for rhs in range(1, 6):
+        store.add(*_entry(float(rhs)))
+    items, total = store.page(0, None)
+    assert total == 3 and [item["request"]["constraints"][0]["rhs"] for item in items] == [5.0, 4.0, 3.0]
+    assert store.stats()["bytes"] <= 3 * size + size // 2
+
+    store = InMemoryHistory(max_entries=2)
+    for rhs in range(1, 4):
+        store.add(*_entry(float(rhs)))
+    assert store.page(0, None)[1] == 2
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_history_pages_newest_first_and_deletes_by_position(backend, tmp_path):
+    store = InMemoryHistory(max_entries=None) if backend == "memory" else SQLiteHistory(str(tmp_path / "history.db"))
+    for rhs in range(1, 6):
+        store.add(*_entry(float(rhs)))
+    items, total = store.page(1, 2)
+    assert total == 5
+    assert [item["response"]["solution"]["objective_value"] for item in items] == [12.0, 9.0]
+    assert store.delete(0) and not store.delete(10)
+    assert store.page(0, 1)[0][0]["request"]["constraints"][0]["rhs"] == 4.0
+    store.clear()
+    assert store.page(0, 10) == ([], 0)
+
+
+def test_sqlite_history_is_shared_between_workers_and_trimmed(tmp_path):
+    path = str(tmp_path / "history.db")
+    first, second = SQLiteHistory(path, max_entries=3), SQLiteHistory(path, max_entries=3)
+    for rhs in range(1, 5):
+        (first if rhs % 2 else second).add(*_entry(float(rhs)))
+    items, total = second.page(0, 10)
+    assert total == 3 and [item["request"]["constraints"][0]["rhs"] for item in items] == [4.0, 3.0, 2.0]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_last_endpoint_paginates_and_clears():
+    client.delete("/simplex/last/clear")
+    for rhs in (4, 5, 6):
+        payload = {"objective": {"coefficients": [3, 2], "sense": "max"}, "constraints": [{"coefficients": [1, 1], "sign": "<=", "rhs": rhs}]}
+        assert client.post("/simplex/solve", json=payload).status_code == 200
+    data = client.get("/simplex/last", params={"offset": 1, "limit": 1}).json()
+    assert data["total"] == 3 and data["offset"] == 1 and data["limit"] == 1
+    assert data["items"][0]["request"]["constraints"][0]["rhs"] == 5
+    assert client.delete("/simplex/last/0").json() == {"message": "Item deleted successfully"}
+    assert client.delete("/simplex/last/clear").status_code == 200
+    assert client.get("/simplex/last").json()["total"] == 0
@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+
+from app.app import app
+from app.metrics import Histogram, SolverMetrics
+from app.models.simplex_models import SimplexResponse, Solution
+
+client = TestClient(app)
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("demo_seconds", "Demo.", (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value, stage="pivoting")
+    lines = hist.render()
+    assert 'demo_seconds_bucket{stage="pivoting",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="pivoting",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="pivoting",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="pivoting"} 3' in lines
+    assert 'demo_seconds_sum{stage="pivoting"} 5.55' in lines
+
+
+def test_cached_responses_count_but_do_not_feed_histograms():
+    registry = SolverMetrics()
+    stats = {"seconds": {"pivoting": 0.002, "total": 0.003}, "pivots": 4, "degenerate_pivots": 1, "density": 0.5}
+    response = SimplexResponse(iterations=[], solution=Solution(status="optimal"), metadata={"stats": stats})
+    registry.observe_response(response)
+    registry.observe_response(response, source="cache")
+    text = registry.render()
+    assert 'simplex_solves_total{source="cache",status="optimal"} 1' in text
+    assert 'simplex_solve_pivots_count{method="tableau"} 1' in text
+    assert 'simplex_solve_stage_seconds_count{stage="pivoting"} 1' in text
+
+
+def test_metrics_endpoint_exposes_solver_histograms():
+    payload = {
+        "objective": {"coefficients": [3, 5], "sense": "max"},
+        "constraints": [
+            {"coefficients": [1, 0], "sign": "<=", "rhs": 4},
+            {"coefficients": [0, 2], "sign": "<=", "rhs": 12},
+            {"coefficients": [3, 2], "sign": "<=", "rhs": 18.5},
+        ],
+    }
+    res = client.post("/simplex/solve", json=payload)
+    assert res.status_code == 200
+    assert res.json()["metadata"]["stats"]["pivots"] >= 1
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    text = res.text
+    assert "# TYPE simplex_solve_stage_seconds histogram" in text
+    assert 'simplex_solve_stage_seconds_bucket{stage="pivoting",le="+Inf"}' in text
+    assert 'simplex_http_request_seconds_count{method="POST",route="solve",status="200"}' in text
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from app.cache import SolutionCache
+from app.models.simplex_models import SimplexRequest
+from app.services.model_files import ModelFileError, parse_lp, parse_mps
+from app.services.model_input import decode_array, encode_array, load_model
+from app.services.simplex_service import SimplexService
+
+service = SimplexService()
+
+A = np.array([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0], [1.0, 1.0, 1.0]])
+RHS = [8.0, 9.0, 6.0]
+SIGNS = ["<=", "<=", ">="]
+
+
+def _lists():
+    return SimplexRequest(
+        objective={"coefficients": [2, 3, 1], "sense": "max"},
+        constraints=[{"coefficients": row.tolist(), "sign": sign, "rhs": rhs} for row, sign, rhs in zip(A, SIGNS, RHS)],
+    )
+
+
+def _matrix(matrix):
+    return SimplexRequest(objective={"coefficients": [2, 3, 1], "sense": "max"}, matrix={"A": matrix, "rhs": RHS, "signs": SIGNS})
+
+
+def _formats():
+    rows, cols = np.nonzero(A)
+    csr_indptr = np.concatenate([[0], np.cumsum((A != 0).sum(axis=1))])
+    return {
+        "coo": {"format": "coo", "shape": [3, 3], "row": rows.tolist(), "col": cols.tolist(), "data": A[rows, cols].tolist()},
+        "csr": {"format": "csr", "shape": [3, 3], "indptr": csr_indptr.tolist(), "indices": cols.tolist(), "data": A[rows, cols].tolist()},
+        "buffer": encode_array(A).model_dump(),
+        "coo_buffers": {
+            "format": "coo",
+            "shape": [3, 3],
+            "row": encode_array(rows, "int64").model_dump(),
+            "col": encode_array(cols, "int32").model_dump(),
+            "data": encode_array(A[rows, cols]).model_dump(),
+        },
+    }
+
+
+@pytest.mark.parametrize("fmt", ["coo", "csr", "buffer", "coo_buffers"])
+def test_matrix_formats_match_list_input(fmt):
+    req = _matrix(_formats()[fmt])
+    expected = service.solve(_lists()).solution
+    for method in ("tableau", "revised"):
+        req.method = method
+        assert service.solve(req).solution.objective_value == pytest.approx(expected.objective_value)
+    assert SolutionCache().key_for(req) == SolutionCache().key_for(_lists().model_copy(update={"method": "revised"}))
+
+
+def test_binary_buffer_is_loaded_without_copy():
+    arr = decode_array(encode_array(A))
+    assert not arr.flags.owndata and arr.shape == (3, 3)
+    assert np.array_equal(load_model(_matrix(encode_array(A).model_dump())).A, A)
+
+
+def test_matrix_shape_mismatch_is_reported():
+    req = _matrix({"format": "coo", "shape": [3, 2], "row": [0], "col": [0], "data": [1.0]})
+    res = service.solve(req)
+    assert res.solution.status == "error" and "forma" in res.solution.message
+
+
+MPS = """NAME          SAMPLE
+OBJSENSE
+    MAX
+ROWS
+ N  PROFIT
+ L  R1
+ L  R2
+ G  R3
+COLUMNS
+    X         PROFIT       2.0   R1           1.0
+    X         R3           1.0
+    Y         PROFIT       3.0   R2           3.0
+    Y         R3           1.0
+    Z         PROFIT       1.0   R1           2.0
+    Z         R3           1.0
+RHS
+    RHS       R1           8.0   R2           9.0
+    RHS       R3           6.0
+BOUNDS
+ UP BND       Z            3.0
+ENDATA
+"""
+
+LP = """\\ mismo modelo que MPS
+Maximize
+ profit: 2 x + 3 y + z
+Subject To
+ r1: x + 2 z <= 8
+ r2: 3 y
+     <= 9
+ r3: x + y + z >= 6
+Bounds
+ 0 <= z <= 3
+End
+"""
+
+
+@pytest.mark.parametrize("parse, text", [(parse_mps, MPS), (parse_lp, LP)])
+def test_model_files_parse_to_sparse_request(parse, text):
+    req = SimplexRequest.model_validate(parse(text))
+    model = load_model(req)
+    assert model.shape == (4, 3) and req.constraints == []
+    assert list(model.signs) == ["<=", "<=", ">=", "<="]
+    res = service.solve(req)
+    # Con z <= 3: x = 8 - 2z, y = 3, objetivo 2(8 - 2z) + 9 + z, máximo en z = 0
+    assert res.solution.objective_value == pytest.approx(25.0)
+
+
+def test_model_files_reject_unsupported_features():
+    with pytest.raises(ModelFileError):
+        parse_mps(MPS.replace(" UP BND       Z            3.0", " FR BND       Z"))
+    with pytest.raises(ModelFileError):
+        parse_lp(LP.replace(" 0 <= z <= 3", " z free"))
+    for bound in (" z >= -inf", " -inf <= z", " -inf <= z <= 3"):
+        with pytest.raises(ModelFileError):
+            parse_lp(LP.replace(" 0 <= z <= 3", bound))
+
+
+def test_model_files_read_integer_markers():
+    lp = "Maximize\n obj: 5 x + 4 y\nSubject To\n c1: 6 x + 4 y <= 24\n c2: x + 2 y <= 6\nGeneral\n x\nBinary\n y\nEnd\n"
+    payload = parse_lp(lp)
+    assert payload["integer"] == [True, True]
+    assert payload["matrix"].signs[-1] == "<="  # la cota y <= 1 de la variable binaria
+
+    mps = (
+        "NAME m\nROWS\n N obj\n L c1\nCOLUMNS\n"
+        "    MARKER 'MARKER' 'INTORG'\n    x obj 1 c1 1\n    MARKER 'MARKER' 'INTEND'\n    y obj 1 c1 1\n"
+        "RHS\n    rhs c1 4\nENDATA\n"
+    )
+    assert parse_mps(mps)["integer"] == [True, False]
@@ -33,3 +33,176 @@ def test_last_cache():
     res = client.get("/simplex/last")
     assert res.status_code == 200
     assert "items" in res.json()
+
+
+def test_health_reports_solver_pool():
+    res = client.get("/health")
+    assert res.status_code == 200
+    pool = res.json()["solver_pool"]
+    assert {"workers", "running", "queued", "queue_capacity", "utilisation"} <= pool.keys()
+
+
+def test_solver_pool_defaults_to_threads_and_releases_inflight(monkeypatch):
+    import time
+    from app.executor import PoolSaturatedError, SolverPool
+
+    monkeypatch.delenv("SOLVER_POOL_KIND", raising=False)
+    pool = SolverPool.from_env()
+    assert pool.kind == "thread"
+
+    pool = SolverPool(kind="thread", workers=2, queue_size=30)
+    futures = [pool.submit(sum, range(n)) for n in range(32)]
+    with pytest.raises(PoolSaturatedError):
+        for _ in range(64):
+            futures.append(pool.submit(time.sleep, 0.05))
+    for future in futures:
+        future.result()
+    assert pool.stats()["running"] == 0 and pool.stats()["queued"] == 0
+
+    slots = [pool.reserve() for _ in range(32)]
+    assert pool.stats()["running"] == 32
+    with pytest.raises(PoolSaturatedError):
+        pool.reserve()
+    for slot in slots:
+        slot.set_result(None)
+    assert pool.stats()["running"] == 0
+    pool.shutdown()
+
+
+def test_solve_returns_503_when_queue_full(monkeypatch):
+    from concurrent.futures import Future
+    from app.executor import SolverPool
+
+    full_pool = SolverPool(kind="thread", workers=1, queue_size=0)
+    full_pool._inflight.add(Future())
+    monkeypatch.setattr("app.routes.simplex_routes.solver_pool", full_pool)
+    payload = {
+        "objective": {"coefficients": [1, 1], "sense": "max"},
+        "constraints": [{"coefficients": [1, 1], "sign": "<=", "rhs": 1}],
+    }
+    res = client.post("/simplex/solve", json=payload)
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "1"
+
+    # Los sobrantes y los lotes apilados pasan por la cola de admisión del pool
+    batch = {"problems": [payload, {**payload, "constraints": [{"coefficients": [1, 1], "sign": ">=", "rhs": 1}]}]}
+    assert client.post("/simplex/solve/batch", json=batch).status_code == 503
+    assert client.post("/simplex/solve/batch", json={"problems": [payload, payload]}).status_code == 503
+    assert client.post("/simplex/solve", json={**payload, "integer": [True, True]}).status_code == 503
+    assert client.post("/simplex/solve/stream", json=payload).status_code == 503
+
+
+def test_solve_batch_streams_in_input_order():
+    import json
+
+    def problem(rhs, sign="<="):
+        return {
+            "objective": {"coefficients": [3, 2], "sense": "max"},
+            "constraints": [
+                {"coefficients": [1, 1], "sign": sign, "rhs": rhs},
+                {"coefficients": [1, 0], "sign": "<=", "rhs": 2},
+            ],
+        }
+
+    payload = {"problems": [problem(4), problem(1, ">="), problem(6)]}
+    res = client.post("/simplex/solve/batch", json=payload)
+    assert res.status_code == 200
+    items = [json.loads(line) for line in res.text.splitlines()]
+    assert [item["index"] for item in items] == [0, 1, 2]
+    assert items[0]["response"]["metadata"]["method"] == "batched"
+    assert items[0]["response"]["solution"]["objective_value"] == 10.0
+    assert items[2]["response"]["solution"]["objective_value"] == 14.0
+    assert items[1]["response"]["solution"]["status"] == "unbounded"
+
+
+def test_solve_stream_sends_each_iteration_then_solution():
+    import json
+
+    payload = {
+        "objective": {"coefficients": [3, 5], "sense": "max"},
+        "constraints": [
+            {"coefficients": [1, 0], "sign": "<=", "rhs": 4},
+            {"coefficients": [0, 2], "sign": "<=", "rhs": 12},
+            {"coefficients": [3, 2], "sign": "<=", "rhs": 18},
+        ],
+    }
+    res = client.post("/simplex/solve/stream", json=payload)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in res.text.splitlines()]
+    full = client.post("/simplex/solve", json=payload).json()
+    assert [e["event"] for e in events] == ["iteration"] * len(full["iterations"]) + ["solution"]
+    assert [e["iteration"] for e in events[:-1]] == full["iterations"]
+    assert events[-1]["response"]["solution"] == full["solution"]
+
+    sse = client.post("/simplex/solve/stream?format=sse", json=payload)
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.count("event: iteration\n") == len(full["iterations"])
+    assert sse.text.rstrip().split("\n\n")[-1].startswith("event: solution\ndata: ")
+
+    # El stream ocupa un lugar del pool mientras dura y lo libera al terminar
+    from app.routes.simplex_routes import solver_pool
+
+    assert solver_pool.stats()["running"] == 0
+
+
+def test_solve_upload_reads_lp_file_with_options():
+    lp = "Maximize\n obj: 3 x + 5 y\nSubject To\n c1: x <= 4\n c2: 2 y <= 12\n c3: 3 x + 2 y <= 18\nEnd\n"
+    files = {"file": ("model.lp", lp, "text/plain")}
+    res = client.post("/simplex/solve/upload", files=files, data={"options": '{"method": "revised"}'})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["metadata"]["method"] == "revised"
+    assert body["solution"]["objective_value"] == 36.0
+
+    bad = client.post("/simplex/solve/upload", files={"file": ("model.txt", "x", "text/plain")})
+    assert bad.status_code == 400
+
+
+def test_repeated_model_is_served_from_solution_cache():
+    from app.cache import solution_cache
+
+    payload = {
+        "objective": {"coefficients": [5, 4], "sense": "max"},
+        "constraints": [{"coefficients": [6, 4], "sign": "<=", "rhs": 24}, {"coefficients": [1, 2], "sign": "<=", "rhs": 6}],
+    }
+    first = client.post("/simplex/solve", json=payload).json()
+    hits = solution_cache.stats()["hits"]
+    second = client.post("/simplex/solve", json=payload).json()
+    assert solution_cache.stats()["hits"] == hits + 1
+    assert second == first
+
+
+def test_solve_scenarios_returns_compact_table():
+    payload = {
+        "problem": {
+            "objective": {"coefficients": [3, 5], "sense": "max"},
+            "constraints": [
+                {"coefficients": [1, 0], "sign": "<=", "rhs": 4},
+                {"coefficients": [0, 2], "sign": "<=", "rhs": 12},
+                {"coefficients": [3, 2], "sign": "<=", "rhs": 18},
+            ],
+        },
+        "rhs": [[4, 12, 18], [4, 14, 20]],
+    }
+    res = client.post("/simplex/solve/scenarios", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["base"]["solution"]["objective_value"] == pytest.approx(36.0)
+    assert body["scenarios"]["variables"] == ["x1", "x2"]
+    assert body["scenarios"]["objective_value"] == pytest.approx([36.0, 41.0])
+
+    payload["objectives"] = [[1, 1]]
+    assert client.post("/simplex/solve/scenarios", json=payload).status_code == 400
+
+
+def test_solve_with_integer_flags_runs_branch_and_bound():
+    payload = {
+        "objective": {"coefficients": [5, 4], "sense": "max"},
+        "constraints": [{"coefficients": [6, 4], "sign": "<=", "rhs": 24}, {"coefficients": [1, 2], "sign": "<=", "rhs": 6}],
+        "integer": [True, True],
+    }
+    body = client.post("/simplex/solve", json=payload).json()
+    assert body["solution"]["objective_value"] == pytest.approx(20.0)
+    assert body["metadata"]["method"] == "branch_and_bound"
+    assert body["metadata"]["mip"]["nodes_per_second"] > 0
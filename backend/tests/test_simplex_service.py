@@ -0,0 +1,513 @@
+import pstats
+
+import numpy as np
+import pytest
+
+from app.models.simplex_models import Iteration, SimplexRequest, SimplexScenarioRequest
+from app.services.instrumentation import ProfileHook
+from app.services.interior_point import InteriorPoint, identify_basis
+from app.services.simplex_service import SimplexService, _run_to_end
+
+service = SimplexService()
+
+
+def _request(c, rows, sense="max"):
+    return SimplexRequest(
+        objective={"coefficients": c, "sense": sense},
+        constraints=[{"coefficients": a, "sign": sign, "rhs": rhs} for a, sign, rhs in rows],
+    )
+
+
+def test_solve_basic_max_values():
+    req = _request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 2), ([0, 1], "<=", 3)])
+    res = service.solve(req)
+    assert res.solution.status in {"optimal", "multiple_optima"}
+    assert res.solution.objective_value == pytest.approx(10.0)
+    assert res.solution.variable_values["x1"] == pytest.approx(2.0)
+    assert res.solution.variable_values["x2"] == pytest.approx(2.0)
+
+
+def test_pivot_is_in_place_rank_one_update():
+    tableau = np.array([[2.0, 1.0, 4.0], [1.0, 3.0, 6.0], [-1.0, -1.0, 0.0]])
+    expected = tableau.copy()
+    expected[0] /= 2.0
+    for i in (1, 2):
+        expected[i] -= expected[i, 0] * expected[0]
+    service._pivot(tableau, 0, 0)
+    assert np.allclose(tableau, expected)
+
+
+def test_revised_matches_expected_on_min_with_ge_rows():
+    req = _request([2, 3], [([1, 1], ">=", 4), ([1, 0], "<=", 3)], sense="min")
+    req.method = "revised"
+    res = service.solve(req)
+    assert res.solution.status == "optimal"
+    assert res.solution.variable_values["x1"] == pytest.approx(3.0)
+    assert res.solution.variable_values["x2"] == pytest.approx(1.0)
+    assert all(it.tableau == [] for it in res.iterations)
+
+
+def test_revised_detects_infeasible():
+    req = _request([1, 1], [([1, 1], "<=", 2), ([1, 1], ">=", 5)])
+    req.method = "revised"
+    assert service.solve(req).solution.status == "infeasible"
+
+
+def test_basis_factorization_eta_updates_match_dense_solve():
+    from scipy import sparse
+    from app.services.revised_simplex import BasisFactorization
+
+    rng = np.random.default_rng(1)
+    A = sparse.csc_matrix(rng.random((5, 8)) + np.hstack([np.eye(5) * 5, np.zeros((5, 3))]))
+    basis = np.arange(5)
+    factor = BasisFactorization(A, basis, refactor_every=10)
+    for row, enter in [(0, 5), (2, 6), (4, 7)]:
+        d = factor.ftran(A[:, enter].toarray().ravel())
+        basis[row] = enter
+        factor.update(basis, row, d)
+    B = A[:, basis].toarray()
+    v = rng.random(5)
+    assert np.allclose(factor.ftran(v), np.linalg.solve(B, v))
+    assert np.allclose(factor.btran(v), np.linalg.solve(B.T, v))
+
+
+def test_two_phase_drops_artificial_columns():
+    req = _request([2, 3], [([1, 1], ">=", 4), ([1, 0], "<=", 3)], sense="min")
+    req.phases = "two_phase"
+    res = service.solve(req)
+    assert res.solution.status in {"optimal", "multiple_optima"}
+    assert res.solution.variable_values["x1"] == pytest.approx(3.0)
+    assert res.solution.variable_values["x2"] == pytest.approx(1.0)
+    assert "a1" not in res.solution.variable_values
+    phase2 = [it for it in res.iterations if it.comment.startswith("Fase II")]
+    assert phase2 and len(phase2[0].tableau_rows()[0]) == len(res.iterations[0].tableau_rows()[0]) - 1
+
+
+def test_two_phase_detects_infeasible():
+    req = _request([1, 1], [([1, 1], "<=", 2), ([1, 1], ">=", 5)])
+    req.phases = "two_phase"
+    assert service.solve(req).solution.status == "infeasible"
+
+
+@pytest.mark.parametrize("rule", ["dantzig", "devex", "steepest_edge", "partial"])
+def test_pricing_rules_reach_same_optimum(rule):
+    req = _request([3, 2, 4], [([1, 1, 2], "<=", 4), ([2, 0, 3], "<=", 5), ([2, 1, 3], "<=", 7)])
+    req.pricing = rule
+    res = service.solve(req)
+    assert res.solution.objective_value == pytest.approx(10.5)
+
+
+def test_pricing_rule_without_choose_cannot_be_built():
+    from app.services.pricing import PricingRule
+
+    class Unfinished(PricingRule):
+        name = "unfinished"
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+BEALE = [([0.25, -8, -1, 9], "<=", 0), ([0.5, -12, -0.5, 3], "<=", 0), ([0, 0, 1, 0], "<=", 1)]
+
+
+@pytest.mark.parametrize("method", ["tableau", "revised"])
+def test_cycling_example_hits_iteration_limit_without_anti_cycling(method):
+    req = _request([0.75, -20, 0.5, -6], BEALE)
+    req.method, req.anti_cycling, req.max_iterations = method, "none", 50
+    res = service.solve(req)
+    assert res.solution.status == "iteration_limit"
+
+
+@pytest.mark.parametrize("method,rule", [("tableau", "bland"), ("tableau", "lexicographic"), ("revised", "bland")])
+def test_anti_cycling_escapes_degenerate_cycle(method, rule):
+    req = _request([0.75, -20, 0.5, -6], BEALE)
+    req.method, req.anti_cycling = method, rule
+    res = service.solve(req)
+    assert res.solution.status in {"optimal", "multiple_optima"}
+    assert res.solution.objective_value == pytest.approx(1.25)
+
+
+def test_solve_batch_matches_individual_solves():
+    rng = np.random.default_rng(3)
+    A = rng.uniform(1, 5, (4, 5)).tolist()
+    reqs = [
+        _request(rng.uniform(-1, 5, 5).tolist(), [(a, "<=", float(rhs)) for a, rhs in zip(A, rng.uniform(5, 20, 4))])
+        for _ in range(6)
+    ]
+    reqs.append(_request([2, 3], [([1, 1], ">=", 4), ([1, 0], "<=", 3)], sense="min"))
+    batched = list(service.solve_batch(reqs))
+    assert len(batched) == len(reqs)
+    for req, res in zip(reqs, batched):
+        assert res.solution.objective_value == pytest.approx(service.solve(req).solution.objective_value)
+    assert batched[0].metadata["batch_size"] == 6
+
+    # El plazo de cada problema también corta el pivoteo apilado
+    capped = [req.model_copy(update={"time_limit": 0.0}) for req in reqs[:6]]
+    assert {res.solution.status for res in service.solve_batch(capped)} == {"time_limit"}
+
+
+def test_warm_start_after_rhs_change_uses_dual_simplex():
+    from app.models.simplex_models import WarmStart
+
+    rows = [([1, 1], "<=", 4), ([1, 0], "<=", 2), ([0, 1], "<=", 3)]
+    base = service.solve(_request([3, 2], rows))
+    changed = _request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 5), ([0, 1], "<=", 1)])
+    changed.warm_start = WarmStart(basis_token=base.metadata["basis_token"])
+    res = service.solve(changed)
+    assert res.metadata["warm_start"] is True
+    assert res.solution.objective_value == pytest.approx(service.solve(_request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 5), ([0, 1], "<=", 1)])).solution.objective_value)
+    assert any(it.comment.startswith("Dual:") for it in res.iterations)
+
+
+def test_warm_start_with_unknown_basis_falls_back_to_cold_start():
+    from app.models.simplex_models import WarmStart
+
+    req = _request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 2), ([0, 1], "<=", 3)])
+    req.warm_start = WarmStart(basis=["x1", "x9", "s1"])
+    res = service.solve(req)
+    assert res.notes and res.solution.objective_value == pytest.approx(10.0)
+
+
+def test_dual_method_solves_covering_model_without_artificials():
+    req = _request([2, 3], [([1, 1], ">=", 4), ([1, 2], ">=", 6), ([1, 0], "<=", 3)], sense="min")
+    req.method = "dual"
+    res = service.solve(req)
+    assert res.metadata["method"] == "dual"
+    assert res.solution.variable_values["x1"] == pytest.approx(2.0)
+    assert res.solution.variable_values["x2"] == pytest.approx(2.0)
+    assert not any(name.startswith("a") for name in res.solution.variable_values)
+
+
+def test_dual_method_falls_back_when_not_dual_feasible():
+    req = _request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 2), ([0, 1], "<=", 3)])
+    req.method = "dual"
+    res = service.solve(req)
+    assert res.notes
+    assert res.solution.objective_value == pytest.approx(10.0)
+
+
+def test_interior_point_logs_barrier_iterations_and_crosses_over_to_a_basis():
+    rows = [([1, 2, 1], ">=", 6), ([2, 1, 0], ">=", 4), ([1, 1, 1], "=", 5), ([-1, 0, 1], "<=", -1)]
+    req = _request([4, 3, 5], rows, sense="min")
+    req.method, req.trace_level = "interior_point", "full"
+    res = service.solve(req)
+    reference = service.solve(req.model_copy(update={"method": "tableau", "phases": "two_phase"}))
+    assert res.solution.status == "optimal"
+    assert res.solution.objective_value == pytest.approx(reference.solution.objective_value)
+    assert res.solution.variable_values == pytest.approx(reference.solution.variable_values)
+    assert res.solution.shadow_prices == pytest.approx(reference.solution.shadow_prices)
+    assert res.metadata["method"] == "interior_point" and res.metadata["barrier"]["status"] == "optimal"
+    assert res.metadata["crossover"]["basis_from_barrier"]
+    # Una entrada por iteración de barrera (más el punto inicial y el crossover), ninguna con tabla
+    assert len(res.iterations) == res.metadata["barrier"]["iterations"] + 2
+    assert all(it.tableau == [] and it.pivot_position is None for it in res.iterations)
+    assert res.iterations[-1].comment.startswith("Crossover") and res.iterations[-1].basis == res.metadata["basis"]
+
+
+def test_barrier_engine_converges_on_dense_standard_form():
+    linprog = pytest.importorskip("scipy.optimize").linprog
+    rng = np.random.default_rng(3)
+    A = np.hstack([rng.uniform(1, 5, (20, 40)), np.eye(20)])
+    b, c = rng.uniform(10, 50, 20), np.concatenate([-rng.uniform(1, 5, 40), np.zeros(20)])
+    result = _run_to_end(InteriorPoint(A, b, c).iterate())
+    assert result.status == "optimal" and result.iterations < 40
+    assert c @ result.x == pytest.approx(linprog(c, A_eq=A, b_eq=b, method="highs").fun, rel=1e-7)
+    basis = identify_basis(A, result.x, result.s)
+    assert basis.size == 20 and np.linalg.matrix_rank(A[:, basis]) == 20
+
+
+@pytest.mark.parametrize("rows,status", [
+    ([([1, 1], "<=", 2), ([1, 0], ">=", 3)], "infeasible"),
+    ([([1, -1], "<=", 2)], "unbounded"),
+])
+def test_interior_point_classifies_problems_without_optimum(rows, status):
+    req = _request([1, 1], rows)
+    req.method = "interior_point"
+    res = service.solve(req)
+    assert res.solution.status == status
+    assert res.notes and res.metadata["barrier"]["status"] != "optimal"
+
+
+def test_presolve_reduces_model_and_maps_solution_back():
+    rows = [
+        ([1, 1, 0, 0], "<=", 4),
+        ([2, 2, 0, 0], "<=", 10),  # duplicada más floja
+        ([1, 0, 0, 0], "<=", 3),  # singleton: cota superior
+        ([1, 0, 0, 0], "<=", 5),  # cota más floja
+        ([0, 0, 1, 0], "=", 2),  # fija x3 = 2
+        ([0, 0, 0, 0], "<=", 1),  # fila vacía
+        ([1, 0, 0, 1], "<=", 9),  # implicada por x1 <= 3 y x4 <= 1
+        ([0, 0, 0, 1], "<=", 1),
+    ]
+    req = _request([3, 2, 1, 1], rows)
+    plain = service.solve(req)
+    req.presolve = True
+    res = service.solve(req)
+    summary = res.metadata["presolve"]
+    assert summary["rows_removed"] == 5 and summary["cols_removed"] == 1
+    assert res.solution.objective_value == pytest.approx(plain.solution.objective_value)
+    assert res.solution.variable_values == pytest.approx({"x1": 3.0, "x2": 1.0, "x3": 2.0, "x4": 1.0})
+    assert all(type(v) is float for v in res.solution.variable_values.values())
+    # La fila que fijó x3 se eliminó, pero su dual se recupera del costo de x3
+    assert res.solution.shadow_prices["y5"] == pytest.approx(plain.solution.shadow_prices["y5"]) == pytest.approx(1.0)
+    # Costos reducidos de todas las columnas, los de las eliminadas rehechos con los duales recuperados
+    assert res.solution.reduced_costs == pytest.approx(plain.solution.reduced_costs)
+    assert res.solution.sensitivity is None and plain.solution.sensitivity is not None
+    assert any("sensibilidad" in note for note in res.notes)
+
+    fixed = _request([3, -2], [([1, 0], "=", 1), ([0, 1], "<=", 0)])
+    fixed.presolve = True
+    solved = service.solve(fixed)
+    assert solved.metadata["presolve"]["cols_removed"] == 2
+    assert solved.solution.reduced_costs == pytest.approx({"x1": 0.0, "x2": 2.0})
+
+    binding = _request([3, 2], [([1, 0], "=", 1), ([1, 1], "<=", 4)])
+    binding.presolve = True
+    assert service.solve(binding).solution.shadow_prices == pytest.approx({"y1": 1.0, "y2": 2.0})
+
+
+def test_presolve_empty_improving_column_is_unbounded_only_if_feasible():
+    req = _request([1, 1], [([1, 0], "<=", 2)])
+    req.presolve = True
+    assert service.solve(req).solution.status == "unbounded"
+    req = _request([1, 1], [([1, 0], "<=", 2), ([1, 0], ">=", 3)])
+    req.presolve, req.phases = True, "two_phase"
+    assert service.solve(req).solution.status == "infeasible"
+
+
+@pytest.mark.parametrize("level", ["none", "pivots", "full"])
+def test_trace_level_controls_iteration_log(level):
+    req = _request([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)])
+    req.trace_level = level
+    res = service.solve(req)
+    assert res.solution.objective_value == pytest.approx(36.0)
+    if level == "none":
+        assert res.iterations == []
+        return
+    assert len(res.iterations) == 3 and res.iterations[-1].pivot_position is not None
+    dumped = res.model_dump()["iterations"]
+    if level == "pivots":
+        assert all(it["tableau"] == [] for it in dumped)
+    else:
+        # La tabla se guarda como arreglo y solo se expande al serializar
+        assert res.iterations[0].tableau == []
+        assert dumped[-1]["tableau"][-1][-1] == pytest.approx(36.0)
+
+
+def test_solve_iter_yields_iterations_before_the_solution():
+    req = _request([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)])
+    events = service.solve_iter(req)
+    first = next(events)
+    assert isinstance(first, Iteration) and first.iteration == 0
+    rest = list(events)
+    assert all(isinstance(e, Iteration) for e in rest[:-1])
+    assert rest[-1].iterations == [] and rest[-1].solution.objective_value == pytest.approx(36.0)
+
+
+@pytest.mark.parametrize("method", ["tableau", "revised"])
+def test_stats_count_pivots_and_degenerate_pivots(method):
+    req = _request([0.75, -20, 0.5, -6], BEALE)
+    req.method, req.anti_cycling, req.trace_level = method, "bland", "pivots"
+    res = service.solve(req)
+    stats = res.metadata["stats"]
+    assert stats["pivots"] == sum(1 for it in res.iterations if it.entering_var is not None)
+    # Beale parte de un vértice degenerado: los primeros pivotes no mueven la solución
+    assert 0 < stats["degenerate_pivots"] < stats["pivots"]
+    assert (stats["rows"], stats["columns"], stats["nonzeros"]) == (3, 7, 12)
+    assert stats["density"] == pytest.approx(12 / 21, abs=1e-6)
+    seconds = stats["seconds"]
+    assert {"standard_form", "pivoting", "snapshot", "total"} <= set(seconds)
+    assert sum(v for k, v in seconds.items() if k != "total") == pytest.approx(seconds["total"], abs=1e-5)
+
+
+def test_stats_cover_presolve_and_two_phase_stages():
+    req = _request([1, 1], [([1, 1], ">=", 2), ([1, 0], "<=", 3), ([0, 0], "<=", 1)], sense="min")
+    req.presolve, req.phases = True, "two_phase"
+    stats = service.solve(req).metadata["stats"]
+    assert {"presolve", "standard_form", "initial_tableau", "pivoting", "extraction", "postsolve"} <= set(stats["seconds"])
+    assert stats["rows"] == 2  # la fila vacía se eliminó antes de armar la forma estándar
+
+
+def test_profile_hook_dumps_slow_solves_only(tmp_path):
+    req = _request([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)])
+    profiled = SimplexService()
+    profiled.profile_hook = ProfileHook(threshold=3600.0, directory=str(tmp_path))
+    assert "profile" not in profiled.solve(req).metadata
+    profiled.profile_hook = ProfileHook(threshold=0.0, directory=str(tmp_path))
+    path = profiled.solve(req).metadata["profile"]
+    assert path.startswith(str(tmp_path)) and path.endswith(".prof")
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_standard_form_records_identity_basis_columns():
+    req = _request([1, 2], [([1, 1], "<=", 4), ([1, -1], ">=", 1), ([2, 1], "=", 5), ([1, 0], "<=", -2)])
+    c, A, b, var_names, info = service._build_standard_form(req)
+    assert var_names == ["x1", "x2", "s1", "u1", "a1", "a2", "u2", "a3"]
+    assert info["slack_rows"] == [2] and info["artificial_rows"] == [4, 5, 7]
+    assert np.array_equal(A[:, info["basis"]], np.eye(4))
+    assert b.tolist() == [4, 1, 5, 2] and c[info["artificial_rows"]].tolist() == [-service.BIG_M] * 3
+
+
+@pytest.mark.parametrize("options", [{}, {"phases": "two_phase"}, {"method": "dual"}, {"method": "interior_point"}])
+def test_sensitivity_ranges_on_textbook_model(options):
+    # Wyndor Glass: óptimo x = (2, 6), duales (0, 1.5, 1)
+    req = _request([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)]).model_copy(update=options)
+    sol = service.solve(req).solution
+    assert sol.status == "optimal"
+    assert sol.shadow_prices == pytest.approx({"y1": 0.0, "y2": 1.5, "y3": 1.0})
+    assert sol.reduced_costs == pytest.approx({"x1": 0.0, "x2": 0.0})
+    objective, rhs = sol.sensitivity.objective, sol.sensitivity.rhs
+    assert (objective["x1"].allowable_increase, objective["x1"].allowable_decrease) == pytest.approx((4.5, 3.0))
+    assert objective["x2"].allowable_increase is None and objective["x2"].allowable_decrease == pytest.approx(3.0)
+    assert rhs["y1"].allowable_increase is None and rhs["y1"].allowable_decrease == pytest.approx(2.0)
+    assert (rhs["y2"].allowable_increase, rhs["y2"].allowable_decrease) == pytest.approx((6.0, 6.0))
+    assert (rhs["y3"].allowable_increase, rhs["y3"].allowable_decrease) == pytest.approx((6.0, 6.0))
+
+
+@pytest.mark.parametrize("options", [{"phases": "big_m"}, {"phases": "two_phase"}, {"method": "revised"}])
+def test_shadow_prices_match_linprog_marginals(options):
+    linprog = pytest.importorskip("scipy.optimize").linprog
+    rows = [([1, 2, 1], ">=", 6), ([2, 1, 0], ">=", 4), ([1, 1, 1], "=", 5), ([-1, 0, 1], "<=", -1)]
+    # La última fila tiene lado derecho negativo: se invierte al normalizar y su dual debe volver con el signo original
+    req = _request([4, 3, 5], rows, sense="min").model_copy(update=options)
+    sol = service.solve(req).solution
+    assert sol.status == "optimal"
+
+    ref = linprog(
+        [4, 3, 5],
+        A_ub=[[-1, -2, -1], [-2, -1, 0], [-1, 0, 1]], b_ub=[-6, -4, -1],
+        A_eq=[[1, 1, 1]], b_eq=[5], method="highs",
+    )
+    # Los duales se informan para el objetivo interno (maximizar -c): y = -d(costo mínimo)/db
+    expected = [ref.ineqlin.marginals[0], ref.ineqlin.marginals[1], -ref.eqlin.marginals[0], -ref.ineqlin.marginals[2]]
+    assert [sol.shadow_prices[f"y{i+1}"] for i in range(4)] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("phases", ["big_m", "two_phase"])
+def test_redundant_equality_does_not_leak_big_m_into_duals(phases):
+    # La segunda igualdad es el doble de la primera: con Big-M su artificial queda básica en 0
+    rows = [([1, 1], "=", 4), ([2, 2], "=", 8), ([1, 0], "<=", 3)]
+    sol = service.solve(_request([3, 2], rows).model_copy(update={"phases": phases})).solution
+    assert sol.objective_value == pytest.approx(11.0)
+    assert sol.shadow_prices == pytest.approx({"y1": 2.0, "y2": 0.0, "y3": 1.0})
+    assert sol.sensitivity.rhs["y2"].allowable_decrease == 0.0
+
+
+@pytest.mark.parametrize("phases", ["big_m", "two_phase"])
+def test_degenerate_artificial_leaves_dual_feasible_basis(phases):
+    # -x1 - x2 = 0 deja su artificial básica en 0; sin la penalización, x1 parecería mejorar el objetivo
+    rows = [([-1, -1], "=", 0), ([1, 0], "<=", 2), ([0, 3], "<=", 3)]
+    sol = service.solve(_request([2, -2], rows).model_copy(update={"phases": phases})).solution
+    assert sol.objective_value == pytest.approx(0.0)
+    assert sol.shadow_prices == pytest.approx({"y1": -2.0, "y2": 0.0, "y3": 0.0})
+    assert sol.reduced_costs == pytest.approx({"x1": 0.0, "x2": 4.0})
+
+
+def test_multiple_optima_only_with_zero_nonbasic_reduced_cost():
+    unique = service.solve(_request([3, 2], [([1, 1], "<=", 4), ([1, 0], "<=", 2)])).solution
+    assert unique.status == "optimal"
+    tied = service.solve(_request([1, 1], [([1, 1], "<=", 4), ([1, 0], "<=", 2)])).solution
+    assert tied.status == "multiple_optima"
+
+
+def test_rhs_scenarios_reuse_base_basis_and_match_cold_solves():
+    req = _request([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)])
+    # El primero mantiene la base del caso base; el segundo la vuelve infactible; el tercero es infactible
+    rhs = [[4, 14, 20], [4, 30, 18], [-1, 12, 18]]
+    res = service.solve_scenarios(SimplexScenarioRequest(problem=req, rhs=rhs))
+    table = res.scenarios
+    assert table.status == ["optimal", "optimal", "infeasible"]
+    assert table.pivots[0] == 0 and table.pivots[1] > 0
+    assert res.metadata["shared_basis"] == 1
+    for k in range(2):
+        cold = service.solve(service._scenario_request(req, np.array(rhs[k], dtype=float), None)).solution
+        assert table.objective_value[k] == pytest.approx(cold.objective_value)
+        assert table.values[k] == pytest.approx([cold.variable_values["x1"], cold.variable_values["x2"]])
+
+
+def test_objective_scenarios_with_equality_rows():
+    req = _request([4, 3, 5], [([1, 2, 1], ">=", 6), ([1, 1, 1], "=", 5)], sense="min")
+    objectives = [[4, 3, 5], [1, 3, 5], [4, 3, 0.5]]
+    table = service.solve_scenarios(SimplexScenarioRequest(problem=req, objectives=objectives)).scenarios
+    for k, c in enumerate(objectives):
+        cold = service.solve(_request(c, [([1, 2, 1], ">=", 6), ([1, 1, 1], "=", 5)], sense="min")).solution
+        assert table.status[k] == "optimal"
+        assert table.objective_value[k] == pytest.approx(cold.objective_value)
+
+
+def test_cold_scenarios_use_two_phase_classification():
+    # Infactible con un rayo de mejora: Big-M lo informaría como no acotado
+    req = _request([1, 1], [([1, 0], "=", -1), ([0, 1], ">=", 0)])
+    res = service.solve_scenarios(SimplexScenarioRequest(problem=req, rhs=[[-1, 0], [-2, 1]]))
+    assert res.base.solution.status == "infeasible"
+    assert res.metadata["cold_solves"] == 2
+    assert res.scenarios.status == ["infeasible", "infeasible"]
+
+
+def test_scenarios_require_matching_width():
+    req = _request([3, 5], [([1, 0], "<=", 4)])
+    with pytest.raises(ValueError):
+        service.solve_scenarios(SimplexScenarioRequest(problem=req, rhs=[[1, 2]]))
+
+
+def _mip_request(**options):
+    req = _request([5, 4], [([6, 4], "<=", 24), ([1, 2], "<=", 6)])
+    return req.model_copy(update={"integer": [True, True], **options})
+
+
+def test_branch_and_bound_finds_integer_optimum():
+    # La relajación da (3, 1.5) con z = 21; el óptimo entero es (4, 0) con z = 20
+    res = service.solve(_mip_request())
+    assert res.solution.status == "optimal"
+    assert res.solution.objective_value == pytest.approx(20.0)
+    assert res.solution.variable_values == {"x1": 4.0, "x2": 0.0}
+    mip = res.metadata["mip"]
+    assert mip["nodes"] > 1 and mip["gap"] == pytest.approx(0.0)
+    assert mip["incumbents"][-1]["objective"] == pytest.approx(20.0)
+
+
+def test_branch_and_bound_parallel_nodes_match_serial():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.services.branch_and_bound import BranchAndBound
+
+    with ThreadPoolExecutor(2) as executor:
+        res = BranchAndBound(service, executor, width=2).solve(_mip_request())
+    assert res.solution.objective_value == pytest.approx(20.0)
+    assert res.metadata["mip"]["workers"] == 2
+
+
+def test_solve_batch_runs_integer_problems_through_branch_and_bound():
+    reqs = [_mip_request(), _request([1, 1], [([2, 1], "<=", 4), ([1, 2], "<=", 4)]).model_copy(update={"integer": [True, True]})]
+    batched = list(service.solve_batch(reqs))
+    assert [res.solution.objective_value for res in batched] == pytest.approx([20.0, 2.0])
+    assert all(res.metadata["method"] == "branch_and_bound" for res in batched)
+
+
+def test_branch_and_bound_admission_pool_keeps_nodes_accounted():
+    from app.executor import SolverPool
+    from app.services.branch_and_bound import BranchAndBound
+
+    # Cola de un solo nodo: los envíos rechazados esperan a los que están en curso y el árbol igual se cierra
+    pool = SolverPool(kind="thread", workers=1, queue_size=0)
+    res = BranchAndBound(service, pool.admitted(), width=2).solve(_mip_request())
+    assert res.solution.objective_value == pytest.approx(20.0)
+    assert pool.stats()["running"] == pool.stats()["queued"] == 0
+    pool.shutdown()
+
+
+def test_branch_and_bound_unbounded_relaxation_is_not_claimed_unbounded_mip():
+    # 2 x1 - 2 x2 = 1 no tiene soluciones enteras, pero la relajación crece sin cota a lo largo de x1 = x2 + 1/2
+    req = _request([1, 1], [([2, -2], "=", 1)]).model_copy(update={"integer": [True, True]})
+    res = service.solve(req)
+    assert res.solution.status == "unbounded"
+    assert "infactible" in res.solution.message
+    assert res.metadata["mip"]["relaxation"] == "unbounded"
+
+
+def test_branch_and_bound_node_limit_returns_incumbent_and_gap():
+    res = service.solve(_mip_request(node_limit=1))
+    # Solo la raíz: el redondeo de (3, 1.5) da el incumbente (3, 1) con z = 19
+    assert res.solution.status == "node_limit"
+    assert res.solution.objective_value == pytest.approx(19.0)
+    assert res.metadata["mip"]["gap"] == pytest.approx(2 / 19)